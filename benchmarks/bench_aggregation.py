@@ -0,0 +1,100 @@
+"""
+Benchmark and parity check: chart data queries on each aggregation backend.
+
+Runs generate_dashboard.CHART_QUERIES (the filter/group-by inputs of the
+EDA and Plotly charts) on the cleaned panel tiled `--scale` times with every
+installed backend of gender_education.aggregation, and reports:
+
+- convert   pandas DataFrame -> the backend's frame (once per panel)
+- batch     all queries in one run_queries() call (Polars: one collect_all)
+- each      the queries one run_query() call at a time, as the charts do
+
+Before timing, every backend's results are compared with pandas' (same
+columns, row order and dtypes; values to a relative 1e-12). The script exits
+with status 1 if any chart input differs. Backends whose library is not
+installed are listed as skipped.
+
+Usage:
+    python benchmarks/bench_aggregation.py [--scales 1 10 100] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_dashboard import CHART_QUERIES  # noqa: E402
+from gender_education.aggregation import BACKENDS, available_backends, get_backend, run_queries  # noqa: E402
+from gender_education.config import CLEANED_CSV  # noqa: E402
+
+
+def tiled_panel(df, scale):
+    if scale == 1:
+        return df
+    return pd.concat([df.assign(country=df['country'] + f' #{k}') for k in range(scale)], ignore_index=True)
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def check_parity(df, backends):
+    """Names of the (backend, query) pairs whose results differ from pandas'."""
+    expected = run_queries(df, CHART_QUERIES, backend='pandas')
+    mismatches = []
+    for backend in backends:
+        if backend == 'pandas':
+            continue
+        results = run_queries(df, CHART_QUERIES, backend=backend)
+        for name, query_result in results.items():
+            try:
+                pd.testing.assert_frame_equal(query_result, expected[name], check_exact=False, rtol=1e-12)
+            except AssertionError as error:
+                mismatches.append(f"{backend}/{name}: {str(error).splitlines()[0]}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    backends = available_backends()
+    skipped = [name for name in BACKENDS if name not in backends]
+    print(f"Backends: {', '.join(backends)}" + (f" (not installed: {', '.join(skipped)})" if skipped else ""))
+    print(f"{len(CHART_QUERIES)} chart queries: {', '.join(CHART_QUERIES)}\n")
+
+    base = pd.read_csv(CLEANED_CSV)
+    mismatches = check_parity(base, backends)
+    if mismatches:
+        print("✗ Chart inputs differ from pandas:")
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+        sys.exit(1)
+    print(f"✓ Identical chart inputs on {len(backends)} backend(s)\n")
+
+    print(f"{'scale':>6}{'rows':>11}  {'backend':<9}{'convert (ms)':>14}{'batch (ms)':>12}{'each (ms)':>11}")
+    print("-" * 63)
+    for scale in args.scales:
+        df = tiled_panel(base, scale)
+        for name in backends:
+            backend = get_backend(name)
+            convert = best_time(lambda: backend._from_pandas(df), args.repeat) if name != 'pandas' else 0.0
+            batch = best_time(lambda: backend.run_many(df, list(CHART_QUERIES.values())), args.repeat)
+            each = best_time(lambda: [backend.run(df, query) for query in CHART_QUERIES.values()], args.repeat)
+            print(f"{scale:>6}{len(df):>11,}  {name:<9}{convert * 1000:>14.1f}{batch * 1000:>12.1f}"
+                  f"{each * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: the dashboard's EDA charts, pooled figures vs plt.subplots/savefig.
+
+Renders every static EDA chart of generate_dashboard.py (distributions, box
+plots, trends, correlation heatmap, parity) `--repeat` times with:
+
+- savefig   FigurePool(reuse=False): plt.subplots, savefig into a new BytesIO,
+            plt.close, as the charts did before
+- pooled    FigurePool(): figures and canvases reused per size, PNG encoded
+            from the Agg buffer into one reused buffer
+
+Before timing, the PNGs of both modes are compared byte for byte (exit
+status 1 if any differs). Reported per mode: wall time per run and per
+chart; for one run, the Agg renderers allocated and the size of their pixel
+buffers, and the peak of Python allocations (tracemalloc); and the figures
+created over all runs.
+
+Usage:
+    python benchmarks/bench_eda_render.py [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_dashboard  # noqa: E402
+from matplotlib.backends import backend_agg  # noqa: E402
+from gender_education.config import CLEANED_CSV  # noqa: E402
+from gender_education.figpool import FigurePool  # noqa: E402
+
+EDA_CHARTS = [
+    generate_dashboard.eda_distribution_charts,
+    generate_dashboard.eda_boxplot_charts,
+    generate_dashboard.eda_trend_charts,
+    generate_dashboard.eda_correlation_chart,
+    generate_dashboard.eda_parity_chart,
+]
+
+
+def render_all(df):
+    """Every EDA chart as base64 PNG, in dashboard order."""
+    images = []
+    for chart in EDA_CHARTS:
+        result = chart(df)
+        images += result if isinstance(result, list) else [result]
+    return images
+
+
+def timed_run(df, pool):
+    generate_dashboard.eda_figures = pool
+    start = time.perf_counter()
+    images = render_all(df)
+    return images, time.perf_counter() - start
+
+
+class CountingRenderer(backend_agg.RendererAgg):
+    """RendererAgg that counts its instances and their pixel buffers."""
+    created = 0
+    buffer_bytes = 0
+
+    def __init__(self, width, height, dpi):
+        super().__init__(width, height, dpi)
+        CountingRenderer.created += 1
+        CountingRenderer.buffer_bytes += int(width) * int(height) * 4
+
+
+def allocations(df, pool):
+    """(Agg renderers created, their buffer bytes, peak Python memory above the start) of one run."""
+    generate_dashboard.eda_figures = pool
+    CountingRenderer.created = CountingRenderer.buffer_bytes = 0
+    original, backend_agg.RendererAgg = backend_agg.RendererAgg, CountingRenderer
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        render_all(df)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        backend_agg.RendererAgg = original
+    return CountingRenderer.created, CountingRenderer.buffer_bytes, peak - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = generate_dashboard.load_panel(CLEANED_CSV)
+    pools = {'savefig': FigurePool(reuse=False), 'pooled': FigurePool()}
+    images, times = {}, {name: [] for name in pools}
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')  # the chart functions print a line each
+    try:
+        # Warm-up (fonts, seaborn palettes, the pool's figures), then the modes
+        # take turns so that drift affects both alike
+        for name, pool in pools.items():
+            images[name], _ = timed_run(df, pool)
+        for _ in range(args.repeat):
+            for name, pool in pools.items():
+                times[name].append(timed_run(df, pool)[1])
+        memory = {name: allocations(df, pool) for name, pool in pools.items()}
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    baseline, pooled = images['savefig'], images['pooled']
+    if baseline != pooled:
+        differing = [i for i, (a, b) in enumerate(zip(baseline, pooled)) if a != b]
+        print(f"✗ Pooled PNGs differ from savefig's: charts {differing}")
+        sys.exit(1)
+    n_charts = len(baseline)
+    print(f"✓ {n_charts} EDA charts, byte-identical PNGs in both modes\n")
+
+    print(f"{'mode':<9}{'run (s)':>9}{'per chart (ms)':>16}{'renderers':>11}{'Agg buffers (MB)':>18}"
+          f"{'peak (MB)':>11}{'figures created':>17}")
+    print("-" * 91)
+    for name, pool in pools.items():
+        seconds, (renderers, buffer_bytes, peak) = min(times[name]), memory[name]
+        print(f"{name:<9}{seconds:>9.2f}{seconds / n_charts * 1000:>16.0f}{renderers:>11}{buffer_bytes / 1e6:>18.1f}"
+              f"{peak / 1e6:>11.1f}{pool.created:>17}")
+    print(f"\n(figures created over {args.repeat + 2} runs; pooled figures are created once per layout)")
+
+
+if __name__ == '__main__':
+    main()
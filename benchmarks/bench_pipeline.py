@@ -0,0 +1,205 @@
+"""
+Benchmark: pipeline stages on synthetic panels at 1x, 10x and 100x scale.
+
+Generates raw-schema panels with gender_education.synthetic (1x = the 221
+countries of the real panel, 45 years) and times every stage of the pipeline:
+
+- clean.*      notebook 2: select countries, impute, derived features
+- aggregate.*  the aggregations generate_dashboard.py runs on the cleaned
+               panel (regional means, bootstrap CIs, rankings, data cube)
+- serialize.*  building the Plotly charts and serializing them to JSON
+
+Each stage is timed `--repeat` times (best time is kept) and then run once
+more under tracemalloc for its peak traced memory (NumPy and pandas buffers
+included). The report is written as JSON (one record per scale and stage,
+plus the commit and library versions) so runs can be compared across
+commits with --compare:
+
+Usage:
+    python benchmarks/bench_pipeline.py [--scales 1 10 100] [--output pipeline_benchmark.json]
+    python benchmarks/bench_pipeline.py --scales 1 10 --compare old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from gender_education.bootstrap import bootstrap_means  # noqa: E402
+from gender_education.cleaning import add_derived_features, impute_missing, select_countries  # noqa: E402
+from gender_education.config import INDICATOR_COLS  # noqa: E402
+from gender_education.cube import build_cube, cube_json  # noqa: E402
+from gender_education.figures import plotly_regional_trends, plotly_scatter_latest  # noqa: E402
+from gender_education.rankings import RankingIndex  # noqa: E402
+from gender_education.rendering import country_trend_explorer  # noqa: E402
+from gender_education.synthetic import scaled_panel  # noqa: E402
+
+SUMMARY_COLS = ['Literacy_Rate_Female', 'Adolescent_Fertility_Rate', 'Female_Labor_Force_Participation', 'Literacy_Gap']
+
+
+def pipeline_stages(raw, region_mapping, n_boot):
+    """
+    (name, function) pairs in pipeline order. Each function takes the output
+    of the previous clean.* stage (or the cleaned panel) and returns a result
+    plus an optional size in bytes for the report.
+    """
+    def select(state):
+        state['df'] = select_countries(raw, region_mapping=region_mapping)
+
+    def impute(state):
+        df = state['df'].copy()
+        impute_missing(df)
+        state['imputed'] = df
+
+    def derive(state):
+        df = state['imputed'].copy()
+        add_derived_features(df, scaling_mode='refit', reference_path=None)
+        state['clean'] = df
+
+    def regional_means(state):
+        df = state['clean']
+        df.groupby(['year', 'region'])[INDICATOR_COLS].mean()
+        latest = df[df['year'] == df['year'].max()]
+        latest.groupby('region')[SUMMARY_COLS].mean()
+
+    def bootstrap(state):
+        state['ci'] = bootstrap_means(state['clean'], SUMMARY_COLS, by=['region', 'year'], n_boot=n_boot)
+
+    def rankings(state):
+        RankingIndex.from_frame(state['clean'])
+
+    def cube(state):
+        return len(cube_json(build_cube(state['clean'], ci_table=state['ci'])))
+
+    def chart(build):
+        return lambda state: len(build(state['clean']).to_json())
+
+    return [
+        ('clean.select', select),
+        ('clean.impute', impute),
+        ('clean.derive', derive),
+        ('aggregate.regional_means', regional_means),
+        ('aggregate.bootstrap', bootstrap),
+        ('aggregate.rankings', rankings),
+        ('aggregate.cube', cube),
+        ('serialize.regional_trends', chart(plotly_regional_trends)),
+        ('serialize.scatter_latest', chart(plotly_scatter_latest)),
+        ('serialize.trend_explorer', chart(
+            lambda df: country_trend_explorer(df, 'Literacy_Rate_Female', 'Female Literacy Rate (%)'))),
+    ]
+
+
+def measure(func, state, repeat, memory):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = func(state)
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return min(times), peak, size
+
+
+def run_scale(scale, repeat, memory, n_boot, seed):
+    raw, region_mapping = scaled_panel(scale, seed=seed)
+    state = {}
+    records = []
+    for stage, func in pipeline_stages(raw, region_mapping, n_boot):
+        seconds, peak, size = measure(func, state, repeat, memory)
+        records.append({
+            'scale': scale,
+            'stage': stage,
+            'raw_rows': len(raw),
+            'seconds': round(seconds, 6),
+            'peak_mb': round(peak / 1024 ** 2, 3) if peak is not None else None,
+            'output_bytes': size,
+        })
+        print(f"{scale:>6g}x  {stage:<28}{seconds:>10.3f}"
+              f"{records[-1]['peak_mb'] if peak is not None else float('nan'):>12.1f}"
+              f"{(size or 0) / 1024:>12.0f}")
+    return records
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(args):
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+        'repeat': args.repeat,
+        'n_boot': args.n_boot,
+        'seed': args.seed,
+    }
+
+
+def compare(report, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    before = {(r['scale'], r['stage']): r for r in baseline['results']}
+    print(f"\nvs {baseline_path} (commit {baseline['environment'].get('commit')}): time ratio, new / old")
+    print(f"{'scale':>7}  {'stage':<28}{'old (s)':>10}{'new (s)':>10}{'ratio':>8}")
+    for record in report['results']:
+        old = before.get((record['scale'], record['stage']))
+        if old is None:
+            continue
+        ratio = record['seconds'] / old['seconds'] if old['seconds'] else float('nan')
+        print(f"{record['scale']:>6g}x  {record['stage']:<28}{old['seconds']:>10.3f}{record['seconds']:>10.3f}{ratio:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--n-boot', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', default='pipeline_benchmark.json')
+    parser.add_argument('--compare', help='earlier report to compare against')
+    args = parser.parse_args()
+
+    print(f"{'scale':>7}  {'stage':<28}{'time (s)':>10}{'peak MB':>12}{'output KB':>12}")
+    print("-" * 71)
+    results = []
+    for scale in args.scales:
+        results.extend(run_scale(scale, args.repeat, not args.no_memory, args.n_boot, args.seed))
+
+    report = {'environment': environment(args), 'results': results}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"\n✓ Report written to {args.output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
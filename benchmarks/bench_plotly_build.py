@@ -0,0 +1,179 @@
+"""
+Benchmark: the dashboard's express-style Plotly charts, figure dicts vs plotly express.
+
+Builds and serializes each chart of generate_dashboard.py that plotly express
+used to build (1 regional trends, 2 choropleth, 3 scatter, 5 animated
+bubbles, 6 parity box plot), as plotly_div() does for the page, with:
+
+- express   PLOTLY_BUILDER = 'express': px figure, fig.to_html() and
+            figure_data_size()
+- direct    PLOTLY_BUILDER = 'direct': plotbuilder figure dict, figure_div()
+
+Before timing, the figures of both modes are compared: data, layout and
+frames as embedded in the page, typed arrays decoded (NaN and null count as
+equal, as plotly 5 writes plain lists), floats to a relative 1e-12 (exit
+status 1 if any differs). Reported per chart: the best build and
+serialization times of `--repeat` runs and the bytes of HTML.
+
+Usage:
+    python benchmarks/bench_plotly_build.py [--repeat 5] [--render-mode auto]
+"""
+
+import argparse
+import base64
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_dashboard  # noqa: E402
+from gender_education import plotbuilder  # noqa: E402
+from gender_education.config import CLEANED_CSV, PROVENANCE_FILE  # noqa: E402
+from gender_education.cube import figure_data_size  # noqa: E402
+from plotly.utils import PlotlyJSONEncoder  # noqa: E402
+
+CHARTS = [
+    ('regional trends', generate_dashboard.regional_trends_chart, 'chart1', False),
+    ('choropleth', generate_dashboard.choropleth_chart, 'chart2', False),
+    ('scatter', generate_dashboard.scatter_chart, 'chart3', True),
+    ('bubble', generate_dashboard.bubble_chart, 'chart5', False),
+    ('parity box', generate_dashboard.parity_box_chart, 'chart6', False),
+]
+MODES = ('express', 'direct')
+
+
+def embedded(fig):
+    """Data, layout and frames as the page embeds them, typed arrays decoded."""
+    if isinstance(fig, dict):
+        spec = {'data': json.loads(plotbuilder.to_json(fig['data'])),
+                'layout': json.loads(plotbuilder.layout_json(fig['layout']))}
+        if fig.get('frames'):
+            spec['frames'] = json.loads(plotbuilder.to_json(fig['frames']))
+    else:
+        spec = json.loads(json.dumps(fig.to_plotly_json(), cls=PlotlyJSONEncoder))
+    return decode(spec)
+
+
+def decode(value):
+    if isinstance(value, dict):
+        if 'bdata' in value and 'dtype' in value:
+            return np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype']).tolist()
+        return {key: decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    return value
+
+
+def _missing(value):
+    # NaN in a typed array is null in a plain list
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def differences(a, b, path=''):
+    """Paths where two decoded figures differ."""
+    if _missing(a) and _missing(b):
+        return
+    if isinstance(a, dict) and isinstance(b, dict):
+        for key in sorted(set(a) | set(b)):
+            if key not in a or key not in b:
+                yield f'{path}.{key}: only in {"express" if key in a else "direct"}'
+            else:
+                yield from differences(a[key], b[key], f'{path}.{key}')
+    elif isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            yield f'{path}: {len(a)} vs {len(b)} items'
+        else:
+            for i, (x, y) in enumerate(zip(a, b)):
+                yield from differences(x, y, f'{path}[{i}]')
+    elif isinstance(a, (int, float)) and isinstance(b, (int, float)) and not isinstance(a, bool):
+        if not (a == b or math.isclose(a, b, rel_tol=1e-12)):
+            yield f'{path}: {a} vs {b}'
+    elif a != b:
+        yield f'{path}: {a!r} vs {b!r}'
+
+
+def run(build, div_id, inputs):
+    """(figure, build seconds, serialization seconds, HTML bytes), as plotly_div builds it."""
+    start = time.perf_counter()
+    fig = build(*inputs)
+    built = time.perf_counter()
+    if isinstance(fig, dict):
+        html, _ = plotbuilder.figure_div(fig, div_id)
+    else:
+        html = fig.to_html(include_plotlyjs='cdn', div_id=div_id, full_html=False)
+        figure_data_size(fig)
+    return fig, built - start, time.perf_counter() - built, len(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--render-mode', default=generate_dashboard.RENDER_MODE, choices=('auto', 'svg', 'webgl'))
+    args = parser.parse_args()
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')  # load_panel prints a line
+    try:
+        df = generate_dashboard.load_panel(CLEANED_CSV)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    provenance = generate_dashboard.load_provenance(PROVENANCE_FILE)
+    generate_dashboard.RENDER_MODE = args.render_mode
+
+    results = {}
+    for name, build, div_id, uses_provenance in CHARTS:
+        inputs = (df, provenance) if uses_provenance else (df,)
+        figures, times = {}, {mode: [] for mode in MODES}
+        # Warm-up, then the modes take turns so that drift affects both alike
+        for mode in MODES:
+            generate_dashboard.PLOTLY_BUILDER = mode
+            figures[mode] = run(build, div_id, inputs)
+        for _ in range(args.repeat):
+            for mode in MODES:
+                generate_dashboard.PLOTLY_BUILDER = mode
+                times[mode].append(run(build, div_id, inputs)[1:])
+
+        mismatches = list(differences(embedded(figures['express'][0]), embedded(figures['direct'][0])))
+        if mismatches:
+            print(f"✗ {name}: the direct figure differs from plotly express' ({len(mismatches)} values)")
+            for mismatch in mismatches[:10]:
+                print(f"  {mismatch}")
+            sys.exit(1)
+        results[name] = {mode: (min(t[0] for t in times[mode]), min(t[1] for t in times[mode]), figures[mode][3])
+                         for mode in MODES}
+
+    try:
+        import orjson  # noqa: F401
+        engine = 'orjson'
+    except ImportError:
+        engine = 'json'
+    print(f"✓ {len(CHARTS)} charts, same figures in both modes (render mode {args.render_mode!r}, "
+          f"direct JSON via {engine})\n")
+
+    print(f"{'chart':<17}{'mode':<9}{'build (ms)':>12}{'serialize (ms)':>16}{'total (ms)':>12}{'HTML (KB)':>11}"
+          f"{'speedup':>10}")
+    print("-" * 87)
+    totals = {mode: 0.0 for mode in MODES}
+    for name, by_mode in results.items():
+        baseline = sum(by_mode['express'][:2])
+        for mode in MODES:
+            build_s, serialize_s, html_bytes = by_mode[mode]
+            total = build_s + serialize_s
+            totals[mode] += total
+            speedup = f"{baseline / total:>9.1f}x" if mode == 'direct' else ''
+            print(f"{name if mode == 'express' else '':<17}{mode:<9}{build_s * 1000:>12.1f}{serialize_s * 1000:>16.1f}"
+                  f"{total * 1000:>12.1f}{html_bytes / 1024:>11.0f}{speedup:>10}")
+    print("-" * 87)
+    print(f"{'all charts':<17}{'express':<9}{'':>28}{totals['express'] * 1000:>12.1f}")
+    print(f"{'':<17}{'direct':<9}{'':>28}{totals['direct'] * 1000:>12.1f}{'':>11}"
+          f"{totals['express'] / totals['direct']:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
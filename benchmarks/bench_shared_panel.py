@@ -0,0 +1,147 @@
+"""
+Benchmark: handing the panel to pool workers, pickled vs shared memory.
+
+Runs the same tasks (a mean of every indicator, touching all values) in a
+pool of `--workers` processes, with the panel delivered four ways:
+
+- pickle-task  the DataFrame is a task argument (pickled for every task)
+- pickle-init  the DataFrame is pickled once per worker (pool initializer)
+- shm          SharedPanel in multiprocessing.shared_memory, workers attach
+- memmap       SharedPanel in an .npy file, workers map it with np.memmap
+
+and reports the worker startup (pool creation until every worker holds the
+panel), the wall time of all tasks, and the memory of the workers: summed
+RSS (shared pages are counted once per process) and summed PSS (shared
+pages are split between the processes mapping them), from /proc (Linux).
+The cleaned panel is tiled `--scale` times to make the copies visible.
+
+With --start-method fork, pickle-init is not pickled at all: the initializer
+arguments are inherited copy-on-write. The default, spawn, is what macOS and
+Windows use.
+
+Usage:
+    python benchmarks/bench_shared_panel.py [--scale 20] [--workers 4] [--tasks 32] [--start-method spawn]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gender_education.config import CLEANED_CSV  # noqa: E402
+from gender_education.shared import SharedPanel, attach_worker, worker_panel  # noqa: E402
+
+_state = {}
+
+
+def memory_kb():
+    """(RSS, PSS) of this process in KB."""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                fields[parts[0]] = int(parts[1])
+    return fields['Rss:'], fields['Pss:']
+
+
+def _ready():
+    _state.setdefault('ready', time.time())
+
+
+def init_frame(df):
+    _state['df'] = df
+    _ready()
+
+
+def init_shared(handle):
+    attach_worker(handle)
+    _ready()
+
+
+def frame_task(columns, df=None):
+    if df is not None:
+        _state['df'] = df
+        _ready()
+    df = _state['df']
+    total = sum(df[col].mean() for col in columns)
+    return os.getpid(), _state['ready'], memory_kb(), float(total)
+
+
+def shared_task(columns):
+    panel = worker_panel()
+    total = sum(np.nanmean(panel.series(col)) for col in columns)
+    return os.getpid(), _state['ready'], memory_kb(), float(total)
+
+
+def tiled_panel(scale):
+    df = pd.read_csv(CLEANED_CSV)
+    if scale == 1:
+        return df
+    return pd.concat([df.assign(country=df['country'] + f' #{k}') for k in range(scale)], ignore_index=True)
+
+
+def run_mode(mode, df, columns, args, tmpdir):
+    context = mp.get_context(args.start_method)
+    shared = None
+    if mode in ('shm', 'memmap'):
+        shared = SharedPanel.from_frame(df, columns, backend=mode, path=os.path.join(tmpdir, 'panel.npy'))
+        pool_kwargs = dict(initializer=init_shared, initargs=(shared.handle,))
+        task, task_args = shared_task, [(columns,)] * args.tasks
+    elif mode == 'pickle-init':
+        pool_kwargs = dict(initializer=init_frame, initargs=(df,))
+        task, task_args = frame_task, [(columns,)] * args.tasks
+    else:
+        pool_kwargs = {}
+        task, task_args = frame_task, [(columns, df)] * args.tasks
+
+    try:
+        start = time.time()
+        with context.Pool(args.workers, **pool_kwargs) as pool:
+            results = pool.starmap(task, task_args, chunksize=1)
+            wall = time.time() - start
+        # Last report of every worker
+        workers = {pid: (ready, memory) for pid, ready, memory, _ in results}
+        startup = max(ready for ready, _ in workers.values()) - start
+        rss = sum(memory[0] for _, memory in workers.values())
+        pss = sum(memory[1] for _, memory in workers.values())
+    finally:
+        if shared is not None:
+            shared.close()
+    return {'mode': mode, 'workers': len(workers), 'startup': startup, 'wall': wall,
+            'rss_mb': rss / 1024, 'pss_mb': pss / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=20, help='tile the cleaned panel this many times')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--tasks', type=int, default=32)
+    parser.add_argument('--start-method', default='spawn', choices=mp.get_all_start_methods())
+    parser.add_argument('--modes', nargs='+', default=['pickle-task', 'pickle-init', 'shm', 'memmap'])
+    args = parser.parse_args()
+
+    df = tiled_panel(args.scale)
+    columns = [col for col in df.columns if col not in ('country', 'year', 'region')]
+    print(f"Panel: {len(df):,} rows, {df.memory_usage(deep=True).sum() / 1024 ** 2:.1f} MB as a DataFrame, "
+          f"{len(df) * len(columns) * 8 / 1024 ** 2:.1f} MB of indicator values; "
+          f"{args.workers} workers ({args.start_method}), {args.tasks} tasks\n")
+
+    print(f"{'mode':<14}{'workers':>8}{'startup (s)':>13}{'wall (s)':>10}{'sum RSS MB':>12}{'sum PSS MB':>12}")
+    print("-" * 69)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for mode in args.modes:
+            r = run_mode(mode, df, columns, args, tmpdir)
+            print(f"{r['mode']:<14}{r['workers']:>8}{r['startup']:>13.2f}{r['wall']:>10.2f}"
+                  f"{r['rss_mb']:>12.1f}{r['pss_mb']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: per-country sparklines, sprite sheet vs one figure per country.
+
+Compares, on the cleaned panel:
+
+- one current EDA temporal-trend chart (7 region lines, 14x7 in, 150 dpi)
+- one sprite sheet with every country's sparkline (gender_education.sparklines)
+- the naive version: one small matplotlib figure per country, timed on the
+  first `--naive-sample` countries and extrapolated to all of them
+
+Usage:
+    python benchmarks/bench_sparklines.py [--column Literacy_Rate_Female] [--naive-sample 25]
+"""
+
+import argparse
+import os
+import sys
+import time
+from io import BytesIO
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import pandas as pd  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gender_education.config import CLEANED_CSV  # noqa: E402
+from gender_education.sparklines import CELL_SIZE, render_sprite_sheet  # noqa: E402
+
+
+def save_png(fig, **kwargs):
+    buf = BytesIO()
+    fig.savefig(buf, format='png', **kwargs)
+    plt.close(fig)
+    return buf.getbuffer().nbytes
+
+
+def current_trend_chart(df, column):
+    yearly = df.groupby(['year', 'region'])[column].mean().reset_index()
+    table = yearly.pivot(index='year', columns='region', values=column)
+    fig, ax = plt.subplots(figsize=(14, 7))
+    lines = ax.plot(table.index, table.to_numpy(), marker='o', linewidth=2, markersize=4, alpha=0.8)
+    ax.legend(lines, table.columns, loc='best')
+    ax.grid(True, alpha=0.3)
+    return save_png(fig, dpi=150, bbox_inches='tight')
+
+
+def naive_sparklines(df, column, countries):
+    size = 0
+    for country in countries:
+        rows = df[df['country'] == country]
+        fig, ax = plt.subplots(figsize=(CELL_SIZE[0] / 100, CELL_SIZE[1] / 100), dpi=100)
+        ax.plot(rows['year'], rows[column], linewidth=1.2)
+        ax.axis('off')
+        size += save_png(fig, dpi=100)
+    return size
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--column', default='Literacy_Rate_Female')
+    parser.add_argument('--naive-sample', type=int, default=25)
+    args = parser.parse_args()
+
+    df = pd.read_csv(CLEANED_CSV)
+    countries = sorted(df['country'].unique())
+    # Warm up matplotlib (font cache, Agg) so the first case is not penalized
+    render_sprite_sheet(df, args.column)
+
+    chart_time, chart_bytes = timed(current_trend_chart, df, args.column)
+    sheet_time, (png, _) = timed(render_sprite_sheet, df, args.column)
+    sample = countries[:args.naive_sample]
+    naive_time, naive_bytes = timed(naive_sparklines, df, args.column, sample)
+    naive_total = naive_time * len(countries) / len(sample)
+
+    print(f"{'case':<40}{'time (s)':>10}{'PNG KB':>10}")
+    print("-" * 60)
+    print(f"{'current EDA trend chart (1 chart)':<40}{chart_time:>10.3f}{chart_bytes / 1024:>10.0f}")
+    print(f"{f'sprite sheet ({len(countries)} sparklines)':<40}{sheet_time:>10.3f}{len(png) / 1024:>10.0f}")
+    print(f"{f'one figure per country (est. {len(countries)})':<40}{naive_total:>10.3f}"
+          f"{naive_bytes * len(countries) / len(sample) / 1024:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
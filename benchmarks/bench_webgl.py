@@ -0,0 +1,83 @@
+"""
+Benchmark: HTML payload of dense line charts, SVG vs WebGL.
+
+Builds the per-country trend explorer from the cleaned panel, replicated
+`--scales` times (countries suffixed "#2", "#3", ...), and reports points,
+traces, generated HTML size and build + serialization time for:
+
+- per-country: one SVG scatter trace per country (the naive version)
+- svg:         one trace per region with gaps between countries
+- webgl:       the same traces as scattergl
+
+Payload is identical for SVG and WebGL; the difference is browser-side
+drawing cost, which is why mode='auto' switches to WebGL above
+gender_education.rendering.WEBGL_POINT_THRESHOLD points. The grouped traces
+carry a country label per point, so they are ~30% larger than the naive
+version but stay at 7 traces however many countries are drawn.
+
+Usage:
+    python benchmarks/bench_webgl.py [--scales 1 5 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+import plotly.graph_objects as go
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from gender_education.config import CLEANED_CSV  # noqa: E402
+from gender_education.rendering import (  # noqa: E402
+    WEBGL_POINT_THRESHOLD, apply_render_mode, country_trend_explorer, point_count
+)
+
+COLUMN = 'Literacy_Rate_Female'
+
+
+def replicate_panel(df, scale):
+    copies = [df] + [df.assign(country=df['country'] + f' #{i}') for i in range(2, scale + 1)]
+    return pd.concat(copies, ignore_index=True)
+
+
+def per_country_figure(df):
+    fig = go.Figure()
+    for country, rows in df.dropna(subset=['region']).groupby('country'):
+        fig.add_trace(go.Scatter(x=rows['year'], y=rows[COLUMN].round(2), mode='lines', name=country))
+    return fig
+
+
+def measure(build):
+    start = time.perf_counter()
+    fig = build()
+    html = fig.to_html(include_plotlyjs=False, full_html=False)
+    return fig, len(html.encode('utf-8')), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 5, 20])
+    args = parser.parse_args()
+
+    base = pd.read_csv(CLEANED_CSV)
+    print(f"{'scale':>5}  {'variant':<12}{'points':>9}{'traces':>8}{'HTML KB':>10}{'time (s)':>10}")
+    print("-" * 56)
+    for scale in args.scales:
+        df = replicate_panel(base, scale)
+        variants = [
+            ('per-country', lambda: per_country_figure(df)),
+            ('svg', lambda: country_trend_explorer(df, COLUMN, 'Female Literacy Rate (%)', mode='svg')),
+            ('webgl', lambda: country_trend_explorer(df, COLUMN, 'Female Literacy Rate (%)', mode='webgl')),
+        ]
+        for name, build in variants:
+            fig, size, elapsed = measure(build)
+            print(f"{scale:>5}  {name:<12}{point_count(fig):>9,}{len(fig.data):>8}{size / 1024:>10.0f}{elapsed:>10.2f}")
+        auto = apply_render_mode(country_trend_explorer(df, COLUMN, 'x', mode='svg'), 'auto')
+        print(f"{scale:>5}  auto -> {auto.data[0].type} (threshold {WEBGL_POINT_THRESHOLD:,} points)")
+
+
+if __name__ == '__main__':
+    main()
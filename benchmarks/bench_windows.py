@@ -0,0 +1,112 @@
+"""
+Benchmark and parity check: windowed statistics, one pass vs pandas groupby.
+
+Computes rolling means, YoY changes and CAGR for every (country, indicator)
+series of the cleaned panel tiled `--scale` times, with:
+
+- pandas     groupby('country').rolling / .diff on the panel sorted by
+             (country, year), CAGR from groupby first/last observed values
+- one pass   gender_education.windows.compute_window_stats
+- cached     load_window_stats on a warm store (hash of the frame + npz read)
+
+Before timing, the one-pass results are compared with pandas' (rolling to a
+relative 1e-9, the rest exactly up to float rounding); the script exits with
+status 1 if they differ.
+
+Usage:
+    python benchmarks/bench_windows.py [--scales 1 10 100] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gender_education.config import CLEANED_CSV  # noqa: E402
+from gender_education.windows import (ROLLING_WINDOW, WINDOW_COLS, compute_window_stats,  # noqa: E402
+                                      load_window_stats)
+
+
+def tiled_panel(df, scale):
+    if scale == 1:
+        return df
+    return pd.concat([df.assign(country=df['country'] + f' #{k}') for k in range(scale)], ignore_index=True)
+
+
+def pandas_windows(df, columns, window=ROLLING_WINDOW):
+    """The same statistics with pandas group-bys (the panel has one row per year)."""
+    df = df.sort_values(['country', 'year'], kind='stable')
+    groups = df.groupby('country', sort=True)[columns]
+    rolling = groups.rolling(window, min_periods=window // 2 + 1).mean().reset_index(level=0, drop=True)
+    previous = groups.shift(1)
+    yoy = df[columns] - previous
+    yoy_pct = (yoy / previous.abs() * 100).where(previous != 0)
+
+    observed = df[['country', 'year'] + columns]
+    cagr = {}
+    for col in columns:
+        series = observed.dropna(subset=[col]).groupby('country', sort=True)
+        first, last = series.first(), series.last()
+        years = last['year'] - first['year']
+        ok = (years > 0) & (first[col] > 0) & (last[col] > 0)
+        cagr[col] = ((last[col] / first[col]) ** (1 / years.where(ok)) - 1).where(ok)
+    return rolling, yoy, yoy_pct, pd.DataFrame(cagr)
+
+
+def check_parity(df, columns):
+    rolling, yoy, yoy_pct, cagr = pandas_windows(df, columns)
+    stats = compute_window_stats(df, columns)
+    checks = {
+        'rolling': (stats.rolling, rolling.to_numpy(), 1e-9),
+        'yoy': (stats.yoy, yoy.to_numpy(), 1e-12),
+        'yoy_pct': (stats.yoy_pct, yoy_pct.to_numpy(), 1e-12),
+        'cagr': (stats.cagr, cagr.reindex(stats.countries).to_numpy(), 1e-12),
+    }
+    return [name for name, (ours, expected, rtol) in checks.items()
+            if not np.allclose(ours, expected, rtol=rtol, atol=1e-9, equal_nan=True)]
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    base = pd.read_csv(CLEANED_CSV)
+    columns = [col for col in WINDOW_COLS if col in base.columns]
+    mismatches = check_parity(base, columns)
+    if mismatches:
+        print(f"✗ One-pass results differ from pandas: {', '.join(mismatches)}")
+        sys.exit(1)
+    print(f"✓ Rolling means, YoY and CAGR match pandas on {len(columns)} indicators\n")
+
+    print(f"{'scale':>6}{'rows':>11}{'pandas (ms)':>14}{'one pass (ms)':>16}{'cached (ms)':>14}{'speedup':>10}")
+    print("-" * 71)
+    with tempfile.TemporaryDirectory() as store_dir:
+        for scale in args.scales:
+            df = tiled_panel(base, scale)
+            grouped = best_time(lambda: pandas_windows(df, columns), args.repeat)
+            one_pass = best_time(lambda: compute_window_stats(df, columns), args.repeat)
+            load_window_stats(df, store_dir=store_dir)
+            cached = best_time(lambda: load_window_stats(df, store_dir=store_dir), args.repeat)
+            print(f"{scale:>6}{len(df):>11,}{grouped * 1000:>14.1f}{one_pass * 1000:>16.1f}{cached * 1000:>14.1f}"
+                  f"{grouped / one_pass:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Load test for the local query server (gender_education.server).
+
+Opens `--concurrency` keep-alive connections and sends `--requests` GET
+requests spread over a mix of aggregate, time-series and figure queries,
+then reports requests/sec and latency percentiles (p50/p99). By default a
+server is started in a subprocess on a free port; pass --url to test a
+server that is already running.
+
+Usage:
+    python benchmarks/loadtest_server.py [--requests 5000] [--concurrency 32] [--url http://127.0.0.1:8050]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = [
+    '/api/aggregate?indicator=Literacy_Rate_Female&by=region&start=2000&end=2024',
+    '/api/aggregate?indicator=Adolescent_Fertility_Rate&by=year&region=South+Asia',
+    '/api/aggregate?indicator=Female_Labor_Force_Participation&by=region&stat=median',
+    '/api/timeseries?indicator=Literacy_Rate_Female&by=region',
+    '/api/timeseries?indicator=Gender_Equality_Index&by=country&region=Sub-Saharan+Africa&start=1990',
+    '/api/figure/regional_trends?indicator=Literacy_Gap&start=1990&end=2020',
+    '/api/figure/scatter?year=2010',
+]
+
+
+async def worker(host, port, paths, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode())
+            await writer.drain()
+            length = 0
+            status = await reader.readline()
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not status.startswith(b'HTTP/1.1 200'):
+                raise RuntimeError(f'{path}: {status.decode().strip()}')
+    finally:
+        writer.close()
+
+
+async def run(host, port, n_requests, concurrency):
+    paths = [QUERIES[i % len(QUERIES)] for i in range(n_requests)]
+    latencies = []
+
+    # Cold pass: every distinct query once (cache misses)
+    cold = []
+    await worker(host, port, QUERIES, cold)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        worker(host, port, paths[i::concurrency], latencies) for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    return cold, latencies, elapsed
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(host, port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server did not start on {host}:{port}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--url', help='existing server, e.g. http://127.0.0.1:8050')
+    args = parser.parse_args()
+
+    proc = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        host, port = '127.0.0.1', free_port()
+        proc = subprocess.Popen(
+            [sys.executable, '-m', 'gender_education.server', '--host', host, '--port', str(port)],
+            cwd=PROJECT_DIR, stdout=subprocess.DEVNULL
+        )
+    try:
+        wait_for_port(host, port)
+        cold, latencies, elapsed = asyncio.run(run(host, port, args.requests, args.concurrency))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    lat_ms = np.array(latencies) * 1000
+    print(f"Cold (uncached) queries: {len(cold)}, mean {np.mean(cold) * 1000:.1f} ms, max {np.max(cold) * 1000:.1f} ms")
+    print(f"Requests:    {len(latencies):,} over {args.concurrency} connections")
+    print(f"Throughput:  {len(latencies) / elapsed:,.0f} requests/sec")
+    print(f"Latency:     p50 {np.percentile(lat_ms, 50):.2f} ms, p99 {np.percentile(lat_ms, 99):.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
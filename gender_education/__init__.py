@@ -0,0 +1,6 @@
+"""
+Reusable pipeline components for the SDG 5 gender education analysis.
+
+The notebooks and generate_dashboard.py import from this package so that the
+cleaning, analysis and dashboard steps share one implementation.
+"""
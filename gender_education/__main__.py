@@ -0,0 +1,36 @@
+"""
+Command-line entry point: python -m gender_education <command> [options]
+
+Commands:
+    build    rebuild the cleaned data, figures and HTML pages (see build.py)
+    watch    rebuild the dashboard on changes and live-reload it (see watch.py)
+    validate check the raw data and write its coverage index (see validation.py)
+    site     write a drill-down page per region and country (see site.py)
+    offline  write the dashboard as an offline-capable multi-file site (see offline.py)
+    sensitivity
+             re-run the imputation over a parameter grid (see sensitivity.py)
+"""
+
+import sys
+
+COMMANDS = {
+    'build': 'gender_education.build',
+    'watch': 'gender_education.watch',
+    'validate': 'gender_education.validation',
+    'site': 'gender_education.site',
+    'offline': 'gender_education.offline',
+    'sensitivity': 'gender_education.sensitivity',
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(__doc__.strip())
+        return 2
+    import importlib
+    return importlib.import_module(COMMANDS[argv[0]]).main(argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
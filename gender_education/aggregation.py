@@ -0,0 +1,256 @@
+"""
+Chart data queries with interchangeable execution backends.
+
+The dashboard's chart inputs are a handful of filter -> group by -> mean
+queries over the cleaned panel. A Query describes one as plain data, and a
+backend runs it:
+
+- 'pandas'  eager DataFrame operations (the default; no extra dependency)
+- 'polars'  a Polars LazyFrame: the plan is optimized (only the columns and
+            rows the query needs are read) and executed multi-threaded;
+            run_queries() collects all plans at once with pl.collect_all
+- 'arrow'   PyArrow compute kernels and Table.group_by (multi-threaded)
+
+Every backend returns a pandas DataFrame with the same columns, row order and
+dtypes, so charts do not depend on the backend:
+
+    yearly = run_query(df, Query(by=['year', 'region'], columns=['Literacy_Rate_Female']))
+    bubbles = run_query(df, Query(where=[('year', 'every', 3)]), backend='polars')
+
+Polars and PyArrow are optional and imported on first use.
+"""
+
+import numpy as np
+import pandas as pd
+
+BACKENDS = ('pandas', 'polars', 'arrow')
+AGGREGATIONS = ('mean', 'min', 'max', 'count')
+FILTER_OPS = ('==', '!=', '>', '>=', '<', '<=', 'every', 'max')
+
+
+class Query:
+    """
+    Filter rows, then group by `by` and aggregate `columns` with `agg`, then
+    sort by `sort` (a list of (column, descending) pairs).
+
+    `where` is a list of (column, op, value) conditions, all of which must
+    hold: op is a comparison, 'every' (integer column % value == 0) or 'max'
+    (column equals its maximum; value is ignored). Without `by` the query
+    returns the filtered rows (`columns` only, if given). Grouped results are
+    sorted by the group keys, like pandas' groupby, before `sort` is applied.
+    """
+
+    def __init__(self, columns=None, where=(), by=(), agg='mean', sort=()):
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {agg!r}; choose from {AGGREGATIONS}")
+        for column, op, _ in where:
+            if op not in FILTER_OPS:
+                raise ValueError(f"Unknown filter {op!r} on {column!r}; choose from {FILTER_OPS}")
+        if by and columns is None:
+            raise ValueError("Grouped queries need the columns to aggregate")
+        self.columns = None if columns is None else list(columns)
+        self.where = [tuple(condition) for condition in where]
+        self.by = list(by)
+        self.agg = agg
+        self.sort = [tuple(key) for key in sort]
+
+    def output_columns(self, df_columns):
+        if self.by:
+            return self.by + self.columns
+        return list(df_columns) if self.columns is None else self.columns
+
+    def __repr__(self):
+        return (f"Query(columns={self.columns!r}, where={self.where!r}, by={self.by!r}, "
+                f"agg={self.agg!r}, sort={self.sort!r})")
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class PandasBackend:
+    name = 'pandas'
+
+    def _mask(self, df, column, op, value):
+        values = df[column]
+        if op == 'every':
+            return values % value == 0
+        if op == 'max':
+            return values == values.max()
+        return {'==': values.eq, '!=': values.ne, '>': values.gt, '>=': values.ge,
+                '<': values.lt, '<=': values.le}[op](value)
+
+    def run(self, df, query):
+        mask = np.ones(len(df), dtype=bool)
+        for condition in query.where:
+            mask &= self._mask(df, *condition).to_numpy()
+        rows = df[mask] if query.where else df
+        if query.by:
+            result = rows.groupby(query.by)[query.columns].agg(query.agg).reset_index()
+        else:
+            result = rows[query.output_columns(df.columns)].reset_index(drop=True)
+        for column, descending in reversed(query.sort):
+            result = result.sort_values(column, ascending=not descending, kind='stable')
+        return result.reset_index(drop=True)
+
+    def run_many(self, df, queries):
+        return [self.run(df, query) for query in queries]
+
+
+class _ConvertingBackend:
+    """Keeps the converted copy of the last DataFrame it was given."""
+
+    def __init__(self):
+        self._source = None
+        self._converted = None
+
+    def convert(self, df):
+        if self._source is not df:
+            self._converted = self._from_pandas(df)
+            self._source = df
+        return self._converted
+
+    def run(self, df, query):
+        return self.run_many(df, [query])[0]
+
+
+class PolarsBackend(_ConvertingBackend):
+    name = 'polars'
+
+    def __init__(self):
+        import polars as pl
+
+        super().__init__()
+        self.pl = pl
+
+    def _from_pandas(self, df):
+        # NaN becomes null, which Polars aggregations skip like pandas skips NaN
+        return self.pl.from_pandas(df, nan_to_null=True).lazy()
+
+    def _condition(self, column, op, value):
+        col = self.pl.col(column)
+        if op == 'every':
+            return col % value == 0
+        if op == 'max':
+            return col == col.max()
+        return {'==': col.__eq__, '!=': col.__ne__, '>': col.__gt__, '>=': col.__ge__,
+                '<': col.__lt__, '<=': col.__le__}[op](value)
+
+    def plan(self, frame, query, df_columns):
+        pl = self.pl
+        for condition in query.where:
+            frame = frame.filter(self._condition(*condition))
+        if query.by:
+            # pandas leaves rows with a missing group key out of every group
+            frame = frame.filter(pl.all_horizontal([pl.col(key).is_not_null() for key in query.by]))
+            aggs = [getattr(pl.col(column), query.agg)().alias(column) for column in query.columns]
+            if query.agg == 'count':
+                aggs = [agg.cast(pl.Int64) for agg in aggs]
+            frame = frame.group_by(query.by).agg(aggs).sort(query.by, nulls_last=True)
+        else:
+            frame = frame.select(query.output_columns(df_columns))
+        if query.sort:
+            frame = frame.sort([column for column, _ in query.sort],
+                               descending=[descending for _, descending in query.sort],
+                               nulls_last=True, maintain_order=True)
+        return frame
+
+    def run_many(self, df, queries):
+        frame = self.convert(df)
+        plans = [self.plan(frame, query, df.columns) for query in queries]
+        # One call: the plans share the scan and run in parallel
+        return [pd.DataFrame({series.name: series.to_numpy() for series in result.get_columns()})
+                for result in self.pl.collect_all(plans)]
+
+
+class ArrowBackend(_ConvertingBackend):
+    name = 'arrow'
+
+    def __init__(self):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        super().__init__()
+        self.pa = pa
+        self.pc = pc
+
+    def _from_pandas(self, df):
+        return self.pa.Table.from_pandas(df, preserve_index=False)
+
+    def _mask(self, table, column, op, value):
+        pc = self.pc
+        values = table[column]
+        if op == 'every':
+            # x is a multiple of value when floor(x / value) * value == x; pc.divide truncates integer
+            # columns already, float columns need the explicit floor
+            quotient = pc.divide(values, value)
+            if not self.pa.types.is_integer(values.type):
+                quotient = pc.floor(quotient)
+            return pc.equal(pc.multiply(quotient, value), values)
+        if op == 'max':
+            return pc.equal(values, pc.max(values))
+        function = {'==': pc.equal, '!=': pc.not_equal, '>': pc.greater, '>=': pc.greater_equal,
+                    '<': pc.less, '<=': pc.less_equal}[op]
+        return function(values, value)
+
+    def _run(self, table, query, df_columns):
+        pc = self.pc
+        if query.where:
+            mask = self._mask(table, *query.where[0])
+            for condition in query.where[1:]:
+                mask = pc.and_kleene(mask, self._mask(table, *condition))
+            table = table.filter(mask)
+        if query.by:
+            for key in query.by:
+                table = table.filter(pc.is_valid(table[key]))
+            grouped = table.group_by(query.by).aggregate([(column, query.agg) for column in query.columns])
+            table = grouped.rename_columns([name[:-len(query.agg) - 1] if name.endswith('_' + query.agg) else name
+                                            for name in grouped.column_names])
+            table = table.select(query.output_columns(df_columns))
+            table = table.sort_by([(column, 'ascending') for column in query.by])
+        else:
+            table = table.select(query.output_columns(df_columns))
+        if query.sort:
+            table = table.sort_by([(column, 'descending' if descending else 'ascending')
+                                   for column, descending in query.sort])
+        return table.to_pandas()
+
+    def run_many(self, df, queries):
+        table = self.convert(df)
+        return [self._run(table, query, df.columns) for query in queries]
+
+
+_BACKEND_CLASSES = {'pandas': PandasBackend, 'polars': PolarsBackend, 'arrow': ArrowBackend}
+_backends = {}
+
+
+def get_backend(name='pandas'):
+    """Backend instance by name (ImportError if its library is not installed)."""
+    if name not in _BACKEND_CLASSES:
+        raise ValueError(f"Unknown backend {name!r}; choose from {BACKENDS}")
+    if name not in _backends:
+        _backends[name] = _BACKEND_CLASSES[name]()
+    return _backends[name]
+
+
+def available_backends():
+    """Names of the backends whose library can be imported."""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def run_query(df, query, backend='pandas'):
+    return get_backend(backend).run(df, query)
+
+
+def run_queries(df, queries, backend='pandas'):
+    """{name: result} for a {name: Query} dict, executed together."""
+    names = list(queries)
+    results = get_backend(backend).run_many(df, [queries[name] for name in names])
+    return dict(zip(names, results))
@@ -0,0 +1,185 @@
+"""
+Statistics store behind analysis.html and notebook 3's summary tests.
+
+The analysis page used to be a hand-written string whose numbers (r ≈ 0.30,
+GPI 0.85 -> 0.95, "15 countries"...) were read off an earlier version of the
+data. compute_statistics() derives them from the cleaned panel: indicator
+correlations, one-way ANOVA F/p across regions (scipy.stats.f_oneway),
+regional parity and indicator summaries, global first/last-year means,
+latest-year percentiles and top/bottom lists. The result is a JSON-ready dict.
+
+load_statistics() keeps one JSON file per dataset under .stats_cache/, keyed
+by a hash of the frame's contents, so the statistics are computed once per
+dataset and every later page build or notebook run just reads them:
+
+    stats = load_statistics(df)
+    stats['anova']['Literacy_Rate_Female']['p']
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .config import INDICATOR_COLS, PROJECT_DIR
+from .rankings import RankingIndex
+
+STATS_STORE_DIR = os.path.join(PROJECT_DIR, '.stats_cache')
+
+# Bump when compute_statistics changes what it stores: old entries are ignored
+STATS_VERSION = 1
+
+ANOVA_COLS = INDICATOR_COLS + ['Literacy_Gap', 'Literacy_Gender_Parity_Index']
+RANKED_COLS = ['Gender_Equality_Index', 'Literacy_Rate_Female', 'Literacy_Gap']
+
+# Regional parity tiers on the latest-year mean parity index
+PARITY_TIERS = [('achieved', 0.98), ('near', 0.90), ('gap', -np.inf)]
+
+
+def dataset_digest(df):
+    """sha256 of a frame's columns and values (row order included)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _number(value, decimals=4):
+    """JSON-safe float (None for NaN)."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, decimals)
+
+
+def _country_values(table):
+    return [[country, _number(value)] for country, value in zip(table['country'], table['value'])]
+
+
+def _correlations(df):
+    cols = [col for col in INDICATOR_COLS if col in df.columns]
+    matrix = df[cols].corr()
+    return {row: {col: _number(matrix.loc[row, col]) for col in cols} for row in cols}
+
+
+def _anova(df):
+    from scipy.stats import f_oneway
+
+    results = {}
+    for col in ANOVA_COLS:
+        if col not in df.columns:
+            continue
+        groups = [values.to_numpy() for _, values in df[col].dropna().groupby(df['region'])]
+        groups = [values for values in groups if len(values) >= 2]
+        if len(groups) < 2:
+            continue
+        f_stat, p_value = f_oneway(*groups)
+        n = sum(len(values) for values in groups)
+        results[col] = {'F': _number(f_stat), 'p': float(p_value), 'regions': len(groups),
+                        'df_between': len(groups) - 1, 'df_within': n - len(groups)}
+    return results
+
+
+def _regions(df, first_year, last_year):
+    # A region with no rows in the first or last year gets an empty frame, so its figures come out as None
+    empty = df.iloc[:0]
+    first = dict(tuple(df[df['year'] == first_year].groupby('region')))
+    last = dict(tuple(df[df['year'] == last_year].groupby('region')))
+    parity = df.groupby('region')['Literacy_Gender_Parity_Index'].agg(['mean', 'median', 'std', 'min', 'max'])
+    regions = {}
+    for region in sorted(df['region'].dropna().unique()):
+        latest = last.get(region, empty)
+        regions[region] = {
+            'countries': int(latest['country'].nunique()),
+            'literacy_female_median': _number(latest['Literacy_Rate_Female'].median()),
+            'literacy_female_first': _number(first.get(region, empty)['Literacy_Rate_Female'].mean()),
+            'literacy_female_last': _number(latest['Literacy_Rate_Female'].mean()),
+            'literacy_gap_last': _number(latest['Literacy_Gap'].mean()),
+            'parity_last': _number(latest['Literacy_Gender_Parity_Index'].mean()),
+            'parity': {stat: _number(parity.loc[region, stat]) for stat in parity.columns},
+            'fertility_median': _number(latest['Adolescent_Fertility_Rate'].median()),
+            'labor_female_mean': _number(latest['Female_Labor_Force_Participation'].mean()),
+        }
+    return regions
+
+
+def _parity_tiers(regions):
+    tiers = {name: [] for name, _ in PARITY_TIERS}
+    for region, summary in sorted(regions.items(), key=lambda item: -(item[1]['parity_last'] or 0)):
+        if summary['parity_last'] is None:
+            continue
+        name = next(name for name, low in PARITY_TIERS if summary['parity_last'] >= low)
+        tiers[name].append(region)
+    return tiers
+
+
+def _changes(df, first_year, last_year, n=5):
+    """Country lists built from first-year -> last-year changes."""
+    cols = ['Literacy_Rate_Female', 'Adolescent_Fertility_Rate', 'Female_Labor_Force_Participation']
+    first = df[df['year'] == first_year].set_index('country')[cols]
+    last = df[df['year'] == last_year].set_index('country')[cols]
+    change = (last - first).dropna()
+
+    improvers = change[change['Adolescent_Fertility_Rate'] < 0].nlargest(n, 'Literacy_Rate_Female')
+    paradox = change[(change['Literacy_Rate_Female'] > 0) & (change['Female_Labor_Force_Participation'] < 0)]
+    paradox = paradox.nsmallest(n, 'Female_Labor_Force_Participation')
+    literate = last[last['Literacy_Rate_Female'] >= 90]
+    integration = literate.nlargest(n, 'Female_Labor_Force_Participation')
+    return {
+        'improvers': [[country, _number(row['Literacy_Rate_Female']), _number(row['Adolescent_Fertility_Rate'])]
+                      for country, row in improvers.iterrows()],
+        'labor_paradox': [[country, _number(row['Literacy_Rate_Female']),
+                           _number(row['Female_Labor_Force_Participation'])] for country, row in paradox.iterrows()],
+        'integration': [[country, _number(row['Literacy_Rate_Female']),
+                         _number(row['Female_Labor_Force_Participation'])] for country, row in integration.iterrows()],
+    }
+
+
+def compute_statistics(df, n=5):
+    """Every number of the analysis page, as a JSON-ready dict."""
+    first_year, last_year = int(df['year'].min()), int(df['year'].max())
+    yearly = df.groupby('year')[['Literacy_Rate_Female', 'Literacy_Gap', 'Literacy_Gender_Parity_Index']].mean()
+    latest = df[df['year'] == last_year]
+    reverse = latest[latest['Literacy_Gender_Parity_Index'] > 1].sort_values('Literacy_Gender_Parity_Index',
+                                                                               ascending=False)
+    rankings = RankingIndex.from_frame(df)
+    regions = _regions(df, first_year, last_year)
+
+    return {
+        'dataset': {'countries': int(df['country'].nunique()), 'regions': len(regions), 'rows': len(df),
+                    'first_year': first_year, 'last_year': last_year, 'years': int(df['year'].nunique())},
+        'global': {col: {'first': _number(yearly.loc[first_year, col]), 'last': _number(yearly.loc[last_year, col])}
+                   for col in yearly.columns},
+        'spread': {col: {'p05': _number(latest[col].quantile(0.05)), 'median': _number(latest[col].median()),
+                         'p95': _number(latest[col].quantile(0.95))} for col in INDICATOR_COLS if col in df.columns},
+        'correlations': _correlations(df),
+        'anova': _anova(df),
+        'regions': regions,
+        'parity_tiers': _parity_tiers(regions),
+        'reverse_gap': {'count': len(reverse), 'countries': _country_values(
+            reverse.rename(columns={'Literacy_Gender_Parity_Index': 'value'}))},
+        'rankings': {col: {'top': _country_values(rankings.top(last_year, col, n)),
+                           'bottom': _country_values(rankings.bottom(last_year, col, n))}
+                     for col in RANKED_COLS if col in df.columns},
+        **_changes(df, first_year, last_year, n),
+    }
+
+
+def load_statistics(df, store_dir=STATS_STORE_DIR, force=False):
+    """compute_statistics(df), read from the store when this dataset was seen before."""
+    digest = dataset_digest(df)
+    path = os.path.join(store_dir, f'{digest[:32]}.json')
+    if not force and os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            stored = json.load(f)
+        if stored.get('version') == STATS_VERSION and stored.get('digest') == digest:
+            return stored['stats']
+
+    stats = compute_statistics(df)
+    os.makedirs(store_dir, exist_ok=True)
+    # Write then rename: a notebook and a build may fill the store at once
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': STATS_VERSION, 'digest': digest, 'stats': stats}, f, indent=1, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return stats
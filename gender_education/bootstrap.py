@@ -0,0 +1,127 @@
+"""
+Bootstrap confidence intervals for grouped means (e.g. region x year).
+
+Every group is resampled with replacement using whole index matrices instead
+of Python loops: values are padded into a (groups, max_group_size) array and
+each block of replicates draws a (replicates, groups, max_group_size) index
+array in one call. Replicate blocks have their own child seed, so results are
+reproducible and identical whether blocks run in-process or in a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Replicates per block: bounds memory to block * groups * max_group_size indices
+BLOCK_SIZE = 200
+# Cap on block * groups * max_group_size (32 MB per float64 array). Larger
+# panels get fewer replicates per block so memory does not grow with the data.
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+
+def _pad_groups(values, codes, n_groups):
+    """Pack the non-NaN values of each group into a NaN-padded 2-D array."""
+    valid = ~np.isnan(values)
+    values, codes = values[valid], codes[valid]
+    order = np.argsort(codes, kind='stable')
+    values, codes = values[order], codes[order]
+
+    sizes = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    positions = np.arange(len(codes)) - starts[codes]
+
+    padded = np.full((n_groups, max(sizes.max(initial=0), 1)), np.nan)
+    padded[codes, positions] = values
+    return padded, sizes
+
+
+def _bootstrap_block(padded, sizes, n_replicates, seed):
+    """Means of `n_replicates` resamples for every group -> (replicates, groups)."""
+    rng = np.random.default_rng(seed)
+    n_groups, width = padded.shape
+    # Uniform draws scaled by each group's size give per-group indices
+    draws = rng.random((n_replicates, n_groups, width))
+    idx = (draws * sizes[None, :, None]).astype(np.int64)
+    sample = np.take_along_axis(padded[None, :, :], idx, axis=2)
+    # Only the first `size` draws of each group belong to the resample
+    in_sample = np.arange(width)[None, None, :] < sizes[None, :, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(in_sample, sample, 0.0).sum(axis=2) / sizes[None, :]
+
+
+def _block_sizes(n_boot, padded_size):
+    per_block = max(1, min(BLOCK_SIZE, MAX_BLOCK_ELEMENTS // padded_size))
+    n_blocks = -(-n_boot // per_block)
+    return [min(per_block, n_boot - i * per_block) for i in range(n_blocks)]
+
+
+def bootstrap_means(df, columns, by=('region', 'year'), n_boot=1000, ci=0.95,
+                    seed=42, n_jobs=1):
+    """
+    Bootstrap CI of the mean of every column within every `by` group.
+
+    Returns a long table with the group keys, 'indicator', 'n', 'mean',
+    'ci_low' and 'ci_high'. n_jobs > 1 spreads replicate blocks over a
+    process pool; the result does not depend on n_jobs.
+    """
+    by = list(by)
+    data = df.dropna(subset=by)
+    codes, groups = pd.MultiIndex.from_frame(data[by]).factorize(sort=True)
+    groups = groups.set_names(by)
+    n_groups = len(groups)
+
+    pool = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 and n_boot > BLOCK_SIZE else None
+    tables = []
+    try:
+        for col_idx, col in enumerate(columns):
+            padded, sizes = _pad_groups(data[col].to_numpy(dtype=float), codes, n_groups)
+            block_sizes = _block_sizes(n_boot, padded.size)
+            n_blocks = len(block_sizes)
+            seeds = np.random.SeedSequence([seed, col_idx]).spawn(n_blocks)
+            if pool is not None:
+                blocks = list(pool.map(_bootstrap_block, [padded] * n_blocks, [sizes] * n_blocks,
+                                       block_sizes, seeds))
+            else:
+                blocks = [_bootstrap_block(padded, sizes, n, s) for n, s in zip(block_sizes, seeds)]
+            tables.append(_summarise(groups, col, padded, sizes, np.concatenate(blocks, axis=0), ci))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return pd.concat(tables, ignore_index=True)
+
+
+def _summarise(groups, col, padded, sizes, replicates, ci):
+    alpha = (1 - ci) / 2
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.nansum(padded, axis=1) / sizes
+    low, high = np.quantile(replicates, [alpha, 1 - alpha], axis=0)
+    empty = sizes == 0
+    means[empty] = low[empty] = high[empty] = np.nan
+
+    table = groups.to_frame(index=False)
+    table['indicator'] = col
+    table['n'] = sizes
+    table['mean'] = means
+    table['ci_low'] = low
+    table['ci_high'] = high
+    return table
+
+
+def ci_frame(boot_table, indicator):
+    """Wide view for one indicator: group keys plus mean / ci_low / ci_high."""
+    table = boot_table[boot_table['indicator'] == indicator]
+    return table.drop(columns='indicator').reset_index(drop=True)
+
+
+def ci_errors(boot_table, indicator, labels, key='region'):
+    """
+    (minus, plus) error-bar lengths for `indicator`, aligned to `labels`
+    (e.g. the region order of a bar chart).
+    """
+    table = ci_frame(boot_table, indicator).set_index(key).reindex(labels)
+    minus = (table['mean'] - table['ci_low']).to_numpy()
+    plus = (table['ci_high'] - table['mean']).to_numpy()
+    return minus, plus
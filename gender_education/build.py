@@ -0,0 +1,444 @@
+"""
+Build orchestrator: the pipeline as a dependency graph of cached tasks.
+
+fetch -> clean -> (EDA figures, dashboard charts...) -> HTML pages used to be
+four manual steps, with everything inside generate_dashboard.py running one
+after another. Here every step is a Task with named dependencies; tasks whose
+dependencies are done run concurrently in a process pool (matplotlib charts
+next to Plotly figure building), and each result is pickled under
+.build_cache/ keyed by a hash of the task's code, arguments, input files and
+dependency keys, so an unchanged task is loaded instead of re-run. The code
+part covers the package sources and, for functions outside the package, the
+source of the function and of the helpers and constants it uses from its
+module, so editing one chart in generate_dashboard.py only re-runs that chart
+(statements outside functions are not tracked: use --force). The run ends
+with the critical path: the chain of tasks that bounded the wall time.
+
+Usage:
+    python -m gender_education build [--jobs 4] [--force] [--fetch] [--offline]
+"""
+
+import argparse
+import functools
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+import string
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .cache import file_digest
+from .config import (CLEANED_CSV, COVERAGE_FILE, FIGURES_DIR, OFFLINE_DIR, PROJECT_DIR, PROVENANCE_FILE, RAW_CSV,
+                     SENSITIVITY_REPORT, SITE_DIR)
+
+BUILD_CACHE_DIR = os.path.join(PROJECT_DIR, '.build_cache')
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Task:
+    """
+    One node of the build graph.
+
+    `func` is called as func(*args, *deps) when `deps` is a list of task
+    names, or func(*args, **{param: result}) when it is a dict mapping
+    parameter names to task names. `inputs` are files whose contents are part
+    of the cache key; `outputs` are files the task writes (it is re-run if
+    one is missing or its contents changed since the run). Tasks with cache=False always run.
+    """
+
+    def __init__(self, name, func, deps=(), args=(), inputs=(), outputs=(), cache=True):
+        self.name = name
+        self.func = func
+        self.deps = deps
+        self.args = tuple(args)
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.cache = cache
+
+    @property
+    def dep_names(self):
+        return list(self.deps.values()) if isinstance(self.deps, dict) else list(self.deps)
+
+    def call(self, results):
+        if isinstance(self.deps, dict):
+            return self.func(*self.args, **{param: results[dep] for param, dep in self.deps.items()})
+        return self.func(*self.args, *[results[dep] for dep in self.deps])
+
+
+def _stable_repr(value):
+    # Functions and classes by qualified name: their default repr holds an address
+    if callable(value) and hasattr(value, '__qualname__'):
+        return f'{value.__module__}.{value.__qualname__}'
+    if isinstance(value, (list, tuple)):
+        return '(' + ','.join(_stable_repr(v) for v in value) + ')'
+    if isinstance(value, string.Template):
+        return f'Template({value.template!r})'
+    return repr(value)
+
+
+@functools.lru_cache(maxsize=None)
+def _package_digest():
+    """Digest of the gender_education package sources (once per process)."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(PACKAGE_DIR)):
+        if name.endswith('.py'):
+            digest.update(file_digest(os.path.join(PACKAGE_DIR, name)).encode())
+    return digest.hexdigest()
+
+
+def _referenced_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _referenced_names(const)
+    return names
+
+
+def _function_digest(func, digest, seen):
+    """
+    Feed `digest` with the source of `func` and of everything it uses from
+    its own module: helper functions (recursively) and constants (by repr).
+    Editing one chart function therefore only changes the keys of the
+    tasks that call it.
+    """
+    if func in seen:
+        return
+    seen.add(func)
+    try:
+        digest.update(inspect.getsource(func).encode())
+    except (OSError, TypeError):
+        digest.update(_stable_repr(func).encode())
+        return
+    if not inspect.isfunction(func):
+        return
+    module_globals = func.__globals__
+    for name in sorted(_referenced_names(func.__code__)):
+        if name not in module_globals:
+            continue
+        value = module_globals[name]
+        if inspect.ismodule(value):
+            continue
+        if callable(value):
+            if getattr(value, '__module__', None) == func.__module__:
+                _function_digest(value, digest, seen)
+            continue
+        digest.update(f'{name}={_stable_repr(value)}'.encode())
+
+
+def _code_digest(task):
+    """Digest of the code a task runs: its function and callable arguments."""
+    digest = hashlib.sha256(_package_digest().encode())
+    seen = set()
+    for func in [task.func] + [arg for arg in task.args if callable(arg)]:
+        # Package functions are covered by the package digest
+        if not getattr(func, '__module__', '').startswith(__package__):
+            _function_digest(func, digest, seen)
+        else:
+            digest.update(_stable_repr(func).encode())
+    return digest.hexdigest()
+
+
+def topological_order(tasks):
+    by_name = {task.name: task for task in tasks}
+    order, state = [], {}
+
+    def visit(name, path):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        if name not in by_name:
+            raise ValueError(f"Unknown task {name!r} (required by {path[-1]!r})")
+        state[name] = 'visiting'
+        for dep in by_name[name].dep_names:
+            visit(dep, path + [name])
+        state[name] = 'done'
+        order.append(by_name[name])
+
+    for task in tasks:
+        visit(task.name, [])
+    return order
+
+
+def task_keys(order):
+    keys = {}
+    for task in order:
+        digest = hashlib.sha256()
+        digest.update(task.name.encode())
+        digest.update(_code_digest(task).encode())
+        digest.update(_stable_repr(task.args).encode())
+        for path in task.inputs:
+            digest.update(file_digest(path).encode() if os.path.exists(path) else b'missing')
+        for dep in task.dep_names:
+            digest.update(keys[dep].encode())
+        keys[task.name] = digest.hexdigest()
+    return keys
+
+
+def _cache_path(cache_dir, name):
+    return os.path.join(cache_dir, name.replace('/', '_') + '.pkl')
+
+
+def _output_digests(task):
+    return {path: file_digest(path) if os.path.exists(path) else None for path in task.outputs}
+
+
+def _cached(task, key, cache_dir):
+    if cache_dir is None or not task.cache or not all(os.path.exists(p) for p in task.outputs):
+        return False
+    path = _cache_path(cache_dir, task.name)
+    if not os.path.exists(path):
+        return False
+    with open(path, 'rb') as f:
+        entry = pickle.load(f)
+    # An output replaced since the run (git checkout, hand edits) means the task runs again
+    return entry['key'] == key and entry.get('outputs') == _output_digests(task)
+
+
+def _load(cache_dir, name):
+    with open(_cache_path(cache_dir, name), 'rb') as f:
+        return pickle.load(f)['result']
+
+
+def _store(cache_dir, task, key, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(cache_dir, task.name)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    entry = {'key': key, 'result': result, 'outputs': _output_digests(task)}
+    with open(tmp, 'wb') as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _run_task(task, dep_results):
+    start = time.perf_counter()
+    result = task.call(dep_results)
+    return result, time.perf_counter() - start
+
+
+def run_tasks(tasks, jobs=None, cache_dir=BUILD_CACHE_DIR, force=False, targets=None):
+    """
+    Run `tasks` (or only what `targets` need) and return a report.
+
+    jobs=1 runs everything in this process, in dependency order;
+    cache_dir=None disables the cache. The report maps every task name to
+    its 'status' ('ran' or 'cached'), 'seconds', 'start' and 'end' offsets
+    and the 'result' when it was computed or needed by a later task.
+    """
+    order = topological_order(tasks)
+    if targets:
+        needed = set()
+        by_name = {task.name: task for task in order}
+        unknown = [name for name in targets if name not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown target{'s' if len(unknown) > 1 else ''} {', '.join(map(repr, unknown))}; "
+                             f"valid tasks: {', '.join(sorted(by_name))}")
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(by_name[name].dep_names)
+        order = [task for task in order if task.name in needed]
+
+    keys = task_keys(order)
+    by_name = {task.name: task for task in order}
+    dependents = {task.name: [t.name for t in order if task.name in t.dep_names] for task in order}
+    report = {task.name: {'deps': task.dep_names} for task in order}
+    results = {}
+    t0 = time.perf_counter()
+
+    fresh = {task.name for task in order if not force and _cached(task, keys[task.name], cache_dir)}
+    # A cached task is only loaded when a task that runs needs its result
+    to_run = [task.name for task in order if task.name not in fresh]
+    for name in fresh:
+        report[name].update(status='cached', seconds=0.0, start=0.0, end=0.0)
+
+    def inputs_of(task):
+        for dep in task.dep_names:
+            if dep not in results:
+                results[dep] = _load(cache_dir, dep)
+        return {dep: results[dep] for dep in task.dep_names}
+
+    def finish(name, result, seconds, start):
+        results[name] = result
+        report[name].update(status='ran', seconds=seconds, start=start, end=time.perf_counter() - t0)
+        if cache_dir is not None and by_name[name].cache:
+            _store(cache_dir, by_name[name], keys[name], result)
+
+    # A single task (e.g. one edited chart) runs here: no pool start-up
+    if jobs == 1 or len(to_run) <= 1:
+        for name in to_run:
+            start = time.perf_counter() - t0
+            result, seconds = _run_task(by_name[name], inputs_of(by_name[name]))
+            finish(name, result, seconds, start)
+    else:
+        waiting = {name: {dep for dep in by_name[name].dep_names if dep not in fresh} for name in to_run}
+        running = {}
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            while waiting or running:
+                for name in [n for n, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    task = by_name[name]
+                    future = pool.submit(_run_task, task, inputs_of(task))
+                    running[future] = (name, time.perf_counter() - t0)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, start = running.pop(future)
+                    result, seconds = future.result()
+                    finish(name, result, seconds, start)
+                    for child in dependents[name]:
+                        if child in waiting:
+                            waiting[child].discard(name)
+
+    for name in results:
+        report[name]['result'] = results[name]
+    report['_wall'] = time.perf_counter() - t0
+    return report
+
+
+def critical_path(report):
+    """Longest chain of dependent tasks by run time -> (names, seconds)."""
+    finish, previous = {}, {}
+    names = [name for name in report if not name.startswith('_')]
+    # report keys are in dependency order (topological)
+    for name in names:
+        deps = report[name]['deps']
+        best = max(deps, key=lambda dep: finish[dep], default=None)
+        previous[name] = best
+        finish[name] = report[name]['seconds'] + (finish[best] if best else 0.0)
+    if not finish:
+        return [], 0.0
+    name = max(finish, key=finish.get)
+    total, path = finish[name], []
+    while name is not None:
+        path.append(name)
+        name = previous[name]
+    return path[::-1], total
+
+
+def print_report(report):
+    names = [name for name in report if not name.startswith('_')]
+    ran = [name for name in names if report[name]['status'] == 'ran']
+    busy = sum(report[name]['seconds'] for name in ran)
+    print(f"\n{'task':<28}{'status':>8}{'time (s)':>10}")
+    print("-" * 46)
+    for name in names:
+        print(f"{name:<28}{report[name]['status']:>8}{report[name]['seconds']:>10.2f}")
+    print(f"\n✓ {len(ran)} tasks ran, {len(names) - len(ran)} cached; "
+          f"{busy:.1f}s of task time in {report['_wall']:.1f}s wall time")
+    path, total = critical_path(report)
+    print(f"✓ Critical path ({total:.1f}s): " + ' -> '.join(f"{name} ({report[name]['seconds']:.1f}s)" for name in path))
+
+
+# ============================================================================
+# The site build graph
+# ============================================================================
+
+def _fetch_raw():
+    import runpy
+    cwd = os.getcwd()
+    os.chdir(PROJECT_DIR)
+    try:
+        runpy.run_path(os.path.join(PROJECT_DIR, 'fetch_gender_data.py'), run_name='__main__')
+    finally:
+        os.chdir(cwd)
+
+
+def _clean(raw_path, output_path, provenance_path, coverage_path):
+    import pandas as pd
+
+    from .cleaning import clean_dataset
+    from .validation import validate_panel
+
+    # Range violations or duplicate rows stop the build (ValidationError) before anything is written
+    raw = pd.read_csv(raw_path)
+    report = validate_panel(raw)
+    report.raise_for_errors()
+    df, provenance = clean_dataset(raw, return_provenance=True, coverage=report.coverage)
+    validate_panel(df).raise_for_errors()
+    df.to_csv(output_path, index=False)
+    provenance.save(provenance_path)
+    report.coverage.save(coverage_path)
+    print(f"✓ Cleaned panel: {len(df):,} rows -> {os.path.relpath(output_path)} "
+          f"(+ provenance: {os.path.relpath(provenance_path)}, coverage: {os.path.relpath(coverage_path)})")
+    return output_path
+
+
+def _export_figures(output_dir, data_path):
+    from .figures import export_figures
+
+    # One worker: the orchestrator already runs this next to other tasks
+    results = export_figures(data_path=data_path, output_dir=output_dir, jobs=1, verbose=False)
+    rendered = sum(result['status'] == 'rendered' for result in results)
+    print(f"✓ Publication figures: {rendered} rendered, {len(results) - rendered} skipped or unavailable")
+    return {result['name']: result['status'] for result in results}
+
+
+def _offline_site(output_dir, dashboard_path, analysis_path):
+    from .offline import build_offline_site, verify_site
+
+    manifest = build_offline_site(os.path.dirname(dashboard_path), output_dir)
+    problems = verify_site(output_dir)
+    if problems:
+        raise ValueError("Offline site does not match its manifest:\n  " + "\n  ".join(problems))
+    print(f"✓ Offline site {manifest['version']}: {len(manifest['precache'])} precached, "
+          f"{len(manifest['runtime'])} cached on use -> {os.path.relpath(output_dir)}/")
+    return manifest['version']
+
+
+def site_tasks(raw_path=RAW_CSV, output_dir=PROJECT_DIR, fetch=False, offline=False):
+    """fetch (optional) -> clean -> publication figures + dashboard tasks -> HTML pages."""
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    dashboard = importlib.import_module('generate_dashboard')
+
+    tasks = []
+    if fetch:
+        tasks.append(Task('fetch', _fetch_raw, cache=False, outputs=(raw_path,)))
+    tasks.append(Task('clean', _clean, deps=['fetch'] if fetch else [],
+                      args=(raw_path, CLEANED_CSV, PROVENANCE_FILE, COVERAGE_FILE),
+                      inputs=(raw_path,), outputs=(CLEANED_CSV, PROVENANCE_FILE, COVERAGE_FILE)))
+    # export_figures keeps its own per-figure manifest, so it always runs
+    # Charts are built from the CSV as written, exactly like generate_dashboard.py does
+    tasks.append(Task('data', dashboard.load_panel, deps=['clean']))
+    tasks.append(Task('figures', _export_figures, deps=['clean'], args=(FIGURES_DIR,), cache=False))
+    tasks.extend(dashboard.dashboard_tasks(data_task='data', output_dir=output_dir, provenance_path=PROVENANCE_FILE,
+                                           sensitivity_path=SENSITIVITY_REPORT,
+                                           site_index=os.path.join(SITE_DIR, 'index.html')))
+    if offline:
+        tasks.append(Task('page.offline', _offline_site, deps=['page.dashboard', 'page.analysis'], args=(OFFLINE_DIR,),
+                          outputs=(os.path.join(OFFLINE_DIR, 'precache-manifest.json'),)))
+    return tasks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gender_education build',
+                                     description='Rebuild the cleaned data, figures and HTML pages from the raw CSV.')
+    parser.add_argument('--raw', default=RAW_CSV, help='raw World Bank CSV')
+    parser.add_argument('--output-dir', default=PROJECT_DIR, help='where the HTML pages are written')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='ignore cached task results')
+    parser.add_argument('--no-cache', action='store_true', help='neither read nor write the task cache')
+    parser.add_argument('--fetch', action='store_true', help='download the raw data first (needs network)')
+    parser.add_argument('--target', nargs='+', help='only build these tasks and what they depend on')
+    parser.add_argument('--offline', action='store_true', help='also write the offline multi-file site (offline.py)')
+    args = parser.parse_args(argv)
+
+    tasks = site_tasks(args.raw, args.output_dir, fetch=args.fetch, offline=args.offline)
+    names = {task.name for task in tasks}
+    unknown = [name for name in args.target or () if name not in names]
+    if unknown:
+        parser.error(f"unknown --target {', '.join(unknown)}; valid tasks: {', '.join(sorted(names))}")
+    jobs = args.jobs or os.cpu_count() or 1
+    print(f"Building {len(tasks)} tasks with {jobs} worker{'s' if jobs > 1 else ''}...")
+    report = run_tasks(tasks, jobs=jobs, cache_dir=None if args.no_cache else BUILD_CACHE_DIR,
+                       force=args.force, targets=args.target)
+    print_report(report)
+
+
+if __name__ == '__main__':
+    main()
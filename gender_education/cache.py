@@ -0,0 +1,49 @@
+"""
+Small caching helpers shared by the pipeline: content hashes of input files
+and an in-memory LRU cache.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+
+def file_digest(path, algorithm='sha256', chunk_size=1 << 20):
+    """Hex digest of a file's contents."""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Dict-like cache that evicts the least recently used entry when full."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
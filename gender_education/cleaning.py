@@ -0,0 +1,295 @@
+"""
+Cleaning pipeline from notebook 2: drop aggregate rows, map regions, impute
+missing indicator values and add the derived features.
+
+Imputation follows the notebook's hybrid approach:
+
+1. linear interpolation along each country's years (at most `limit` steps
+   from an observed value, countries with at least two observations only)
+2. the region-year mean for the gaps that remain
+
+The notebook's third step (KNNImputer on a single-column pivot) received only
+observed values, because pivot_table drops missing rows, so it never filled
+anything; gaps left after step 2 stay NaN here as in the published CSV.
+knn_fill() is a working KNN step that impute_missing(fill='knn') can use in
+place of step 2 (see sensitivity.py for how much the choice matters).
+Step 1 runs on the dense (country x year x indicator) array instead of a loop
+over countries, which keeps the pipeline usable on much larger panels.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .config import INDICATOR_COLS, SCALING_REFERENCE
+from .provenance import KNN, REGIONAL_MEAN, Provenance, provenance_codes
+from .scaling import scale_indicators
+
+START_YEAR = 1980
+INTERPOLATION_LIMIT = 10
+# Notebook 2's KNNImputer settings
+KNN_NEIGHBORS = 5
+KNN_WEIGHTS = 'distance'
+FILL_METHODS = ('regional_mean', 'knn')
+
+AGGREGATE_REGIONS = [
+    'World', 'Arab World', 'Central Europe and the Baltics', 'East Asia & Pacific',
+    'East Asia & Pacific (excluding high income)', 'East Asia & Pacific (IDA & IBRD countries)',
+    'Euro area', 'Europe & Central Asia', 'Europe & Central Asia (excluding high income)',
+    'Europe & Central Asia (IDA & IBRD countries)', 'European Union',
+    'Fragile and conflict affected situations', 'Heavily indebted poor countries (HIPC)',
+    'High income', 'IBRD only', 'IDA & IBRD total', 'IDA blend', 'IDA only', 'IDA total',
+    'Latin America & Caribbean', 'Latin America & Caribbean (excluding high income)',
+    'Latin America & the Caribbean (IDA & IBRD countries)',
+    'Least developed countries: UN classification', 'Low & middle income', 'Low income',
+    'Lower middle income', 'Middle East & North Africa',
+    'Middle East & North Africa (excluding high income)',
+    'Middle East & North Africa (IDA & IBRD countries)', 'Middle income', 'North America',
+    'Not classified', 'OECD members', 'Other small states', 'Pacific island small states',
+    'Post-demographic dividend', 'Pre-demographic dividend', 'Small states', 'South Asia',
+    'South Asia (IDA & IBRD)', 'Sub-Saharan Africa', 'Sub-Saharan Africa (excluding high income)',
+    'Sub-Saharan Africa (IDA & IBRD countries)', 'Upper middle income',
+    'Africa Eastern and Southern', 'Africa Western and Central', 'Caribbean small states',
+    'Early-demographic dividend',
+]
+
+REGION_MAPPING = {
+    # Sub-Saharan Africa
+    'Angola': 'Sub-Saharan Africa', 'Benin': 'Sub-Saharan Africa', 'Botswana': 'Sub-Saharan Africa',
+    'Burkina Faso': 'Sub-Saharan Africa', 'Burundi': 'Sub-Saharan Africa', 'Cameroon': 'Sub-Saharan Africa',
+    'Cape Verde': 'Sub-Saharan Africa', 'Central African Republic': 'Sub-Saharan Africa', 'Chad': 'Sub-Saharan Africa',
+    'Comoros': 'Sub-Saharan Africa', 'Congo, Dem. Rep.': 'Sub-Saharan Africa', 'Congo, Rep.': 'Sub-Saharan Africa',
+    "Cote d'Ivoire": 'Sub-Saharan Africa', 'Equatorial Guinea': 'Sub-Saharan Africa', 'Eritrea': 'Sub-Saharan Africa',
+    'Eswatini': 'Sub-Saharan Africa', 'Ethiopia': 'Sub-Saharan Africa', 'Gabon': 'Sub-Saharan Africa',
+    'Gambia, The': 'Sub-Saharan Africa', 'Ghana': 'Sub-Saharan Africa', 'Guinea': 'Sub-Saharan Africa',
+    'Guinea-Bissau': 'Sub-Saharan Africa', 'Kenya': 'Sub-Saharan Africa', 'Lesotho': 'Sub-Saharan Africa',
+    'Liberia': 'Sub-Saharan Africa', 'Madagascar': 'Sub-Saharan Africa', 'Malawi': 'Sub-Saharan Africa',
+    'Mali': 'Sub-Saharan Africa', 'Mauritania': 'Sub-Saharan Africa', 'Mauritius': 'Sub-Saharan Africa',
+    'Mozambique': 'Sub-Saharan Africa', 'Namibia': 'Sub-Saharan Africa', 'Niger': 'Sub-Saharan Africa',
+    'Nigeria': 'Sub-Saharan Africa', 'Rwanda': 'Sub-Saharan Africa', 'Sao Tome and Principe': 'Sub-Saharan Africa',
+    'Senegal': 'Sub-Saharan Africa', 'Seychelles': 'Sub-Saharan Africa', 'Sierra Leone': 'Sub-Saharan Africa',
+    'Somalia': 'Sub-Saharan Africa', 'South Africa': 'Sub-Saharan Africa', 'South Sudan': 'Sub-Saharan Africa',
+    'Sudan': 'Sub-Saharan Africa', 'Tanzania': 'Sub-Saharan Africa', 'Togo': 'Sub-Saharan Africa',
+    'Uganda': 'Sub-Saharan Africa', 'Zambia': 'Sub-Saharan Africa', 'Zimbabwe': 'Sub-Saharan Africa',
+
+    # Middle East & North Africa
+    'Algeria': 'Middle East & North Africa', 'Bahrain': 'Middle East & North Africa',
+    'Djibouti': 'Middle East & North Africa', 'Egypt, Arab Rep.': 'Middle East & North Africa',
+    'Iran, Islamic Rep.': 'Middle East & North Africa', 'Iraq': 'Middle East & North Africa',
+    'Jordan': 'Middle East & North Africa', 'Kuwait': 'Middle East & North Africa',
+    'Lebanon': 'Middle East & North Africa', 'Libya': 'Middle East & North Africa',
+    'Morocco': 'Middle East & North Africa', 'Oman': 'Middle East & North Africa',
+    'Qatar': 'Middle East & North Africa', 'Saudi Arabia': 'Middle East & North Africa',
+    'Syrian Arab Republic': 'Middle East & North Africa', 'Tunisia': 'Middle East & North Africa',
+    'United Arab Emirates': 'Middle East & North Africa', 'West Bank and Gaza': 'Middle East & North Africa',
+    'Yemen, Rep.': 'Middle East & North Africa',
+
+    # Europe & Central Asia
+    'Albania': 'Europe & Central Asia', 'Armenia': 'Europe & Central Asia', 'Austria': 'Europe & Central Asia',
+    'Azerbaijan': 'Europe & Central Asia', 'Belarus': 'Europe & Central Asia', 'Belgium': 'Europe & Central Asia',
+    'Bosnia and Herzegovina': 'Europe & Central Asia', 'Bulgaria': 'Europe & Central Asia',
+    'Croatia': 'Europe & Central Asia', 'Cyprus': 'Europe & Central Asia', 'Czech Republic': 'Europe & Central Asia',
+    'Denmark': 'Europe & Central Asia', 'Estonia': 'Europe & Central Asia', 'Finland': 'Europe & Central Asia',
+    'France': 'Europe & Central Asia', 'Georgia': 'Europe & Central Asia', 'Germany': 'Europe & Central Asia',
+    'Greece': 'Europe & Central Asia', 'Hungary': 'Europe & Central Asia', 'Iceland': 'Europe & Central Asia',
+    'Ireland': 'Europe & Central Asia', 'Italy': 'Europe & Central Asia', 'Kazakhstan': 'Europe & Central Asia',
+    'Kosovo': 'Europe & Central Asia', 'Kyrgyz Republic': 'Europe & Central Asia', 'Latvia': 'Europe & Central Asia',
+    'Lithuania': 'Europe & Central Asia', 'Luxembourg': 'Europe & Central Asia', 'Moldova': 'Europe & Central Asia',
+    'Montenegro': 'Europe & Central Asia', 'Netherlands': 'Europe & Central Asia',
+    'North Macedonia': 'Europe & Central Asia', 'Norway': 'Europe & Central Asia', 'Poland': 'Europe & Central Asia',
+    'Portugal': 'Europe & Central Asia', 'Romania': 'Europe & Central Asia',
+    'Russian Federation': 'Europe & Central Asia', 'Serbia': 'Europe & Central Asia',
+    'Slovak Republic': 'Europe & Central Asia', 'Slovenia': 'Europe & Central Asia', 'Spain': 'Europe & Central Asia',
+    'Sweden': 'Europe & Central Asia', 'Switzerland': 'Europe & Central Asia', 'Tajikistan': 'Europe & Central Asia',
+    'Turkiye': 'Europe & Central Asia', 'Turkmenistan': 'Europe & Central Asia', 'Ukraine': 'Europe & Central Asia',
+    'United Kingdom': 'Europe & Central Asia', 'Uzbekistan': 'Europe & Central Asia',
+
+    # East Asia & Pacific
+    'Australia': 'East Asia & Pacific', 'Brunei Darussalam': 'East Asia & Pacific', 'Cambodia': 'East Asia & Pacific',
+    'China': 'East Asia & Pacific', 'Fiji': 'East Asia & Pacific', 'Indonesia': 'East Asia & Pacific',
+    'Japan': 'East Asia & Pacific', 'Kiribati': 'East Asia & Pacific',
+    "Korea, Dem. People's Rep.": 'East Asia & Pacific', 'Korea, Rep.': 'East Asia & Pacific',
+    'Lao PDR': 'East Asia & Pacific', 'Malaysia': 'East Asia & Pacific', 'Marshall Islands': 'East Asia & Pacific',
+    'Micronesia, Fed. Sts.': 'East Asia & Pacific', 'Mongolia': 'East Asia & Pacific', 'Myanmar': 'East Asia & Pacific',
+    'Nauru': 'East Asia & Pacific', 'New Zealand': 'East Asia & Pacific', 'Palau': 'East Asia & Pacific',
+    'Papua New Guinea': 'East Asia & Pacific', 'Philippines': 'East Asia & Pacific', 'Samoa': 'East Asia & Pacific',
+    'Singapore': 'East Asia & Pacific', 'Solomon Islands': 'East Asia & Pacific', 'Thailand': 'East Asia & Pacific',
+    'Timor-Leste': 'East Asia & Pacific', 'Tonga': 'East Asia & Pacific', 'Tuvalu': 'East Asia & Pacific',
+    'Vanuatu': 'East Asia & Pacific', 'Vietnam': 'East Asia & Pacific',
+
+    # South Asia
+    'Afghanistan': 'South Asia', 'Bangladesh': 'South Asia', 'Bhutan': 'South Asia', 'India': 'South Asia',
+    'Maldives': 'South Asia', 'Nepal': 'South Asia', 'Pakistan': 'South Asia', 'Sri Lanka': 'South Asia',
+
+    # Latin America & Caribbean
+    'Argentina': 'Latin America & Caribbean', 'Aruba': 'Latin America & Caribbean',
+    'Bahamas, The': 'Latin America & Caribbean', 'Barbados': 'Latin America & Caribbean',
+    'Belize': 'Latin America & Caribbean', 'Bolivia': 'Latin America & Caribbean',
+    'Brazil': 'Latin America & Caribbean', 'Chile': 'Latin America & Caribbean',
+    'Colombia': 'Latin America & Caribbean', 'Costa Rica': 'Latin America & Caribbean',
+    'Cuba': 'Latin America & Caribbean', 'Curacao': 'Latin America & Caribbean',
+    'Dominica': 'Latin America & Caribbean', 'Dominican Republic': 'Latin America & Caribbean',
+    'Ecuador': 'Latin America & Caribbean', 'El Salvador': 'Latin America & Caribbean',
+    'Grenada': 'Latin America & Caribbean', 'Guatemala': 'Latin America & Caribbean',
+    'Guyana': 'Latin America & Caribbean', 'Haiti': 'Latin America & Caribbean',
+    'Honduras': 'Latin America & Caribbean', 'Jamaica': 'Latin America & Caribbean',
+    'Mexico': 'Latin America & Caribbean', 'Nicaragua': 'Latin America & Caribbean',
+    'Panama': 'Latin America & Caribbean', 'Paraguay': 'Latin America & Caribbean', 'Peru': 'Latin America & Caribbean',
+    'St. Kitts and Nevis': 'Latin America & Caribbean', 'St. Lucia': 'Latin America & Caribbean',
+    'St. Vincent and the Grenadines': 'Latin America & Caribbean', 'Suriname': 'Latin America & Caribbean',
+    'Trinidad and Tobago': 'Latin America & Caribbean', 'Uruguay': 'Latin America & Caribbean',
+    'Venezuela, RB': 'Latin America & Caribbean',
+
+    # North America
+    'Bermuda': 'North America', 'Canada': 'North America', 'United States': 'North America',
+
+}
+
+
+def interpolate_gaps(values, limit=INTERPOLATION_LIMIT):
+    """
+    Linearly interpolate NaNs along the last axis of a 2-D (series, years) array.
+
+    Same result as pandas' interpolate(method='linear', limit_direction='both',
+    limit=limit) on each row: a NaN is filled when it is at most `limit`
+    positions after or before an observed value, and values beyond the
+    first/last observation repeat that observation.
+    Rows with fewer than two observations are left unchanged.
+    limit=None fills every gap.
+    """
+    values = np.array(values, dtype=float)
+    n_series, n_years = values.shape
+    if limit is None:
+        limit = n_years
+    observed = ~np.isnan(values)
+    positions = np.arange(n_years)
+
+    prev = np.maximum.accumulate(np.where(observed, positions, -1), axis=1)
+    following = np.where(observed, positions, n_years)
+    nxt = np.minimum.accumulate(following[:, ::-1], axis=1)[:, ::-1]
+
+    within_limit = (((positions - prev) <= limit) & (prev >= 0)) | (((nxt - positions) <= limit) & (nxt < n_years))
+    fill = ~observed & within_limit & (observed.sum(axis=1) >= 2)[:, None]
+
+    rows = np.arange(n_series)[:, None]
+    left = values[rows, np.clip(prev, 0, n_years - 1)]
+    right = values[rows, np.clip(nxt, 0, n_years - 1)]
+    # np.interp's operation order (what pandas calls), so results match it bit for bit
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (right - left) / (nxt - prev)
+        interpolated = slope * (positions - prev) + left
+    interpolated = np.where(prev < 0, right, np.where(nxt >= n_years, left, interpolated))
+
+    values[fill] = interpolated[fill]
+    return values
+
+
+def knn_fill(df, columns=INDICATOR_COLS, n_neighbors=KNN_NEIGHBORS, weights=KNN_WEIGHTS):
+    """
+    Fill NaNs of `columns` in place with sklearn's KNNImputer, run on the
+    countries of each year separately.
+
+    The indicators are standardized first (StandardScaler over all years),
+    since girls out of school is a head count and would dominate the
+    distances. Observed values are kept as they are, and a column with no
+    value in a year keeps its gaps in that year.
+    """
+    from sklearn.impute import KNNImputer
+    from sklearn.preprocessing import StandardScaler
+
+    columns = list(columns)
+    values = df[columns].to_numpy(dtype=float)
+    scaler = StandardScaler().fit(values)
+    z = scaler.transform(values)
+    imputer = KNNImputer(n_neighbors=n_neighbors, weights=weights, keep_empty_features=True)
+
+    imputed = np.full_like(z, np.nan)
+    for rows in df.groupby('year').indices.values():
+        year_z = z[rows]
+        year_imputed = imputer.fit_transform(year_z)
+        # keep_empty_features fills an all-NaN column with 0, i.e. the all-years mean
+        year_imputed[:, np.isnan(year_z).all(axis=0)] = np.nan
+        imputed[rows] = year_imputed
+    df[columns] = np.where(np.isnan(values), scaler.inverse_transform(imputed), values)
+
+
+def impute_missing(df, columns=INDICATOR_COLS, limit=INTERPOLATION_LIMIT, return_codes=False,
+                   fill='regional_mean', n_neighbors=KNN_NEIGHBORS, weights=KNN_WEIGHTS, coverage=None):
+    """
+    Fill `columns` of `df` in place (interpolation, then region-year means,
+    or knn_fill with fill='knn').
+
+    `coverage` (a validation.CoverageIndex of `df`) lets the interpolation
+    skip the series it marks as fully observed.
+
+    Returns the number of missing values before and after each step, and
+    with return_codes=True also the (rows, columns) uint8 provenance codes
+    of every value (see provenance.py).
+    """
+    if fill not in FILL_METHODS:
+        raise ValueError(f"fill must be one of {FILL_METHODS}, got {fill!r}")
+    columns = list(columns)
+    missing = [df[columns].isna().to_numpy()]
+    counts = {'original': int(missing[0].sum())}
+
+    country_codes, countries = pd.factorize(df['country'], sort=True)
+    year_codes, years = pd.factorize(df['year'], sort=True)
+    dense = np.full((len(countries), len(years), len(columns)), np.nan)
+    dense[country_codes, year_codes, :] = df[columns].to_numpy(dtype=float)
+
+    # Interpolate every (country, indicator) series with a gap at once along the year axis
+    series = dense.transpose(0, 2, 1).reshape(-1, len(years))
+    gaps = slice(None) if coverage is None else ~coverage.complete(countries, years, columns).reshape(-1)
+    series[gaps] = interpolate_gaps(series[gaps], limit)
+    filled = series.reshape(len(countries), len(columns), len(years))
+    df[columns] = filled.transpose(0, 2, 1)[country_codes, year_codes, :]
+    missing.append(df[columns].isna().to_numpy())
+    counts['after_interpolation'] = int(missing[-1].sum())
+
+    if fill == 'knn':
+        knn_fill(df, columns, n_neighbors, weights)
+    else:
+        # Rows without a region have no group and keep their gaps
+        regional_means = df.groupby(['region', 'year'])[columns].transform('mean')
+        df[columns] = df[columns].fillna(regional_means)
+    missing.append(df[columns].isna().to_numpy())
+    counts[f'after_{fill}'] = int(missing[-1].sum())
+    if return_codes:
+        return counts, provenance_codes(*missing, second_flag=KNN if fill == 'knn' else REGIONAL_MEAN)
+    return counts
+
+
+def add_derived_features(df, scaling_mode='frozen', reference_path=SCALING_REFERENCE):
+    """Add the gap, parity, scaled and composite index columns to `df` in place."""
+    df['Literacy_Gap'] = df['Literacy_Rate_Male'] - df['Literacy_Rate_Female']
+    df['Literacy_Gender_Parity_Index'] = df['Literacy_Rate_Female'] / df['Literacy_Rate_Male']
+    df['Girls_Out_Of_School_Millions'] = df['Girls_Out_Of_School_Primary'] / 1_000_000
+    reference = scale_indicators(df, INDICATOR_COLS, mode=scaling_mode, reference_path=reference_path)
+    # Higher values = better gender equality (0-100)
+    df['Gender_Equality_Index'] = (
+        (df['Literacy_Rate_Female'] / 100) * 0.4 +
+        (df['Female_Labor_Force_Participation'] / 100) * 0.3 +
+        ((200 - df['Adolescent_Fertility_Rate']) / 200) * 0.3
+    ) * 100
+    return reference
+
+
+def select_countries(df_raw, start_year=START_YEAR, region_mapping=REGION_MAPPING):
+    """Individual countries from `start_year` on, with their region."""
+    df = df_raw[~df_raw['country'].isin(AGGREGATE_REGIONS) & (df_raw['year'] >= start_year)].copy()
+    df['region'] = df['country'].map(region_mapping)
+    return df
+
+
+def clean_dataset(df_raw, start_year=START_YEAR, region_mapping=REGION_MAPPING,
+                  scaling_mode='frozen', reference_path=SCALING_REFERENCE, return_provenance=False, coverage=None):
+    """
+    Raw World Bank panel -> the cleaned panel written to gender_education_cleaned.csv
+    (and its Provenance with return_provenance=True). `coverage` is the raw
+    panel's CoverageIndex, if validation already built it.
+    """
+    df = select_countries(df_raw, start_year, region_mapping)
+    _, codes = impute_missing(df, return_codes=True, coverage=coverage)
+    add_derived_features(df, scaling_mode, reference_path)
+    if return_provenance:
+        return df, Provenance.from_codes(df, INDICATOR_COLS, codes)
+    return df
@@ -0,0 +1,196 @@
+"""
+Cluster countries by the shape of their indicator trajectories.
+
+The cleaned panel is turned into a (country x year x indicator) array and
+compared with pairwise distances computed block by block, so memory grows
+with block_size x n rather than n x n:
+
+- Euclidean distance on the flattened trajectories
+- DTW-lite: dynamic time warping restricted to a narrow Sakoe-Chiba band,
+  vectorized over all pairs of a block (the only loop is over the band)
+
+Countries are then grouped with k-means (scikit-learn) or hierarchical
+average linkage (SciPy) on the chosen distance.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .panel import DensePanel
+
+CLUSTER_COLS = [
+    'Literacy_Rate_Female',
+    'Adolescent_Fertility_Rate',
+    'Female_Labor_Force_Participation'
+]
+
+DEFAULT_BLOCK_SIZE = 256
+# Upper bound on DP cells held at once by dtw_block (~64 MB of float64)
+DTW_CELL_BUDGET = 8_000_000
+
+
+# ============================================================================
+# Trajectory matrix
+# ============================================================================
+
+def trajectory_matrix(df, columns=CLUSTER_COLS, normalize='global', min_coverage=0.5):
+    """
+    Build the (countries, years, indicators) array used for clustering.
+
+    Countries with less than `min_coverage` observed years for any indicator
+    are dropped; remaining gaps are filled with the series mean.
+    normalize='global' z-scores each indicator over the whole panel so the
+    indicators are comparable; 'series' additionally removes each country's
+    own mean, so only the shape of the trajectory is compared.
+    """
+    panel = DensePanel.from_frame(df, columns)
+    values = panel.values.copy()
+
+    coverage = (~np.isnan(values)).mean(axis=1).min(axis=1)
+    keep = coverage >= min_coverage
+    values = values[keep]
+
+    series_mean = np.nanmean(values, axis=1, keepdims=True)
+    values = np.where(np.isnan(values), series_mean, values)
+
+    mean = values.mean(axis=(0, 1), keepdims=True)
+    std = values.std(axis=(0, 1), keepdims=True)
+    std[std == 0] = 1.0
+    if normalize == 'global':
+        values = (values - mean) / std
+    elif normalize == 'series':
+        values = (values - values.mean(axis=1, keepdims=True)) / std
+    elif normalize is not None:
+        raise ValueError(f"Unknown normalization: {normalize!r}")
+
+    regions = panel.regions[keep] if panel.regions is not None else None
+    return panel.countries[keep], panel.years, values, regions
+
+
+# ============================================================================
+# Blocked pairwise distances
+# ============================================================================
+
+def euclidean_block(a, b):
+    """Euclidean distances between the rows of a (m, f) and b (n, f)."""
+    sq = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * (a @ b.T)
+    return np.sqrt(np.maximum(sq, 0.0))
+
+
+def dtw_block(a, b, window=3):
+    """
+    Banded DTW distances between trajectories a (m, T, d) and b (n, T, d).
+
+    Only two DP rows are kept, so memory is O(m * n * T) for one block.
+    """
+    m, n_steps, _ = a.shape
+    n = b.shape[0]
+    prev = np.full((m, n, n_steps + 1), np.inf)
+    prev[:, :, 0] = 0.0
+    for i in range(1, n_steps + 1):
+        cur = np.full((m, n, n_steps + 1), np.inf)
+        for j in range(max(1, i - window), min(n_steps, i + window) + 1):
+            diff = a[:, None, i - 1, :] - b[None, :, j - 1, :]
+            cost = (diff * diff).sum(axis=-1)
+            best = np.minimum(np.minimum(prev[:, :, j], cur[:, :, j - 1]), prev[:, :, j - 1])
+            cur[:, :, j] = cost + best
+        prev = cur
+    return np.sqrt(prev[:, :, n_steps])
+
+
+def iter_distance_blocks(x, metric='euclidean', block_size=DEFAULT_BLOCK_SIZE, window=3):
+    """
+    Yield (row_start, distances) for consecutive row blocks of the full
+    pairwise distance matrix of `x` (n, T, d). Each block is (block, n).
+    """
+    n, n_steps = x.shape[:2]
+    flat = x.reshape(n, -1)
+    if metric == 'dtw':
+        # Each DTW row block keeps (block, n, T + 1) DP cells alive
+        block_size = max(1, min(block_size, DTW_CELL_BUDGET // (n * (n_steps + 1))))
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        if metric == 'euclidean':
+            yield start, euclidean_block(flat[start:stop], flat)
+        elif metric == 'dtw':
+            yield start, dtw_block(x[start:stop], x, window=window)
+        else:
+            raise ValueError(f"Unknown metric: {metric!r}")
+
+
+def pairwise_distances(x, metric='euclidean', block_size=DEFAULT_BLOCK_SIZE, window=3):
+    """Full (n, n) distance matrix, assembled from row blocks."""
+    n = x.shape[0]
+    out = np.empty((n, n))
+    for start, block in iter_distance_blocks(x, metric, block_size, window):
+        out[start:start + block.shape[0]] = block
+    np.fill_diagonal(out, 0.0)
+    # DTW with a symmetric band is symmetric; enforce it against rounding
+    return (out + out.T) / 2
+
+
+def nearest_neighbors(x, metric='euclidean', block_size=DEFAULT_BLOCK_SIZE, window=3):
+    """
+    Index of and distance to each row's nearest other row, computed without
+    ever holding more than one (block_size, n) slice of the distance matrix.
+    """
+    n = x.shape[0]
+    nn_idx = np.empty(n, dtype=np.int64)
+    nn_dist = np.empty(n)
+    for start, block in iter_distance_blocks(x, metric, block_size, window):
+        rows = np.arange(block.shape[0])
+        block[rows, start + rows] = np.inf
+        nn_idx[start:start + len(rows)] = block.argmin(axis=1)
+        nn_dist[start:start + len(rows)] = block[rows, nn_idx[start:start + len(rows)]]
+    return nn_idx, nn_dist
+
+
+# ============================================================================
+# Clustering
+# ============================================================================
+
+def cluster_trajectories(df, n_clusters=5, method='kmeans', metric='euclidean',
+                         columns=CLUSTER_COLS, normalize='global', window=3, seed=42):
+    """
+    Cluster countries by trajectory; returns a DataFrame with one row per
+    country ('country', 'region', 'cluster') plus the trajectory array.
+
+    method='kmeans' runs k-means on the flattened trajectories (Euclidean
+    only); method='hierarchical' uses average linkage on the blocked
+    Euclidean or DTW distance matrix.
+    """
+    countries, years, x, regions = trajectory_matrix(df, columns, normalize=normalize)
+
+    if method == 'kmeans':
+        from sklearn.cluster import KMeans
+
+        if metric != 'euclidean':
+            raise ValueError("k-means clustering only supports metric='euclidean'")
+        model = KMeans(n_clusters=n_clusters, n_init=10, random_state=seed)
+        labels = model.fit_predict(x.reshape(len(countries), -1))
+    elif method == 'hierarchical':
+        from scipy.cluster.hierarchy import fcluster, linkage
+        from scipy.spatial.distance import squareform
+
+        distances = pairwise_distances(x, metric=metric, window=window)
+        tree = linkage(squareform(distances, checks=False), method='average')
+        labels = fcluster(tree, t=n_clusters, criterion='maxclust') - 1
+    else:
+        raise ValueError(f"Unknown clustering method: {method!r}")
+
+    # Number clusters by size (0 = largest) so labels are stable across runs
+    sizes = np.bincount(labels, minlength=labels.max() + 1)
+    relabel = np.empty_like(sizes)
+    relabel[np.argsort(-sizes, kind='stable')] = np.arange(len(sizes))
+    labels = relabel[labels]
+
+    assignments = pd.DataFrame({'country': countries, 'cluster': labels})
+    if regions is not None:
+        assignments.insert(1, 'region', regions)
+    return assignments, x
+
+
+def cluster_profiles(df, assignments, columns=CLUSTER_COLS):
+    """Mean raw trajectory per (cluster, year) for every clustered indicator."""
+    merged = df.merge(assignments[['country', 'cluster']], on='country')
+    return merged.groupby(['cluster', 'year'])[list(columns)].mean().reset_index()
@@ -0,0 +1,85 @@
+"""
+Shared constants: indicator columns and the default file locations used by
+the notebooks and generate_dashboard.py.
+"""
+
+import os
+
+# Project root (the directory holding the CSVs and notebooks)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RAW_CSV = os.path.join(PROJECT_DIR, 'gender_education_dataset.csv')
+CLEANED_CSV = os.path.join(PROJECT_DIR, 'gender_education_cleaned.csv')
+PROVENANCE_FILE = os.path.join(PROJECT_DIR, 'gender_education_provenance.npz')
+COVERAGE_FILE = os.path.join(PROJECT_DIR, 'gender_education_coverage.npz')
+SCALING_REFERENCE = os.path.join(PROJECT_DIR, 'scaling_reference.json')
+SENSITIVITY_REPORT = os.path.join(PROJECT_DIR, 'imputation_sensitivity.json')
+FIGURES_DIR = os.path.join(PROJECT_DIR, 'figures')
+SITE_DIR = os.path.join(PROJECT_DIR, 'site')
+OFFLINE_DIR = os.path.join(PROJECT_DIR, 'offline')
+
+# Core World Bank indicators (see fetch_gender_data.py)
+INDICATOR_COLS = [
+    'Girls_Out_Of_School_Primary',
+    'Literacy_Rate_Female',
+    'Literacy_Rate_Male',
+    'Adolescent_Fertility_Rate',
+    'Female_Labor_Force_Participation'
+]
+
+# Display names of the indicators and derived columns (charts, tables, API)
+INDICATOR_LABELS = {
+    'Literacy_Rate_Female': 'Female Literacy Rate (%)',
+    'Literacy_Rate_Male': 'Male Literacy Rate (%)',
+    'Literacy_Gap': 'Literacy Gap (Male - Female %)',
+    'Literacy_Gender_Parity_Index': 'Gender Parity Index (F/M ratio)',
+    'Adolescent_Fertility_Rate': 'Adolescent Fertility Rate',
+    'Female_Labor_Force_Participation': 'Female Labor Force Participation (%)',
+    'Girls_Out_Of_School_Primary': 'Girls Out of School (Primary)',
+    'Gender_Equality_Index': 'Gender Equality Index'
+}
+
+# World Bank country names -> ISO 3166 alpha-3 codes, for the choropleth maps
+ISO_CODES = {
+    'United States': 'USA', 'United Kingdom': 'GBR', 'China': 'CHN', 'India': 'IND',
+    'Brazil': 'BRA', 'Germany': 'DEU', 'France': 'FRA', 'Japan': 'JPN', 'Italy': 'ITA',
+    'Canada': 'CAN', 'Australia': 'AUS', 'Spain': 'ESP', 'Mexico': 'MEX', 'Korea, Rep.': 'KOR',
+    'Indonesia': 'IDN', 'Netherlands': 'NLD', 'Saudi Arabia': 'SAU', 'Turkey': 'TUR',
+    'Switzerland': 'CHE', 'Poland': 'POL', 'Belgium': 'BEL', 'Sweden': 'SWE', 'Norway': 'NOR',
+    'Austria': 'AUT', 'Nigeria': 'NGA', 'Argentina': 'ARG', 'Egypt, Arab Rep.': 'EGY',
+    'South Africa': 'ZAF', 'Pakistan': 'PAK', 'Bangladesh': 'BGD', 'Vietnam': 'VNM',
+    'Philippines': 'PHL', 'Thailand': 'THA', 'Malaysia': 'MYS', 'Colombia': 'COL',
+    'Chile': 'CHL', 'Finland': 'FIN', 'Denmark': 'DNK', 'Singapore': 'SGP', 'Portugal': 'PRT',
+    'Ireland': 'IRL', 'Greece': 'GRC', 'Czech Republic': 'CZE', 'Romania': 'ROU',
+    'New Zealand': 'NZL', 'Peru': 'PER', 'Ukraine': 'UKR', 'Kenya': 'KEN', 'Ethiopia': 'ETH',
+    'Morocco': 'MAR', 'Algeria': 'DZA', 'Sudan': 'SDN', 'Tanzania': 'TZA', 'Uganda': 'UGA',
+    'Ghana': 'GHA', 'Angola': 'AGO', 'Mozambique': 'MOZ', 'Madagascar': 'MDG', 'Cameroon': 'CMR',
+    'Niger': 'NER', 'Mali': 'MLI', 'Burkina Faso': 'BFA', 'Malawi': 'MWI', 'Zambia': 'ZMB',
+    'Senegal': 'SEN', 'Chad': 'TCD', 'Zimbabwe': 'ZWE', 'Rwanda': 'RWA', 'Benin': 'BEN',
+    'Tunisia': 'TUN', 'Cuba': 'CUB', 'Dominican Republic': 'DOM',
+    'Guatemala': 'GTM', 'Ecuador': 'ECU', 'Bolivia': 'BOL', 'Haiti': 'HTI', 'Honduras': 'HND',
+    'Paraguay': 'PRY', 'Nicaragua': 'NIC', 'El Salvador': 'SLV', 'Costa Rica': 'CRI',
+    'Panama': 'PAN', 'Uruguay': 'URY', 'Lebanon': 'LBN', 'Jordan': 'JOR', 'Libya': 'LBY',
+    'Yemen, Rep.': 'YEM', 'Afghanistan': 'AFG', 'Nepal': 'NPL', 'Sri Lanka': 'LKA',
+    'Myanmar': 'MMR', 'Cambodia': 'KHM', 'Lao PDR': 'LAO', 'Mongolia': 'MNG',
+    'Kazakhstan': 'KAZ', 'Uzbekistan': 'UZB', 'Azerbaijan': 'AZE', 'Georgia': 'GEO',
+    'Armenia': 'ARM', 'Albania': 'ALB', 'Croatia': 'HRV', 'Serbia': 'SRB', 'Bulgaria': 'BGR',
+    'Slovakia': 'SVK', 'Lithuania': 'LTU', 'Slovenia': 'SVN', 'Latvia': 'LVA', 'Estonia': 'EST',
+    'Hungary': 'HUN', 'Belarus': 'BLR', 'Bosnia and Herzegovina': 'BIH', 'North Macedonia': 'MKD',
+    'Moldova': 'MDA', 'Luxembourg': 'LUX', 'Iceland': 'ISL', 'Jamaica': 'JAM',
+    'Trinidad and Tobago': 'TTO', 'Bahamas, The': 'BHS', 'Barbados': 'BRB', 'Mauritius': 'MUS',
+    'Botswana': 'BWA', 'Namibia': 'NAM', 'Gabon': 'GAB', 'Lesotho': 'LSO', 'Gambia, The': 'GMB',
+    'Guinea': 'GIN', 'Togo': 'TGO', 'Sierra Leone': 'SLE', 'Liberia': 'LBR',
+    'Central African Republic': 'CAF', 'Congo, Rep.': 'COG', 'Congo, Dem. Rep.': 'COD',
+    'Burundi': 'BDI', 'Somalia': 'SOM', 'Djibouti': 'DJI', 'Comoros': 'COM',
+    'Equatorial Guinea': 'GNQ', 'Guinea-Bissau': 'GNB', 'Eritrea': 'ERI', 'South Sudan': 'SSD',
+    'Russian Federation': 'RUS', 'Turkiye': 'TUR', 'Iran, Islamic Rep.': 'IRN', 'Iraq': 'IRQ',
+    'Syrian Arab Republic': 'SYR', 'Oman': 'OMN', 'Kuwait': 'KWT', 'Qatar': 'QAT',
+    'United Arab Emirates': 'ARE', 'Bahrain': 'BHR', 'Cyprus': 'CYP', 'Bhutan': 'BTN',
+    'Maldives': 'MDV', 'Brunei Darussalam': 'BRN', 'Timor-Leste': 'TLS', 'Fiji': 'FJI',
+    'Papua New Guinea': 'PNG', 'Solomon Islands': 'SLB', 'Vanuatu': 'VUT', 'Samoa': 'WSM',
+    'Mauritania': 'MRT', 'Eswatini': 'SWZ', 'Guyana': 'GUY', 'Suriname': 'SUR', 'Belize': 'BLZ',
+    'Cape Verde': 'CPV', 'Seychelles': 'SYC', 'Sao Tome and Principe': 'STP',
+    'Kyrgyz Republic': 'KGZ', 'Tajikistan': 'TJK', 'Turkmenistan': 'TKM', 'Montenegro': 'MNE',
+    'Kosovo': 'XKX'
+}
@@ -0,0 +1,118 @@
+"""
+Compact data cube embedded in the dashboard for client-side filtering.
+
+Instead of baking one fixed view per chart, the generator packs the panel into
+a single (country x year x indicator) array, and the browser draws the charts
+from it and re-filters them by region and year. Values are quantized per indicator to uint16
+(value = offset + code * scale, 65535 = missing) and shipped as one
+little-endian base64 string, which the page decodes into a Uint16Array.
+"""
+
+import base64
+import json
+
+import numpy as np
+from plotly.utils import PlotlyJSONEncoder
+
+from .panel import DensePanel
+
+CUBE_COLS = [
+    'Literacy_Rate_Female',
+    'Adolescent_Fertility_Rate',
+    'Female_Labor_Force_Participation',
+    'Literacy_Gap',
+    'Literacy_Gender_Parity_Index'
+]
+
+MISSING = 65535
+NO_REGION = 255
+
+
+def _quantize(values):
+    """Per-indicator uint16 codes for a (..., indicators) float array."""
+    with np.errstate(invalid='ignore'):
+        low = np.nanmin(values.reshape(-1, values.shape[-1]), axis=0)
+        high = np.nanmax(values.reshape(-1, values.shape[-1]), axis=0)
+    low = np.where(np.isnan(low), 0.0, low)
+    scale = np.where(high > low, (high - low) / (MISSING - 1), 1.0)
+    scale = np.where(np.isnan(scale), 1.0, scale)
+    codes = np.rint((values - low) / scale)
+    codes = np.where(np.isnan(values), MISSING, codes).astype('<u2')
+    return codes, low, scale
+
+
+def _encode(array):
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode('ascii')
+
+
+def build_cube(df, columns=CUBE_COLS, ci_table=None, provenance=None):
+    """
+    JSON-ready cube for `columns` (those present in df).
+
+    `values` holds (countries, years, indicators) codes in C order. If
+    `ci_table` (a region x year bootstrap_means table) is given, the
+    confidence bounds are packed the same way as `ci`:
+    (regions, years, indicators, [low, high]). With a `provenance`
+    (provenance.Provenance), `imputed` is one bit per value, set where it
+    was imputed, in the layout of `values` (np.packbits order).
+    """
+    columns = [col for col in columns if col in df.columns]
+    panel = DensePanel.from_frame(df, columns)
+    codes, offset, scale = _quantize(panel.values)
+
+    regions = sorted({r for r in panel.regions if r is not None})
+    region_pos = {r: i for i, r in enumerate(regions)}
+    region_codes = np.array([region_pos.get(r, NO_REGION) for r in panel.regions], dtype=np.uint8)
+
+    cube = {
+        'countries': [str(c) for c in panel.countries],
+        'regions': regions,
+        'regionCodes': region_codes.tolist(),
+        'years': [int(y) for y in panel.years],
+        'indicators': columns,
+        'offset': [round(float(v), 6) for v in offset],
+        'scale': [float(v) for v in scale],
+        'values': _encode(codes),
+    }
+
+    if ci_table is not None:
+        bounds = np.full((len(regions), len(panel.years), len(columns), 2), np.nan)
+        table = ci_table[ci_table['region'].isin(region_pos) & ci_table['indicator'].isin(columns)]
+        r = table['region'].map(region_pos).to_numpy()
+        y = np.searchsorted(panel.years, table['year'].to_numpy())
+        c = table['indicator'].map(columns.index).to_numpy()
+        bounds[r, y, c, 0] = table['ci_low'].to_numpy()
+        bounds[r, y, c, 1] = table['ci_high'].to_numpy()
+        # Same offset/scale as the values; bounds stay inside the data range
+        ci_codes = np.rint((bounds - offset[:, None]) / scale[:, None])
+        ci_codes = np.where(np.isnan(bounds), MISSING, np.clip(ci_codes, 0, MISSING - 1)).astype('<u2')
+        cube['ci'] = _encode(ci_codes)
+
+    if provenance is not None:
+        imputed = np.zeros(codes.shape, dtype=bool)
+        country_pos = np.searchsorted(panel.countries, df['country'].to_numpy())
+        year_pos = np.searchsorted(panel.years, df['year'].to_numpy())
+        for k, col in enumerate(columns):
+            imputed[country_pos, year_pos, k] = provenance.mask(df, col)
+        cube['imputed'] = _encode(np.packbits(imputed.ravel()))
+
+    return cube
+
+
+def decode_values(cube):
+    """Inverse of build_cube's packing: (countries, years, indicators) floats."""
+    shape = (len(cube['countries']), len(cube['years']), len(cube['indicators']))
+    codes = np.frombuffer(base64.b64decode(cube['values']), dtype='<u2').reshape(shape)
+    values = np.asarray(cube['offset']) + codes * np.asarray(cube['scale'])
+    return np.where(codes == MISSING, np.nan, values)
+
+
+def cube_json(cube):
+    return json.dumps(cube, separators=(',', ':'))
+
+
+def figure_data_size(fig):
+    """Bytes of embedded data (traces and animation frames) in a Plotly figure."""
+    spec = fig.to_plotly_json()
+    payload = {'data': spec.get('data', []), 'frames': spec.get('frames', [])}
+    return len(json.dumps(payload, cls=PlotlyJSONEncoder, separators=(',', ':')))
@@ -0,0 +1,157 @@
+"""
+Pooled matplotlib figures for the dashboard's static (EDA) charts.
+
+Every EDA chart used to call plt.subplots(), savefig() into a new BytesIO
+and plt.close(): a new Figure, canvas, Axes and Agg renderer per chart, plus
+pyplot's figure bookkeeping. FigurePool keeps the figures of each
+(figsize, rows, columns) layout after a chart is rendered and hands them
+out again, cleared and with new axes, for the next chart of that layout:
+
+    pool = FigurePool(dpi=150)
+    fig, ax = pool.subplots(figsize=(12, 6))
+    ax.hist(...)
+    png = pool.render(fig)          # PNG bytes; fig goes back to the pool
+
+render() does what savefig(format='png', bbox_inches='tight') does (a layout
+pass, the tight bounding box, one Agg draw), then encodes the canvas'
+RGBA buffer straight into one reused output buffer. The layout pass measures
+text with one small renderer, so a canvas only allocates a new full-size
+Agg renderer when the cropped size of its chart changes. The PNG bytes are the
+same as savefig's. FigurePool(reuse=False) is the plain pyplot/savefig path,
+kept as the benchmark baseline (benchmarks/bench_eda_render.py).
+"""
+
+import base64
+import inspect
+from io import BytesIO
+
+import numpy as np
+
+import matplotlib as mpl
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib._tight_bbox import adjust_bbox
+from matplotlib.figure import Figure
+
+# savefig's own bbox_inches='tight' helper; newer matplotlib also passes the renderer
+_ADJUST_WITH_RENDERER = 'renderer' in inspect.signature(adjust_bbox).parameters
+
+
+class PNGBuffer:
+    """Write-only byte buffer that keeps its allocation between PNGs."""
+
+    def __init__(self, size=1 << 20):
+        self._data = bytearray(size)
+        self.size = 0
+
+    def reset(self):
+        self.size = 0
+
+    def write(self, chunk):
+        end = self.size + len(chunk)
+        if end > len(self._data):
+            self._data.extend(bytes(max(end - len(self._data), len(self._data))))
+        self._data[self.size:end] = chunk
+        self.size = end
+        return len(chunk)
+
+    def flush(self):
+        pass
+
+    def getbuffer(self):
+        return memoryview(self._data)[:self.size]
+
+
+class FigurePool:
+    """Reusable Figure/FigureCanvasAgg pairs, keyed by layout."""
+
+    def __init__(self, dpi=150, reuse=True, pad_inches=None):
+        self.dpi = dpi
+        self.reuse = reuse
+        self.pad_inches = mpl.rcParams['savefig.pad_inches'] if pad_inches is None else pad_inches
+        self.buffer = PNGBuffer()
+        # Layout and text extents depend on the dpi only, so one small renderer
+        # measures every figure; the canvases then keep their (tight-size)
+        # renderer for the next chart of the same size
+        self._measure = RendererAgg(1, 1, dpi)
+        self._free = {}
+        self._layout = {}
+        self.created = 0
+        self.reused = 0
+
+    def __repr__(self):
+        # Settings only: the build hashes the globals its tasks use by repr
+        return f'FigurePool(dpi={self.dpi}, reuse={self.reuse}, pad_inches={self.pad_inches})'
+
+    def subplots(self, nrows=1, ncols=1, figsize=None):
+        """(fig, ax or array of axes) like plt.subplots, from the pool when possible."""
+        figsize = tuple(mpl.rcParams['figure.figsize'] if figsize is None else figsize)
+        key = (figsize, nrows, ncols)
+        if not self.reuse:
+            import matplotlib.pyplot as plt
+
+            self.created += 1
+            return plt.subplots(nrows, ncols, figsize=figsize)
+
+        free = self._free.get(key)
+        if free:
+            # New axes on the old figure: Axes.clear() keeps some state (e.g.
+            # tick_params rotation), which would leak into the next chart
+            fig = free.pop()
+            fig.clear()
+            self.reused += 1
+        else:
+            fig = Figure(figsize=figsize, dpi=self.dpi)
+            FigureCanvasAgg(fig)
+            self.created += 1
+        fig.subplots(nrows, ncols)
+        self._layout[id(fig)] = key
+        axes = fig.axes[0] if nrows * ncols == 1 else np.array(fig.axes).reshape(
+            [n for n in (nrows, ncols) if n > 1])
+        return fig, axes
+
+    def _encode(self, fig):
+        """Write the PNG of `fig` into self.buffer -> a view of its bytes; releases `fig`."""
+        if id(fig) not in self._layout:
+            # Baseline mode, or a figure from plt.subplots()
+            import matplotlib.pyplot as plt
+
+            buf = BytesIO()
+            fig.savefig(buf, format='png', dpi=self.dpi, bbox_inches='tight')
+            plt.close(fig)
+            return buf.getbuffer()
+
+        from PIL import Image, PngImagePlugin
+
+        canvas = fig.canvas
+        # The layout pass of savefig(bbox_inches='tight'): draw without rendering
+        with self._measure._draw_disabled():
+            fig.draw(self._measure)
+        bbox = fig.get_tightbbox(self._measure).padded(self.pad_inches)
+        if _ADJUST_WITH_RENDERER:
+            restore = adjust_bbox(fig, bbox, self._measure, canvas.fixed_dpi)
+        else:
+            restore = adjust_bbox(fig, bbox, canvas.fixed_dpi)
+        try:
+            canvas.draw()
+            rgba = canvas.buffer_rgba()
+            image = Image.frombuffer('RGBA', (rgba.shape[1], rgba.shape[0]), rgba, 'raw', 'RGBA', 0, 1)
+            info = PngImagePlugin.PngInfo()
+            info.add_text('Software', f"Matplotlib version{mpl.__version__}, https://matplotlib.org/")
+            self.buffer.reset()
+            image.save(self.buffer, format='png', pnginfo=info, dpi=(self.dpi, self.dpi))
+        finally:
+            restore()
+        self._free.setdefault(self._layout.pop(id(fig)), []).append(fig)
+        return self.buffer.getbuffer()
+
+    def render(self, fig):
+        """PNG bytes of `fig`, as savefig(format='png', bbox_inches='tight') writes them; releases `fig`."""
+        return bytes(self._encode(fig))
+
+    def to_base64(self, fig):
+        """render(fig) as base64 text, encoded without copying the PNG."""
+        return base64.b64encode(self._encode(fig)).decode('utf-8')
+
+    def clear(self):
+        self._free.clear()
+        self._layout.clear()
@@ -0,0 +1,705 @@
+"""
+Publication figure exporter for the `figures/` directory.
+
+Every figure is declared once in FIGURES (name, kind, parameters and the data
+columns it reads). `export_figures` renders them in a process pool, writes the
+PNG and the SVG from the same rendered figure, and skips a figure when the
+hash of its inputs (spec, builder source, data columns, library versions) is
+unchanged since the last export and its files still exist. Files are written
+to a temporary name and renamed into place, so an interrupted run never
+leaves a half-written figure behind.
+
+svg_mode='compact' shrinks the SVGs: dense artists (scatter points, heatmap
+cells, box plot fliers) are rasterized inside an otherwise vector SVG, and
+the output is post-processed to drop metadata, comments and excess
+coordinate precision. The summary then reports the bytes saved per figure.
+
+Usage:
+    python -m gender_education.figures [--jobs 4] [--force] [--only figure2] [--compact-svg]
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import re
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .config import CLEANED_CSV, FIGURES_DIR, INDICATOR_COLS, ISO_CODES
+
+MANIFEST_NAME = '.export_manifest.json'
+PNG_DPI = 300
+SVG_MODES = ('full', 'compact')
+
+# Compact SVG: resolution of rasterized artists, artist size that counts as
+# dense, and decimals kept in coordinates (SVG units are points: 0.01 pt)
+RASTER_DPI = 200
+DENSE_MIN_ELEMENTS = 100
+SVG_DECIMALS = 2
+
+# Notebook 3 figure style; a fixed SVG hash salt keeps clip-path ids, and so
+# the SVG files, the same from one export to the next
+RC_PARAMS = {'figure.figsize': (14, 8), 'font.size': 11, 'svg.hashsalt': 'gender_education'}
+
+
+# ============================================================================
+# Figure builders (ported from Notebook 3 / the dashboard)
+# ============================================================================
+
+def histogram(df, column, title, color):
+    import matplotlib.pyplot as plt
+
+    data = df[column].dropna()
+    fig, ax = plt.subplots(figsize=(10, 7))
+    ax.hist(data, bins=40, color=color, edgecolor='black', alpha=0.7)
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
+    ax.set_xlabel('Value', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Frequency', fontsize=12, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3)
+
+    mean_val = data.mean()
+    median_val = data.median()
+    ax.axvline(mean_val, color='red', linestyle='--', linewidth=2, label=f'Mean: {mean_val:.1f}')
+    ax.axvline(median_val, color='blue', linestyle='--', linewidth=2, label=f'Median: {median_val:.1f}')
+    ax.legend(fontsize=11)
+    fig.tight_layout()
+    return fig
+
+
+def boxplot(df, column, title):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    df_plot = df[df[column].notna() & df['region'].notna()]
+    fig, ax = plt.subplots(figsize=(14, 8))
+    with warnings.catch_warnings():
+        # seaborn >= 0.13 warns about palette without hue; the output is unchanged
+        warnings.simplefilter('ignore', FutureWarning)
+        sns.boxplot(data=df_plot, x='region', y=column, ax=ax, palette='Set2')
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Region', fontsize=12, fontweight='bold')
+    ax.set_ylabel(title, fontsize=12, fontweight='bold')
+    ax.tick_params(axis='x', rotation=45, labelsize=10)
+    ax.grid(axis='y', alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def timeseries(df, column, title, ylabel):
+    import matplotlib.pyplot as plt
+
+    yearly = df.groupby(['year', 'region'])[column].mean().reset_index()
+    table = yearly.pivot(index='year', columns='region', values=column)
+    fig, ax = plt.subplots(figsize=(14, 8))
+    lines = ax.plot(table.index, table.to_numpy(), marker='o', linewidth=3, markersize=6, alpha=0.85)
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
+    ax.legend(lines, table.columns, loc='best', fontsize=10, framealpha=0.9)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def correlation_heatmap(df, columns):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    correlation_matrix = df[list(columns)].dropna().corr()
+    fig, ax = plt.subplots(figsize=(12, 10))
+    sns.heatmap(correlation_matrix, annot=True, fmt='.2f', cmap='coolwarm',
+                center=0, square=True, linewidths=1, cbar_kws={'shrink': 0.8},
+                vmin=-1, vmax=1, ax=ax)
+    ax.set_title('Correlation Matrix: Gender Education Indicators', fontsize=14, fontweight='bold', pad=20)
+    fig.tight_layout()
+    return fig
+
+
+def parity_regional(df):
+    import matplotlib.pyplot as plt
+
+    region_parity = df.groupby('region')['Literacy_Gender_Parity_Index'].mean().sort_values()
+    colors = ['red' if x < 0.95 else 'orange' if x < 0.98 else 'green' for x in region_parity.values]
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.barh(range(len(region_parity)), region_parity.values, color=colors, alpha=0.7, edgecolor='black')
+    ax.set_yticks(range(len(region_parity)))
+    ax.set_yticklabels(region_parity.index, fontsize=10)
+    ax.axvline(1.0, color='blue', linestyle='--', linewidth=2, label='Perfect Parity')
+    ax.set_xlabel('Gender Parity Index', fontsize=12, fontweight='bold')
+    ax.set_title('Average Literacy Gender Parity by Region', fontsize=14, fontweight='bold', pad=20)
+    ax.legend()
+    ax.grid(axis='x', alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def parity_temporal(df):
+    import matplotlib.pyplot as plt
+
+    yearly_parity = df.groupby('year')['Literacy_Gender_Parity_Index'].mean()
+    fig, ax = plt.subplots(figsize=(14, 8))
+    ax.plot(yearly_parity.index, yearly_parity.values, linewidth=3, color='purple', marker='o')
+    ax.axhline(1.0, color='blue', linestyle='--', linewidth=2, label='Perfect Parity')
+    ax.fill_between(yearly_parity.index, 0.95, 1.0, alpha=0.2, color='orange', label='Near Parity')
+    ax.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Gender Parity Index', fontsize=12, fontweight='bold')
+    ax.set_title('Global Literacy Gender Parity Trend (1980-2024)', fontsize=14, fontweight='bold', pad=20)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def plotly_regional_trends(df):
+    import plotly.express as px
+
+    regional_trends = df.groupby(['year', 'region'])['Literacy_Rate_Female'].mean().reset_index()
+    fig = px.line(regional_trends, x='year', y='Literacy_Rate_Female', color='region', markers=True,
+                  title='Female Literacy Rate Evolution by Region (1980-2024)',
+                  labels={'year': 'Year', 'Literacy_Rate_Female': 'Female Literacy Rate (%)',
+                          'region': 'World Region'},
+                  template='plotly_white', width=1400, height=600)
+    fig.update_traces(line=dict(width=3), marker=dict(size=6))
+    fig.update_layout(title_font_size=18, title_x=0.5)
+    return fig
+
+
+def plotly_scatter_latest(df):
+    import plotly.express as px
+
+    latest_year = df['year'].max()
+    fig = px.scatter(df[df['year'] == latest_year], x='Literacy_Rate_Female', y='Female_Labor_Force_Participation',
+                     color='region', size='Adolescent_Fertility_Rate', hover_name='country',
+                     title=f'Female Literacy vs. Labor Force Participation ({latest_year})',
+                     labels={'Literacy_Rate_Female': 'Female Literacy Rate (%)',
+                             'Female_Labor_Force_Participation': 'Female Labor Force Participation (%)',
+                             'region': 'World Region'},
+                     template='plotly_white', width=1400, height=700)
+    fig.update_traces(marker=dict(line=dict(width=1, color='DarkSlateGrey')))
+    fig.update_layout(title_font_size=18, title_x=0.5)
+    return fig
+
+
+def plotly_parity_box(df):
+    import plotly.express as px
+
+    fig = px.box(df[df['year'] >= 2010], x='region', y='Literacy_Gender_Parity_Index', color='region',
+                 title='Gender Parity Index Distribution by Region (2010-2024)',
+                 labels={'region': 'World Region', 'Literacy_Gender_Parity_Index': 'Gender Parity Index (F/M ratio)'},
+                 template='plotly_white', width=1400, height=600, points='outliers')
+    fig.add_hline(y=1.0, line_dash='dash', line_color='red',
+                  annotation_text='Perfect Parity (1.0)', annotation_position='right')
+    fig.update_layout(title_font_size=18, title_x=0.5, showlegend=False, xaxis_tickangle=-45)
+    return fig
+
+
+def plotly_choropleth_latest(df):
+    import plotly.express as px
+
+    latest_year = df['year'].max()
+    map_data = df[df['year'] == latest_year].assign(iso_alpha=df['country'].map(ISO_CODES)).dropna(subset=['iso_alpha'])
+    fig = px.choropleth(map_data, locations='iso_alpha', color='Literacy_Rate_Female', hover_name='country',
+                        color_continuous_scale='RdYlGn', range_color=[0, 100],
+                        title=f'Global Female Literacy Rate ({latest_year})',
+                        labels={'Literacy_Rate_Female': 'Female Literacy (%)'},
+                        template='plotly_white', width=1600, height=800)
+    fig.update_layout(title_font_size=18, title_x=0.5,
+                      geo=dict(showframe=False, showcoastlines=True, projection_type='natural earth'))
+    return fig
+
+
+def plotly_choropleth_first_last(df):
+    # The animated dashboard map at its first and last frame, one above the other
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    map_data = df.assign(iso_alpha=df['country'].map(ISO_CODES)).dropna(subset=['iso_alpha'])
+    years = [map_data['year'].min(), map_data['year'].max()]
+    fig = make_subplots(rows=2, cols=1, specs=[[{'type': 'geo'}], [{'type': 'geo'}]], vertical_spacing=0.08,
+                        subplot_titles=[f'year={year}' for year in years])
+    for row, year in enumerate(years, start=1):
+        frame = map_data[map_data['year'] == year]
+        fig.add_trace(go.Choropleth(locations=frame['iso_alpha'], z=frame['Literacy_Rate_Female'],
+                                    text=frame['country'], coloraxis='coloraxis'), row=row, col=1)
+    fig.update_geos(showframe=False, showcoastlines=True, projection_type='natural earth')
+    fig.update_layout(title=f'Global Female Literacy Rate Evolution ({years[0]}-{years[1]})', title_font_size=18,
+                      title_x=0.5, template='plotly_white', width=774, height=624,
+                      coloraxis=dict(colorscale='RdYlGn', cmin=0, cmax=100,
+                                     colorbar=dict(title='Female Literacy (%)')))
+    return fig
+
+
+def plotly_regional_bar(df, column, title, xlabel, color, line_color):
+    import plotly.graph_objects as go
+
+    latest_year = df['year'].max()
+    # Same region order in every panel: by female literacy, highest at the top
+    columns = list(dict.fromkeys(['Literacy_Rate_Female', column]))
+    regional = df[df['year'] == latest_year].groupby('region')[columns].mean().sort_values('Literacy_Rate_Female')
+    fig = go.Figure(go.Bar(y=regional.index, x=regional[column], orientation='h',
+                           marker=dict(color=color, line=dict(color=line_color, width=1)),
+                           text=regional[column].round(1), textposition='outside'))
+    fig.update_layout(title=title, title_font_size=18, title_x=0.5, xaxis_title=xlabel, yaxis_title='Region',
+                      template='plotly_white', width=1200, height=600, showlegend=False)
+    return fig
+
+
+def plotly_parallel_coordinates(df):
+    import plotly.express as px
+
+    latest_year = df['year'].max()
+    latest = df[df['year'] == latest_year].dropna(subset=INDICATOR_COLS + ['region'])
+    columns = ['Literacy_Rate_Female', 'Literacy_Rate_Male', 'Adolescent_Fertility_Rate',
+               'Female_Labor_Force_Participation', 'Girls_Out_Of_School_Primary']
+    fig = px.parallel_coordinates(latest, dimensions=columns, color=latest['region'].astype('category').cat.codes,
+                                  color_continuous_scale='Viridis',
+                                  labels={col: col.replace('_', ' ') for col in columns},
+                                  title=f'Multi-Variable Analysis: Gender Education Indicators ({latest_year})',
+                                  template='plotly_white', width=1400, height=600)
+    fig.update_layout(title_font_size=18, title_x=0.5, coloraxis_colorbar_title_text='')
+    return fig
+
+
+def plotly_sunburst_literacy(df, per_region=5):
+    import plotly.express as px
+
+    latest_year = df['year'].max()
+    top = (df[df['year'] == latest_year].sort_values('Literacy_Rate_Female', ascending=False)
+           .groupby('region').head(per_region))
+    fig = px.sunburst(top, path=['region', 'country'], values='Literacy_Rate_Female', color='Literacy_Rate_Female',
+                      color_continuous_scale='RdYlGn',
+                      title=f'Top Countries by Female Literacy Rate per Region ({latest_year})',
+                      template='plotly_white', width=1400, height=700)
+    fig.update_layout(title_font_size=18, title_x=0.5)
+    return fig
+
+
+BUILDERS = {
+    'histogram': histogram,
+    'boxplot': boxplot,
+    'timeseries': timeseries,
+    'correlation_heatmap': correlation_heatmap,
+    'parity_regional': parity_regional,
+    'parity_temporal': parity_temporal,
+    'plotly_regional_trends': plotly_regional_trends,
+    'plotly_scatter_latest': plotly_scatter_latest,
+    'plotly_parity_box': plotly_parity_box,
+    'plotly_choropleth_latest': plotly_choropleth_latest,
+    'plotly_choropleth_first_last': plotly_choropleth_first_last,
+    'plotly_regional_bar': plotly_regional_bar,
+    'plotly_parallel_coordinates': plotly_parallel_coordinates,
+    'plotly_sunburst_literacy': plotly_sunburst_literacy,
+}
+
+PLOTLY_KINDS = {name for name in BUILDERS if name.startswith('plotly_')}
+
+
+# ============================================================================
+# Declarative figure list
+# ============================================================================
+
+HISTOGRAMS = [
+    ('Literacy_Rate_Female', 'Female Literacy Rate (%)', 'skyblue'),
+    ('Literacy_Rate_Male', 'Male Literacy Rate (%)', 'lightcoral'),
+    ('Adolescent_Fertility_Rate', 'Adolescent Fertility Rate\n(births per 1000 women 15-19)', 'lightgreen'),
+    ('Female_Labor_Force_Participation', 'Female Labor Force\nParticipation (%)', 'gold'),
+    ('Girls_Out_Of_School_Primary', 'Girls Out of School\n(Primary Level)', 'plum'),
+    ('Literacy_Gap', 'Literacy Gap\n(Male - Female %)', 'salmon')
+]
+
+BOXPLOTS = [
+    ('Literacy_Rate_Female', 'Female Literacy Rate (%)'),
+    ('Adolescent_Fertility_Rate', 'Adolescent Fertility Rate'),
+    ('Female_Labor_Force_Participation', 'Female Labor Force Participation (%)'),
+    ('Literacy_Gap', 'Literacy Gap (Male - Female %)')
+]
+
+# The notebook also lists Literacy_Gap, but its yearly table has only the
+# core indicators, so no gap time series was ever saved
+TIMESERIES = [
+    ('Literacy_Rate_Female', 'Female Literacy Rate', '%'),
+    ('Adolescent_Fertility_Rate', 'Adolescent Fertility Rate', 'Births per 1000'),
+    ('Female_Labor_Force_Participation', 'Female Labor Force Participation', '%'),
+]
+
+REGIONAL_BARS = [
+    ('literacy_rate', 'Literacy_Rate_Female', 'Female Literacy Rate by Region (%)', '%', 'skyblue', 'navy'),
+    ('fertility_rate', 'Adolescent_Fertility_Rate', 'Adolescent Fertility Rate by Region', 'Births per 1000',
+     'lightcoral', 'darkred'),
+    ('labor_force', 'Female_Labor_Force_Participation', 'Female Labor Force Participation by Region (%)', '%',
+     'lightgreen', 'darkgreen'),
+    ('literacy_gap', 'Literacy_Gap', 'Gender Literacy Gap by Region (M-F %)', '% Points', 'plum', 'purple'),
+]
+
+CORRELATION_COLS = [
+    'Literacy_Rate_Female', 'Literacy_Rate_Male', 'Literacy_Gap',
+    'Adolescent_Fertility_Rate', 'Female_Labor_Force_Participation',
+    'Girls_Out_Of_School_Primary'
+]
+
+
+def _slug(column):
+    return column.lower().replace('_', '-')
+
+
+FIGURES = (
+    [{'name': f'figure1{chr(97 + i)}_histogram_{_slug(col)}', 'kind': 'histogram', 'inputs': [col],
+      'params': {'column': col, 'title': title, 'color': color}}
+     for i, (col, title, color) in enumerate(HISTOGRAMS)]
+    + [{'name': f'figure2{chr(97 + i)}_boxplot_{_slug(col)}', 'kind': 'boxplot', 'inputs': [col, 'region'],
+        'params': {'column': col, 'title': title}}
+       for i, (col, title) in enumerate(BOXPLOTS)]
+    + [{'name': f'figure3{chr(97 + i)}_timeseries_{_slug(col)}', 'kind': 'timeseries',
+        'inputs': [col, 'year', 'region'], 'params': {'column': col, 'title': title, 'ylabel': ylabel}}
+       for i, (col, title, ylabel) in enumerate(TIMESERIES)]
+    + [
+        {'name': 'figure4_correlation_heatmap', 'kind': 'correlation_heatmap', 'inputs': CORRELATION_COLS,
+         'params': {'columns': CORRELATION_COLS}},
+        {'name': 'figure5a_gender_parity_regional', 'kind': 'parity_regional',
+         'inputs': ['Literacy_Gender_Parity_Index', 'region'], 'params': {}},
+        {'name': 'figure5b_gender_parity_temporal', 'kind': 'parity_temporal',
+         'inputs': ['Literacy_Gender_Parity_Index', 'year'], 'params': {}},
+        {'name': 'figure6_regional_literacy_trends', 'kind': 'plotly_regional_trends',
+         'inputs': ['Literacy_Rate_Female', 'year', 'region'], 'params': {}},
+        {'name': 'figure7_choropleth_literacy_2024', 'kind': 'plotly_choropleth_latest',
+         'inputs': ['country', 'year', 'Literacy_Rate_Female'], 'params': {}},
+        {'name': 'figure8_scatter_literacy_labor', 'kind': 'plotly_scatter_latest',
+         'inputs': ['country', 'year', 'region', 'Literacy_Rate_Female', 'Female_Labor_Force_Participation',
+                    'Adolescent_Fertility_Rate'], 'params': {}},
+    ]
+    + [{'name': f'figure9{chr(97 + i)}_regional_{slug}', 'kind': 'plotly_regional_bar',
+        'inputs': ['year', 'region', 'Literacy_Rate_Female', col],
+        'params': {'column': col, 'title': title, 'xlabel': xlabel, 'color': color, 'line_color': line_color}}
+       for i, (slug, col, title, xlabel, color, line_color) in enumerate(REGIONAL_BARS)]
+    + [
+        {'name': 'figure10_parallel_coordinates', 'kind': 'plotly_parallel_coordinates',
+         'inputs': ['year', 'region'] + INDICATOR_COLS, 'params': {}},
+        {'name': 'figure11_gender_parity_boxplot', 'kind': 'plotly_parity_box',
+         'inputs': ['Literacy_Gender_Parity_Index', 'year', 'region'], 'params': {}},
+        {'name': 'figure12_sunburst_literacy', 'kind': 'plotly_sunburst_literacy',
+         'inputs': ['country', 'year', 'region', 'Literacy_Rate_Female'], 'params': {}},
+        # A PNG only, like the screenshot it replaces
+        {'name': 'figure13', 'kind': 'plotly_choropleth_first_last', 'formats': ['png'],
+         'inputs': ['country', 'year', 'Literacy_Rate_Female'], 'params': {}},
+    ]
+)
+
+
+# ============================================================================
+# Hashing, atomic writes and rendering
+# ============================================================================
+
+def _library_versions():
+    import matplotlib
+    import plotly
+    import seaborn
+    return {'matplotlib': matplotlib.__version__, 'seaborn': seaborn.__version__, 'plotly': plotly.__version__}
+
+
+def input_hash(spec, df, options=None):
+    """Hash of everything that determines a figure's output files."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({'spec': spec, 'options': options or {}, 'versions': _library_versions()},
+                             sort_keys=True).encode())
+    digest.update(inspect.getsource(BUILDERS[spec['kind']]).encode())
+    # The export code itself (PNG/SVG writing and SVG compaction)
+    for func in (render_figure, _write_svg, _svg_bytes, compact_svg, _hoist_use_style, rasterize_dense_artists):
+        digest.update(inspect.getsource(func).encode())
+    columns = [col for col in spec['inputs'] if col in df.columns]
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def atomic_write(path, write):
+    """Call write(file_object) on a temporary file, then rename it to `path`."""
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _output_paths(spec, output_dir):
+    return [os.path.join(output_dir, f"{spec['name']}.{fmt}") for fmt in spec.get('formats', ('png', 'svg'))]
+
+
+# ============================================================================
+# Compact SVG
+# ============================================================================
+
+def rasterize_dense_artists(fig, min_elements=DENSE_MIN_ELEMENTS):
+    """
+    Mark dense artists of a matplotlib figure as rasterized: heatmap meshes,
+    collections (scatter points) and marker-only lines (box plot fliers) with
+    at least `min_elements` cells/points. Below that, the embedded PNG is
+    larger than the vector shapes it replaces. Axes, text and regular lines
+    stay vector. Returns the number of artists rasterized.
+    """
+    from matplotlib.collections import Collection, QuadMesh
+    from matplotlib.lines import Line2D
+
+    count = 0
+    for ax in fig.axes:
+        for artist in ax.get_children():
+            if isinstance(artist, QuadMesh):
+                dense = artist.get_coordinates().shape[0] * artist.get_coordinates().shape[1] >= min_elements
+            elif isinstance(artist, Collection):
+                dense = max(len(artist.get_offsets()), len(artist.get_paths())) >= min_elements
+            elif isinstance(artist, Line2D):
+                markers_only = artist.get_linestyle() in ('None', '', ' ') and artist.get_marker() not in (None, '', 'None')
+                dense = markers_only and len(artist.get_xdata()) >= min_elements
+            else:
+                dense = False
+            if dense:
+                artist.set_rasterized(True)
+                count += 1
+    return count
+
+
+_NUMBER = re.compile(r'-?\d+\.\d+')
+# Geometry only: scale factors and style values keep full precision
+_COORD_ATTRS = re.compile(r'\b(d|x|y|x1|y1|x2|y2|width|height|cx|cy|r|points)="([^"]*)"')
+_TRANSLATE = re.compile(r'translate\(([^)]*)\)')
+_USE_GROUP = re.compile(r'<g([^>]*)>((?:<use [^>]*/>)+)</g>')
+_STYLE = re.compile(r' style="([^"]*)"')
+
+
+def _hoist_use_style(match):
+    # Markers are <use> elements that repeat one style; the group can carry it once
+    attrs, uses = match.groups()
+    styles = _STYLE.findall(uses)
+    if 'style=' in attrs or len(styles) != uses.count('<use ') or len(set(styles)) != 1:
+        return match.group(0)
+    return f'<g{attrs} style="{styles[0]}">{_STYLE.sub("", uses)}</g>'
+
+
+def compact_svg(svg, decimals=SVG_DECIMALS):
+    """
+    Drop metadata, comments and indentation, round coordinates and move the
+    style repeated on every marker of a group onto the group.
+    """
+    svg = re.sub(r'<metadata>.*?</metadata>', '', svg, flags=re.S)
+    svg = re.sub(r'<!--.*?-->', '', svg, flags=re.S)
+    svg = re.sub(r'>\s+<', '><', svg)
+    svg = _USE_GROUP.sub(_hoist_use_style, svg)
+
+    def round_number(match):
+        text = f'{float(match.group(0)):.{decimals}f}'.rstrip('0').rstrip('.')
+        return '0' if text in ('-0', '') else text
+
+    def round_coords(text):
+        return ' '.join(_NUMBER.sub(round_number, text).split())
+
+    svg = _TRANSLATE.sub(lambda m: f'translate({round_coords(m.group(1))})', svg)
+    return _COORD_ATTRS.sub(lambda m: f'{m.group(1)}="{round_coords(m.group(2))}"', svg)
+
+
+def _svg_bytes(fig, plotly=False):
+    if plotly:
+        return fig.to_image(format='svg')
+    from io import BytesIO
+
+    buf = BytesIO()
+    fig.savefig(buf, format='svg', bbox_inches='tight', dpi=RASTER_DPI, metadata={'Date': None})
+    return buf.getvalue()
+
+
+def _write_svg(fig, path, plotly, svg_mode):
+    start = time.perf_counter()
+    svg = _svg_bytes(fig, plotly)
+    stats = {'svg_full_bytes': None}
+    if svg_mode == 'compact':
+        stats['svg_full_bytes'] = len(svg)
+        start = time.perf_counter()
+        if not plotly:
+            rasterize_dense_artists(fig)
+            svg = _svg_bytes(fig)
+        svg = compact_svg(svg.decode('utf-8')).encode('utf-8')
+    stats['svg_seconds'] = time.perf_counter() - start
+    atomic_write(path, lambda f: f.write(svg))
+    stats['svg_bytes'] = len(svg)
+    return stats
+
+
+def render_figure(spec, df, output_dir, svg_mode='full'):
+    """
+    Build one figure and write its PNG and SVG from the same figure object
+    (only the formats in spec['formats'] when it is given). Returns sizes
+    and SVG timing; in compact mode also the size the full SVG would have had.
+    """
+    png_path, *svg_path = _output_paths(spec, output_dir)
+    fig = BUILDERS[spec['kind']](df, **spec['params'])
+    plotly = spec['kind'] in PLOTLY_KINDS
+    stats = {'svg_full_bytes': None, 'svg_seconds': 0.0, 'svg_bytes': 0}
+
+    if plotly:
+        # Static Plotly export needs the optional kaleido package
+        png = fig.to_image(format='png', scale=2)
+    else:
+        from io import BytesIO
+
+        buf = BytesIO()
+        fig.savefig(buf, format='png', dpi=PNG_DPI, bbox_inches='tight')
+        png = buf.getvalue()
+    atomic_write(png_path, lambda f: f.write(png))
+
+    if svg_path:
+        stats.update(_write_svg(fig, svg_path[0], plotly, svg_mode))
+
+    if not plotly:
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+    stats['png_bytes'] = len(png)
+    return stats
+
+
+# Data for pool workers, loaded once per process by _init_worker
+_worker_df = None
+
+
+def _init_worker(data_path):
+    global _worker_df
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style('whitegrid')
+    plt.rcParams.update(RC_PARAMS)
+    _worker_df = pd.read_csv(data_path)
+
+
+def _render_task(spec, output_dir, svg_mode):
+    start = time.perf_counter()
+    stats, error = {}, None
+    try:
+        stats = render_figure(spec, _worker_df, output_dir, svg_mode)
+    except Exception as e:  # reported in the summary, other figures continue
+        error = f'{type(e).__name__}: {e}'
+    return spec['name'], time.perf_counter() - start, error, stats
+
+
+def _load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def export_figures(figures=FIGURES, data_path=CLEANED_CSV, output_dir=FIGURES_DIR, jobs=None,
+                   force=False, only=None, svg_mode='full', verbose=True):
+    """
+    Render every figure whose inputs changed; returns one result dict per
+    figure with 'name', 'status' ('rendered', 'skipped', 'failed' or
+    'unavailable' for Plotly figures without kaleido), 'seconds' and 'error',
+    plus output sizes and SVG timing for rendered figures.
+    """
+    if svg_mode not in SVG_MODES:
+        raise ValueError(f"Unknown svg_mode {svg_mode!r}; choose from {SVG_MODES}")
+    os.makedirs(output_dir, exist_ok=True)
+    df = pd.read_csv(data_path)
+    figures = [spec for spec in figures if not only or any(pattern in spec['name'] for pattern in only)]
+    manifest = _load_manifest(output_dir)
+
+    options = {'svg_mode': svg_mode, 'png_dpi': PNG_DPI, 'raster_dpi': RASTER_DPI,
+               'dense_min_elements': DENSE_MIN_ELEMENTS, 'svg_decimals': SVG_DECIMALS, 'rc_params': RC_PARAMS}
+    hashes = {spec['name']: input_hash(spec, df, options) for spec in figures}
+    has_kaleido = importlib.util.find_spec('kaleido') is not None
+    results, todo = [], []
+    for spec in figures:
+        if spec['kind'] in PLOTLY_KINDS and not has_kaleido:
+            results.append({'name': spec['name'], 'status': 'unavailable', 'seconds': 0.0,
+                            'error': 'static Plotly export needs kaleido (pip install kaleido)'})
+            continue
+        entry = manifest.get(spec['name'], {})
+        unchanged = entry.get('hash') == hashes[spec['name']]
+        if not force and unchanged and all(os.path.exists(p) for p in _output_paths(spec, output_dir)):
+            results.append({'name': spec['name'], 'status': 'skipped', 'seconds': 0.0, 'error': None})
+        else:
+            todo.append(spec)
+
+    start = time.perf_counter()
+    jobs = jobs or os.cpu_count() or 1
+    if todo:
+        if jobs > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(data_path,)) as pool:
+                rendered = list(pool.map(_render_task, todo, [output_dir] * len(todo), [svg_mode] * len(todo)))
+        else:
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
+            global _worker_df
+            _worker_df = df
+            with sns.axes_style('whitegrid'), plt.rc_context(RC_PARAMS):
+                rendered = [_render_task(spec, output_dir, svg_mode) for spec in todo]
+        for name, seconds, error, stats in rendered:
+            results.append({'name': name, 'status': 'failed' if error else 'rendered',
+                            'seconds': seconds, 'error': error, **stats})
+            if not error:
+                manifest[name] = {'hash': hashes[name]}
+
+    atomic_write(os.path.join(output_dir, MANIFEST_NAME),
+                 lambda f: f.write(json.dumps(manifest, indent=2, sort_keys=True).encode()))
+
+    order = {spec['name']: i for i, spec in enumerate(figures)}
+    results.sort(key=lambda r: order[r['name']])
+    if verbose:
+        print_summary(results, time.perf_counter() - start)
+    return results
+
+
+def print_summary(results, elapsed):
+    for r in results:
+        if r['status'] == 'rendered':
+            line = f"  ✓ {r['name']:<55}{r['seconds']:>7.2f}s"
+            if r.get('svg_full_bytes'):
+                saved = 1 - r['svg_bytes'] / r['svg_full_bytes']
+                line += (f"   svg {r['svg_full_bytes'] / 1024:>6.0f} KB -> {r['svg_bytes'] / 1024:>5.0f} KB "
+                         f"({saved:>4.0%} smaller, {r['svg_seconds']:.2f}s)")
+            print(line)
+        elif r['status'] == 'skipped':
+            print(f"  - {r['name']:<55}{'unchanged':>8}")
+        elif r['status'] == 'unavailable':
+            print(f"  - {r['name']:<55} {r['error']}")
+        else:
+            print(f"  ✗ {r['name']:<55} {r['error']}")
+    counts = {status: sum(r['status'] == status for r in results)
+              for status in ('rendered', 'skipped', 'failed', 'unavailable')}
+    print(f"\n✓ Rendered {counts['rendered']}, skipped {counts['skipped']} unchanged, "
+          f"{counts['failed']} failed, {counts['unavailable']} unavailable ({len(results)} figures, {elapsed:.1f}s)")
+    compacted = [r for r in results if r.get('svg_full_bytes')]
+    if compacted:
+        full = sum(r['svg_full_bytes'] for r in compacted)
+        compact = sum(r['svg_bytes'] for r in compacted)
+        print(f"✓ Compact SVG: {full / 1024:.0f} KB -> {compact / 1024:.0f} KB ({1 - compact / full:.0%} smaller)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export publication figures (PNG + SVG) to figures/.')
+    parser.add_argument('--data', default=CLEANED_CSV, help='cleaned panel CSV')
+    parser.add_argument('--output-dir', default=FIGURES_DIR)
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='re-render even if inputs are unchanged')
+    parser.add_argument('--only', nargs='+', help='only figures whose name contains one of these strings')
+    parser.add_argument('--compact-svg', action='store_true',
+                        help='rasterize dense artists and strip metadata/precision from SVGs')
+    args = parser.parse_args(argv)
+    results = export_figures(data_path=args.data, output_dir=args.output_dir, jobs=args.jobs,
+                             force=args.force, only=args.only,
+                             svg_mode='compact' if args.compact_svg else 'full')
+    if any(r['status'] == 'failed' for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
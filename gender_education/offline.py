@@ -0,0 +1,287 @@
+"""
+Offline-capable multi-file version of the dashboard and analysis pages.
+
+gender_education_dashboard.html is one ~4 MB file: every EDA image is inline
+base64, every chart carries its data in an inline script and loads Plotly.js
+from the CDN again, so each visit downloads everything and nothing works
+offline. build_offline_site() splits the built pages into a static site:
+
+    offline/
+        index.html, analysis.html          the pages (dashboard renamed to index.html)
+        assets/<name>.<hash>.css|js        styles, page scripts, the bundled plotly.js
+        data/<chart>.<hash>.js             chart data scripts
+        img/<hash>.png                     EDA images and sparkline sheets
+        sw.js                              generated service worker
+        precache-manifest.json             every emitted file with its sha256
+
+Asset names carry a hash of their content, so a file never changes under a
+URL. The service worker precaches the shell (pages and assets/) on install,
+and caches data/ and img/ the first time they are fetched. Every request it
+has cached is then answered from the cache, which makes repeat loads and
+offline visits work. A changed build gets a new cache version and drops the
+old cache.
+
+verify_site() checks the emitted site against its manifest and service worker
+(see --verify). Service workers need http(s): serve the directory, e.g.
+`python -m http.server -d offline`.
+
+Usage:
+    python -m gender_education offline [--pages .] [--output offline]
+    python -m gender_education offline --verify
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import re
+
+from .config import OFFLINE_DIR, PROJECT_DIR
+
+# Built page -> name in the offline site
+PAGES = {'gender_education_dashboard.html': 'index.html', 'analysis.html': 'analysis.html'}
+MANIFEST_FILE = 'precache-manifest.json'
+SERVICE_WORKER = 'sw.js'
+SHELL_DIRS = ('assets/',)
+RUNTIME_DIRS = ('data/', 'img/')
+HASH_LENGTH = 10
+
+PLOTLY_CDN = re.compile(r'<script[^>]*\bsrc="https://cdn\.plot\.ly/plotly-[\w.-]+\.js"[^>]*></script>')
+INLINE_SCRIPT = re.compile(r'<script(?![^>]*\bsrc=)([^>]*)>(.*?)</script>', re.S)
+INLINE_STYLE = re.compile(r'<style>(.*?)</style>', re.S)
+DATA_URI = re.compile(r'data:image/(png|jpeg);base64,([A-Za-z0-9+/=]+)')
+CHART_ID = re.compile(r'document\.getElementById\("([\w-]+)"\)')
+HASHED_NAME = re.compile(r'\.([0-9a-f]{%d})\.\w+$' % HASH_LENGTH)
+# Resources a page loads (scripts, styles, images), not the pages it links to
+LOCAL_REFERENCE = re.compile(r'(?:src="|<link[^>]*href=")(?!https?:|data:)([^"?#]+)'
+                             r'|\b((?:img|data|assets)/[\w.-]+)')
+
+REGISTER_SCRIPT = """<script>
+        if ('serviceWorker' in navigator) {
+            navigator.serviceWorker.register('sw.js');
+        }
+    </script>
+"""
+
+SERVICE_WORKER_TEMPLATE = """// Generated by gender_education/offline.py: do not edit
+const CACHE = 'sdg5-%(version)s';
+const PRECACHE = %(precache)s;
+const RUNTIME = %(runtime)s;
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(CACHE).then(cache => cache.addAll(PRECACHE)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(caches.keys().then(keys => Promise.all(
+        keys.filter(key => key.startsWith('sdg5-') && key !== CACHE).map(key => caches.delete(key))
+    )).then(() => self.clients.claim()));
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(self.registration.scope)) {
+        return;
+    }
+    let path = request.url.slice(self.registration.scope.length).split('#')[0];
+    if (request.mode === 'navigate') {
+        // Pages are cached without their query (?api=...); the site root is index.html
+        path = path.split('?')[0] || 'index.html';
+    }
+    event.respondWith(caches.open(CACHE).then(cache => cache.match(path).then(cached => {
+        if (cached) {
+            return cached;
+        }
+        return fetch(request).then(response => {
+            // Chart data and images are cached on first use
+            if (response.ok && RUNTIME.some(prefix => path.startsWith(prefix))) {
+                cache.put(path, response.clone());
+            }
+            return response;
+        });
+    })));
+});
+"""
+
+
+def _sha256(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+class SiteWriter:
+    """Writes files under `output_dir`, content-hashed where asked, and remembers them."""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.files = {}
+
+    def write(self, path, content):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        full_path = os.path.join(self.output_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'wb') as f:
+            f.write(content)
+        self.files[path] = {'url': path, 'sha256': _sha256(content), 'bytes': len(content)}
+        return path
+
+    def emit(self, folder, stem, extension, content):
+        """Write `content` as folder/stem.<hash>.extension (once per content) -> its path."""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = _sha256(content)[:HASH_LENGTH]
+        name = f'{stem}.{digest}.{extension}' if stem else f'{digest}.{extension}'
+        path = f'{folder}/{name}'
+        if path not in self.files:
+            self.write(path, content)
+        return path
+
+
+def split_page(html, writer, plotly_path, page_name):
+    """One built page -> its offline HTML, writing its images, styles and scripts through `writer`."""
+    html = DATA_URI.sub(lambda m: writer.emit('img', '', m.group(1), base64.b64decode(m.group(2))), html)
+    html = INLINE_STYLE.sub(
+        lambda m: f'<link rel="stylesheet" href="{writer.emit("assets", page_name, "css", m.group(1))}">', html)
+
+    # One local plotly.js, where the first CDN copy was loaded, instead of one per chart
+    first = PLOTLY_CDN.search(html)
+    if first is not None:
+        rest = PLOTLY_CDN.sub('', html[first.start():])
+        html = html[:first.start()] + f'<script src="{plotly_path}"></script>' + rest
+
+    def external(match):
+        attributes, code = match.group(1), match.group(2)
+        if 'type=' in attributes and 'javascript' not in attributes:
+            return match.group(0)
+        if 'Plotly.newPlot' in code:
+            chart = CHART_ID.search(code)
+            path = writer.emit('data', chart.group(1) if chart else 'chart', 'js', code)
+        else:
+            path = writer.emit('assets', page_name, 'js', code)
+        return f'<script src="{path}"></script>'
+
+    html = INLINE_SCRIPT.sub(external, html)
+    for page, name in PAGES.items():
+        html = html.replace(f'href="{page}"', f'href="{name}"')
+    return html.replace('</body>', REGISTER_SCRIPT + '</body>', 1)
+
+
+def build_offline_site(pages_dir=PROJECT_DIR, output_dir=OFFLINE_DIR):
+    """Split the built pages in `pages_dir` into an offline site -> the precache manifest."""
+    from plotly.offline import get_plotlyjs
+
+    writer = SiteWriter(output_dir)
+    plotly_path = writer.emit('assets', 'plotly', 'min.js', get_plotlyjs())
+    for page, name in PAGES.items():
+        with open(os.path.join(pages_dir, page), encoding='utf-8') as f:
+            html = f.read()
+        writer.write(name, split_page(html, writer, plotly_path, name.rsplit('.', 1)[0]))
+
+    files = sorted(writer.files.values(), key=lambda entry: entry['url'])
+    precache = [entry for entry in files if entry['url'] in PAGES.values() or entry['url'].startswith(SHELL_DIRS)]
+    runtime = [entry for entry in files if entry['url'].startswith(RUNTIME_DIRS)]
+    version = _sha256(json.dumps(files, sort_keys=True).encode())[:HASH_LENGTH]
+    manifest = {'version': version, 'precache': precache, 'runtime': runtime}
+
+    writer.write(SERVICE_WORKER, SERVICE_WORKER_TEMPLATE % {
+        'version': version, 'precache': json.dumps([entry['url'] for entry in precache]),
+        'runtime': json.dumps(list(RUNTIME_DIRS)),
+    })
+    writer.write(MANIFEST_FILE, json.dumps(manifest, indent=1) + '\n')
+
+    # Files of earlier builds would be served by nobody: remove them
+    for path in _site_files(output_dir):
+        if path not in writer.files:
+            os.remove(os.path.join(output_dir, path))
+    return manifest
+
+
+def _site_files(output_dir):
+    paths = []
+    for root, _, names in os.walk(output_dir):
+        for name in names:
+            paths.append(os.path.relpath(os.path.join(root, name), output_dir).replace(os.sep, '/'))
+    return sorted(paths)
+
+
+def verify_site(output_dir=OFFLINE_DIR):
+    """Problems of an emitted site: manifest, service worker and files must agree (empty list if none)."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return [f'{MANIFEST_FILE} is missing']
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    entries = {entry['url']: entry for entry in manifest['precache'] + manifest['runtime']}
+    problems = []
+
+    # Every listed file exists with the listed content; hashed names match their content
+    for url, entry in entries.items():
+        path = os.path.join(output_dir, url)
+        if not os.path.exists(path):
+            problems.append(f'{url}: listed but not emitted')
+            continue
+        with open(path, 'rb') as f:
+            content = f.read()
+        if _sha256(content) != entry['sha256'] or len(content) != entry['bytes']:
+            problems.append(f'{url}: content differs from the manifest')
+        hashed = HASHED_NAME.search(url)
+        if hashed and not entry['sha256'].startswith(hashed.group(1)):
+            problems.append(f'{url}: name hash does not match its content')
+
+    # Every emitted file is listed
+    for path in _site_files(output_dir):
+        if path not in entries and path not in (MANIFEST_FILE, SERVICE_WORKER):
+            problems.append(f'{path}: emitted but not in the manifest')
+
+    # The service worker precaches exactly the manifest's shell, under its version
+    with open(os.path.join(output_dir, SERVICE_WORKER), encoding='utf-8') as f:
+        worker = f.read()
+    precache = re.search(r'const PRECACHE = (\[.*?\]);', worker)
+    if precache is None or json.loads(precache.group(1)) != [entry['url'] for entry in manifest['precache']]:
+        problems.append(f'{SERVICE_WORKER}: PRECACHE differs from the manifest')
+    if f"'sdg5-{manifest['version']}'" not in worker:
+        problems.append(f'{SERVICE_WORKER}: cache version differs from the manifest')
+
+    # Every local file a page references is emitted, and every page is precached
+    precached = {entry['url'] for entry in manifest['precache']}
+    for page in PAGES.values():
+        if page not in precached:
+            problems.append(f'{page}: not precached')
+            continue
+        with open(os.path.join(output_dir, page), encoding='utf-8') as f:
+            html = f.read()
+        for match in LOCAL_REFERENCE.finditer(html):
+            url = match.group(1) or match.group(2)
+            if url not in entries and url != SERVICE_WORKER:
+                problems.append(f'{page}: references {url}, which is not in the manifest')
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gender_education offline',
+                                     description='Write the dashboard as an offline-capable multi-file site.')
+    parser.add_argument('--pages', default=PROJECT_DIR, help='directory of the built HTML pages')
+    parser.add_argument('--output', default=OFFLINE_DIR, help='site directory')
+    parser.add_argument('--verify', action='store_true', help='only check an emitted site against its manifest')
+    args = parser.parse_args(argv)
+
+    if not args.verify:
+        manifest = build_offline_site(args.pages, args.output)
+        shell = sum(entry['bytes'] for entry in manifest['precache'])
+        lazy = sum(entry['bytes'] for entry in manifest['runtime'])
+        print(f"✓ Offline site {manifest['version']}: {os.path.relpath(args.output)}/")
+        print(f"  precached shell: {len(manifest['precache'])} files, {shell / 1024:,.0f} KB")
+        print(f"  cached on use:   {len(manifest['runtime'])} files, {lazy / 1024:,.0f} KB")
+
+    problems = verify_site(args.output)
+    for problem in problems:
+        print(f"✗ {problem}")
+    if problems:
+        return 1
+    print("✓ Precache manifest matches the emitted files")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+"""
+Dense (country x year x indicator) view of the cleaned panel.
+
+The cleaned CSV is a balanced long table (every country has one row per
+year), so most per-country computations can run on a 3-D NumPy array instead
+of looping over `df[df['country'] == country]`.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class DensePanel:
+    """Indicator values as a float array of shape (countries, years, indicators)."""
+
+    def __init__(self, countries, years, columns, values, regions=None):
+        self.countries = np.asarray(countries, dtype=object)
+        self.years = np.asarray(years)
+        self.columns = list(columns)
+        self.values = values
+        # Region per country (None where the country is not in region_mapping)
+        self.regions = np.asarray(regions, dtype=object) if regions is not None else None
+        self._country_pos = {c: i for i, c in enumerate(self.countries)}
+        self._year_pos = {int(y): i for i, y in enumerate(self.years)}
+
+    @classmethod
+    def from_frame(cls, df, columns):
+        columns = list(columns)
+        country_codes, countries = pd.factorize(df['country'], sort=True)
+        year_codes, years = pd.factorize(df['year'], sort=True)
+
+        values = np.full((len(countries), len(years), len(columns)), np.nan)
+        # Duplicated (country, year) rows keep the last value, like a pivot
+        values[country_codes, year_codes, :] = df[columns].to_numpy(dtype=float)
+
+        regions = None
+        if 'region' in df.columns:
+            region_by_country = df.groupby('country', sort=True)['region'].first()
+            regions = region_by_country.reindex(countries).to_numpy(dtype=object)
+            regions = np.where(pd.isna(regions), None, regions)
+
+        return cls(countries, years, columns, values, regions)
+
+    def country_index(self, country):
+        return self._country_pos[country]
+
+    def year_index(self, year):
+        return self._year_pos[int(year)]
+
+    def column_index(self, column):
+        return self.columns.index(column)
+
+    def series(self, column):
+        """2-D (countries, years) array for one indicator."""
+        return self.values[:, :, self.column_index(column)]
+
+    def to_frame(self):
+        """Back to the long (country, year, indicators...) layout."""
+        n_countries, n_years, _ = self.values.shape
+        df = pd.DataFrame(
+            self.values.reshape(n_countries * n_years, len(self.columns)),
+            columns=self.columns,
+        )
+        df.insert(0, 'year', np.tile(self.years, n_countries))
+        df.insert(0, 'country', np.repeat(self.countries, n_years))
+        return df
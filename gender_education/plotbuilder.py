@@ -0,0 +1,300 @@
+"""
+Plotly figures as plain dicts, built without plotly express.
+
+px.line/px.scatter/px.choropleth/px.box check and copy every argument, group
+the frame once per trace, build validated graph objects, and to_html() then
+walks the figure again to convert its arrays, serializes it and hashes the
+bundled plotly.js for the script tag, once per chart. The dashboard's express
+charts instead build the same figure dict directly:
+
+    levels, groups = grouped_rows(df['region'])
+    fig = {'data': [...one trace dict per group, holding NumPy arrays...],
+           'layout': {'template': TEMPLATE, ...}}
+    html, data_size = figure_div(fig, 'chart1')
+
+- grouped_rows() groups the rows once (factorize + one stable argsort), in
+  plotly express' trace order: each key's order of first appearance
+- the template is a name; its JSON is serialized once per process
+- NumPy arrays stay in the traces until serialization, where numeric ones
+  become plotly.js typed arrays ({'dtype', 'bdata'}: base64 of the raw
+  little-endian values, as plotly >= 6 embeds them) and others lists; with
+  plotly 5, whose plotly.js cannot decode typed arrays, all become lists
+- JSON is written with orjson when it is installed (json otherwise), and the
+  div around it is plotly's own to_html() markup, rendered once per div
+
+The dicts hold the same traces, layout and frames as the express figures,
+so the charts look and behave the same (benchmarks/bench_plotly_build.py
+checks this before timing both).
+"""
+
+import base64
+import json
+import re
+
+import numpy as np
+import pandas as pd
+import plotly
+from plotly.utils import PlotlyJSONEncoder
+
+from .rendering import RENDER_MODES, WEBGL_POINT_THRESHOLD
+
+TEMPLATE = 'plotly_white'
+
+# plotly.js typed array names of the NumPy dtypes it reads
+# The plotly.js that plotly < 6 loads draws nothing from {'dtype', 'bdata'} arrays
+TYPED_ARRAYS = int(plotly.__version__.split('.')[0]) >= 6
+TYPED_ARRAY_DTYPES = {'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2', 'int32': 'i4', 'uint32': 'u4',
+                      'float32': 'f4', 'float64': 'f8'}
+
+# Scatter attributes scattergl does not have (to_webgl() drops them)
+SCATTER_ONLY = {'alignmentgroup', 'cliponaxis', 'fillgradient', 'fillpattern', 'groupnorm', 'hoveron', 'offsetgroup',
+                'orientation', 'stackgaps', 'stackgroup', 'zorder'}
+SCATTER_ONLY_MARKER = {'angleref', 'gradient', 'maxdisplayed', 'standoff'}
+SCATTER_ONLY_LINE = {'backoff', 'simplify', 'smoothing'}
+
+# Placeholders of the div shell (see _div_shell)
+_DATA, _LAYOUT, _FRAMES = '@@data@@', '@@layout@@', '@@frames@@'
+
+_templates = {}
+_shells = {}
+
+
+# ----------------------------------------------------------------------------
+# Building
+# ----------------------------------------------------------------------------
+
+def grouped_rows(*keys):
+    """
+    Rows of every combination of `keys` present in the data -> (levels,
+    groups): levels[k] are the values of keys[k] in order of first
+    appearance, and groups is a list of (codes, row indices), one per
+    combination, ordered by the codes of the first key, then the second...
+    Rows with a missing key are left out, as plotly express leaves them out.
+    """
+    codes, levels = zip(*(pd.factorize(np.asarray(key), sort=False) for key in keys))
+    shape = [max(len(level), 1) for level in levels]
+    present = np.logical_and.reduce([code >= 0 for code in codes])
+    rows = np.flatnonzero(present)
+    combined = np.ravel_multi_index([code[rows] for code in codes], shape)
+    order = np.argsort(combined, kind='stable')
+    rows, combined = rows[order], combined[order]
+    starts = np.flatnonzero(np.r_[True, combined[1:] != combined[:-1]]) if len(rows) else np.array([], dtype=int)
+    groups = [(np.unravel_index(combined[start], shape), members)
+              for start, members in zip(starts, np.split(rows, starts[1:]))]
+    return [level.tolist() for level in levels], [(tuple(int(c) for c in code), members) for code, members in groups]
+
+
+def discrete_colors(values, template=TEMPLATE):
+    """
+    Color of every value, as plotly express assigns them: the template's
+    colorway in order of first appearance. A missing value takes its turn
+    in the colorway too, although express draws no trace for it.
+    """
+    import plotly.io as pio
+
+    colorway = pio.templates[template].layout.colorway
+    return {value: colorway[i % len(colorway)] for i, value in enumerate(pd.unique(np.asarray(values)))}
+
+
+def hovertemplate(fields, hover_name=False):
+    """plotly express' hover text: one 'label=value' line per (label, value), the hover name in bold on top."""
+    lines = '<br>'.join(f'{label}={value}' for label, value in fields)
+    return ('<b>%{hovertext}</b><br><br>' if hover_name else '') + lines + '<extra></extra>'
+
+
+def xy_axes(x_title, y_title):
+    """xaxis/yaxis of a single-panel express chart."""
+    return {
+        'xaxis': {'anchor': 'y', 'domain': [0.0, 1.0], 'title': {'text': x_title}},
+        'yaxis': {'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': y_title}},
+    }
+
+
+def animation_controls(frame_names, redraw=False, prefix=None):
+    """Play/pause buttons and the frame slider of an animated express chart -> layout entries."""
+    def animate(duration):
+        return {'frame': {'duration': duration, 'redraw': redraw}, 'mode': 'immediate', 'fromcurrent': True,
+                'transition': {'duration': duration, 'easing': 'linear'}}
+
+    buttons = [
+        {'args': [None, animate(500)], 'label': '&#9654;', 'method': 'animate'},
+        {'args': [[None], animate(0)], 'label': '&#9724;', 'method': 'animate'},
+    ]
+    steps = [{'args': [[name], animate(0)], 'label': name, 'method': 'animate'} for name in frame_names]
+    return {
+        'updatemenus': [{'buttons': buttons, 'direction': 'left', 'pad': {'r': 10, 't': 70}, 'showactive': False,
+                         'type': 'buttons', 'x': 0.1, 'xanchor': 'right', 'y': 0, 'yanchor': 'top'}],
+        'sliders': [{'active': 0, 'currentvalue': {'prefix': prefix or ''}, 'len': 0.9, 'pad': {'b': 10, 't': 60},
+                     'steps': steps, 'x': 0.1, 'xanchor': 'left', 'y': 0, 'yanchor': 'top'}],
+    }
+
+
+# ----------------------------------------------------------------------------
+# Render mode and markers (figure dict versions of gender_education.rendering)
+# ----------------------------------------------------------------------------
+
+def _trace_points(traces):
+    return sum(len(trace['x']) for trace in traces if trace.get('type') in ('scatter', 'scattergl')
+               and trace.get('x') is not None)
+
+
+def point_count(fig):
+    """Points drawn at once: the base traces or the largest animation frame."""
+    return max([_trace_points(fig['data'])] + [_trace_points(frame['data']) for frame in fig.get('frames', [])])
+
+
+def _to_gl(traces):
+    converted = []
+    for trace in traces:
+        if trace.get('type') == 'scatter':
+            trace = {key: value for key, value in trace.items() if key not in SCATTER_ONLY}
+            trace['type'] = 'scattergl'
+            if 'marker' in trace:
+                trace['marker'] = {key: value for key, value in trace['marker'].items()
+                                   if key not in SCATTER_ONLY_MARKER}
+            if 'line' in trace:
+                trace['line'] = {key: value for key, value in trace['line'].items() if key not in SCATTER_ONLY_LINE}
+        converted.append(trace)
+    return converted
+
+
+def to_webgl(fig):
+    """Copy of `fig` with every scatter trace (including frames) as scattergl."""
+    frames = [dict(frame, data=_to_gl(frame['data'])) for frame in fig.get('frames', [])]
+    return dict(fig, data=_to_gl(fig['data']), **({'frames': frames} if frames else {}))
+
+
+def apply_render_mode(fig, mode='auto', threshold=WEBGL_POINT_THRESHOLD):
+    """Return `fig` rendered as SVG or WebGL; 'auto' picks WebGL above `threshold` points."""
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode!r}; choose from {RENDER_MODES}")
+    if mode == 'webgl' or (mode == 'auto' and point_count(fig) > threshold):
+        return to_webgl(fig)
+    return fig
+
+
+def hollow_markers(fig, names):
+    """Draw the markers whose hover name is in `names` as open circles (e.g. imputed points)."""
+    names = list(names)
+    for trace in fig['data']:
+        if trace.get('type') in ('scatter', 'scattergl') and trace.get('hovertext') is not None:
+            hollow = np.isin(np.asarray(trace['hovertext'], dtype=object), names)
+            marker = trace.setdefault('marker', {})
+            marker['symbol'] = np.where(hollow, 'circle-open', 'circle')
+            line = marker.setdefault('line', {})
+            line['width'] = np.where(hollow, 2, line.get('width') or 1)
+    return fig
+
+
+# ----------------------------------------------------------------------------
+# Serialization
+# ----------------------------------------------------------------------------
+
+def typed_array(values):
+    """
+    Numeric array -> plotly.js typed array spec (ints in the smallest type
+    that holds them); others, and every array without TYPED_ARRAYS -> list.
+    """
+    values = np.asarray(values)
+    if not TYPED_ARRAYS:
+        return values.tolist()
+    if values.size and values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        low, high = values.min(), values.max()
+        for dtype in ('int8', 'int16', 'int32') if values.dtype.kind == 'i' else ('uint8', 'uint16', 'uint32'):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                values = values.astype(dtype)
+                break
+    if not values.size or values.dtype.name not in TYPED_ARRAY_DTYPES:
+        return values.tolist()
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    spec = {'dtype': TYPED_ARRAY_DTYPES[values.dtype.name], 'bdata': base64.b64encode(values).decode('ascii')}
+    if values.ndim > 1:
+        spec['shape'] = ', '.join(str(n) for n in values.shape)
+    return spec
+
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):
+        return typed_array(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, pd.Series):
+        return typed_array(obj.to_numpy())
+    raise TypeError(f'Type is not JSON serializable: {type(obj).__name__}')
+
+
+class _ArrayEncoder(PlotlyJSONEncoder):
+    # PlotlyJSONEncoder turns NaN into null, like orjson
+    def default(self, obj):
+        if isinstance(obj, (np.ndarray, np.generic, pd.Series)):
+            return _default(obj)
+        return super().default(obj)
+
+
+def to_json(obj):
+    """Compact JSON of a figure part, NumPy arrays as typed arrays; safe inside a <script>."""
+    try:
+        import orjson
+    except ImportError:
+        text = json.dumps(obj, cls=_ArrayEncoder, separators=(',', ':'))
+    else:
+        text = orjson.dumps(obj, default=_default).decode('utf-8')
+    # As plotly escapes it ('/' is left alone: '<' already rules out '</script>')
+    for unsafe, safe in (('<', '\\u003c'), ('>', '\\u003e'), ('\u2028', '\\u2028'), ('\u2029', '\\u2029')):
+        if unsafe in text:
+            text = text.replace(unsafe, safe)
+    return text
+
+
+def template_json(name=TEMPLATE):
+    """JSON of a named plotly template (serialized once per process)."""
+    if name not in _templates:
+        import plotly.io as pio
+
+        _templates[name] = to_json(pio.templates[name].to_plotly_json())
+    return _templates[name]
+
+
+def layout_json(layout):
+    """to_json(layout), with a template given by name written out in full."""
+    template = layout.get('template')
+    if not isinstance(template, str):
+        return to_json(layout)
+    rest = to_json({key: value for key, value in layout.items() if key != 'template'})
+    return '{"template":' + template_json(template) + (',' + rest[1:] if rest != '{}' else '}')
+
+
+def _div_shell(div_id, height, animated):
+    """
+    Markup of plotly's to_html(include_plotlyjs='cdn', full_html=False) for
+    one div, split around its data, layout and frames. Rendered once per div
+    from a placeholder figure, so the plotly.js tag (with its integrity hash
+    of the bundled library) is not recomputed for every chart.
+    """
+    key = (div_id, height, animated)
+    if key not in _shells:
+        import plotly.io as pio
+
+        stub = {'data': [_DATA], 'layout': {'height': height, 'meta': _LAYOUT}}
+        if animated:
+            stub['frames'] = [_FRAMES]
+        html = pio.to_html(stub, validate=False, include_plotlyjs='cdn', div_id=div_id, full_html=False)
+        head, rest = html.split(f'["{_DATA}"]', 1)
+        layout = re.search(r'\{[^{}]*"%s"[^{}]*\}' % _LAYOUT, rest)
+        middle, rest = rest[:layout.start()], rest[layout.end():]
+        frames, tail = rest.split(f'["{_FRAMES}"]', 1) if animated else (rest, '')
+        _shells[key] = (head, middle, frames, tail)
+    return _shells[key]
+
+
+def figure_div(fig, div_id):
+    """Figure dict -> (dashboard div as plotly's to_html writes it, bytes of data it embeds)."""
+    data = to_json(fig['data'])
+    frames = to_json(fig['frames']) if fig.get('frames') else None
+    height = fig['layout'].get('height')
+    head, middle, frames_part, tail = _div_shell(div_id, height, frames is not None)
+    html = head + data + middle + layout_json(fig['layout']) + frames_part + (frames or '') + tail
+    # Measured like cube.figure_data_size: {"data": ..., "frames": ...}
+    data_size = len(data) + len(frames or '[]') + len('{"data":,"frames":}')
+    return html, data_size
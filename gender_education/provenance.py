@@ -0,0 +1,120 @@
+"""
+Imputation provenance of the cleaned panel.
+
+After imputation the cleaned CSV no longer says which values were observed.
+impute_missing(..., return_codes=True) records it as one uint8 code per
+(row, indicator), made of the flags below, and Provenance stores the codes as
+a (country x year x indicator) uint8 array next to the CSV
+(gender_education_provenance.npz, ~10 KB). Filters and chart styling read
+the codes for the rows of any frame with country and year columns, without
+adding float columns to the panel:
+
+    provenance = Provenance.load(PROVENANCE_FILE)
+    observed = df[~provenance.mask(df, 'Literacy_Rate_Female')]
+
+Derived columns (Literacy_Gap, Gender_Equality_Index, ...) combine the flags
+of the indicators they are computed from.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .panel import DensePanel
+
+OBSERVED = 0
+INTERPOLATED = 1
+REGIONAL_MEAN = 2
+KNN = 4  # knn_fill; notebook 2's own KNN step never filled a value (see cleaning.py)
+MISSING = 8  # still missing after imputation
+IMPUTED = INTERPOLATED | REGIONAL_MEAN | KNN
+
+FLAG_NAMES = {INTERPOLATED: 'interpolated', REGIONAL_MEAN: 'regional mean', KNN: 'KNN', MISSING: 'missing'}
+
+DERIVED_FROM = {
+    'Literacy_Gap': ['Literacy_Rate_Male', 'Literacy_Rate_Female'],
+    'Literacy_Gender_Parity_Index': ['Literacy_Rate_Female', 'Literacy_Rate_Male'],
+    'Girls_Out_Of_School_Millions': ['Girls_Out_Of_School_Primary'],
+    'Girls_Out_Of_School_Primary_Scaled': ['Girls_Out_Of_School_Primary'],
+    'Literacy_Rate_Female_Scaled': ['Literacy_Rate_Female'],
+    'Literacy_Rate_Male_Scaled': ['Literacy_Rate_Male'],
+    'Adolescent_Fertility_Rate_Scaled': ['Adolescent_Fertility_Rate'],
+    'Female_Labor_Force_Participation_Scaled': ['Female_Labor_Force_Participation'],
+    'Gender_Equality_Index': ['Literacy_Rate_Female', 'Female_Labor_Force_Participation', 'Adolescent_Fertility_Rate'],
+}
+
+
+def provenance_codes(missing_before, missing_after_interpolation, missing_after_fill, second_flag=REGIONAL_MEAN):
+    """
+    uint8 codes from the missing-value masks before and after each imputation
+    step; `second_flag` marks the values of the second step (regional mean or KNN).
+    """
+    codes = np.zeros(missing_before.shape, dtype=np.uint8)
+    codes[missing_before & ~missing_after_interpolation] = INTERPOLATED
+    codes[missing_after_interpolation & ~missing_after_fill] = second_flag
+    codes[missing_after_fill] = MISSING
+    return codes
+
+
+class Provenance:
+    """Provenance codes as a DensePanel with uint8 values."""
+
+    def __init__(self, panel):
+        self.panel = panel
+
+    @classmethod
+    def from_codes(cls, df, columns, codes):
+        """From the (rows, columns) codes of impute_missing, aligned with `df`'s rows."""
+        columns = list(columns)
+        country_codes, countries = pd.factorize(df['country'], sort=True)
+        year_codes, years = pd.factorize(df['year'], sort=True)
+        values = np.full((len(countries), len(years), len(columns)), MISSING, dtype=np.uint8)
+        values[country_codes, year_codes, :] = codes
+        return cls(DensePanel(countries, years, columns, values))
+
+    def save(self, path):
+        np.savez_compressed(
+            path, countries=self.panel.countries.astype(str), years=self.panel.years,
+            columns=np.asarray(self.panel.columns), codes=self.panel.values,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(DensePanel(data['countries'].astype(object), data['years'], data['columns'].tolist(),
+                                  data['codes']))
+
+    @property
+    def columns(self):
+        return self.panel.columns + [col for col, sources in DERIVED_FROM.items()
+                                     if all(source in self.panel.columns for source in sources)]
+
+    def codes(self, df, column):
+        """uint8 codes of `column` for the rows of `df` (MISSING for unknown rows)."""
+        if column in DERIVED_FROM and column not in self.panel.columns:
+            codes = np.zeros(len(df), dtype=np.uint8)
+            for source in DERIVED_FROM[column]:
+                codes |= self.codes(df, source)
+            return codes
+        country_pos = pd.Index(self.panel.countries).get_indexer(df['country'])
+        year_pos = pd.Index(self.panel.years).get_indexer(df['year'])
+        known = (country_pos >= 0) & (year_pos >= 0)
+        codes = np.full(len(df), MISSING, dtype=np.uint8)
+        codes[known] = self.panel.values[country_pos[known], year_pos[known], self.panel.column_index(column)]
+        return codes
+
+    def mask(self, df, column, flags=IMPUTED):
+        """Boolean mask of the rows of `df` whose `column` has any of `flags`."""
+        return (self.codes(df, column) & flags) != 0
+
+    def frame(self, df, columns=None):
+        """uint8 code columns for the rows of `df`, indexed like it."""
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({col: self.codes(df, col) for col in columns}, index=df.index)
+
+    def summary(self):
+        """Share of values per flag for each stored indicator."""
+        values = self.panel.values.reshape(-1, len(self.panel.columns))
+        rows = {'observed': (values == OBSERVED).mean(axis=0)}
+        for flag, name in FLAG_NAMES.items():
+            rows[name] = ((values & flag) != 0).mean(axis=0)
+        return pd.DataFrame(rows, index=self.panel.columns)
@@ -0,0 +1,128 @@
+"""
+Precomputed country rankings for every (year, indicator) in the panel.
+
+Notebook 3 used `latest_data.nlargest(10, col)` / `nsmallest(10, col)` for the
+latest year only. RankingIndex sorts all years and indicators at once with a
+single argsort over the dense panel, after which top/bottom lists, the rank
+of a country and rank changes between years are plain array lookups.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .panel import DensePanel
+
+RANKING_COLS = [
+    'Literacy_Rate_Female',
+    'Literacy_Rate_Male',
+    'Literacy_Gap',
+    'Literacy_Gender_Parity_Index',
+    'Adolescent_Fertility_Rate',
+    'Female_Labor_Force_Participation',
+    'Girls_Out_Of_School_Primary',
+    'Gender_Equality_Index'
+]
+
+
+class RankingIndex:
+    """
+    Rank 1 is the highest value. Missing values are ranked after every
+    observed country and reported with rank 0 by rank_of().
+    """
+
+    def __init__(self, panel):
+        self.panel = panel
+        values = panel.values
+
+        # One grouped argsort: axis 0 (countries) sorted independently for
+        # every (year, indicator) pair. NaNs sort to the end.
+        self.order = np.argsort(-values, axis=0, kind='stable')
+        # Bottom lists get their own stable ascending sort: reversing `order`
+        # would list tied countries in reverse row order, unlike nsmallest
+        self.ascending = np.argsort(values, axis=0, kind='stable')
+        self.n_valid = np.sum(~np.isnan(values), axis=0)
+
+        positions = np.broadcast_to(
+            np.arange(1, values.shape[0] + 1)[:, None, None], values.shape
+        )
+        self.ranks = np.empty(values.shape, dtype=np.int32)
+        np.put_along_axis(self.ranks, self.order, positions, axis=0)
+        self.ranks[np.isnan(values)] = 0
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        if columns is None:
+            columns = [col for col in RANKING_COLS if col in df.columns]
+        return cls(DensePanel.from_frame(df, columns))
+
+    def _slot(self, year, indicator):
+        return self.panel.year_index(year), self.panel.column_index(indicator)
+
+    def _table(self, idx, year_pos, col_pos):
+        panel = self.panel
+        table = pd.DataFrame({
+            'rank': self.ranks[idx, year_pos, col_pos],
+            'country': panel.countries[idx],
+            'value': panel.values[idx, year_pos, col_pos],
+        })
+        if panel.regions is not None:
+            table.insert(2, 'region', panel.regions[idx])
+        return table
+
+    def top(self, year, indicator, n=10):
+        y, c = self._slot(year, indicator)
+        idx = self.order[:min(n, self.n_valid[y, c]), y, c]
+        return self._table(idx, y, c)
+
+    def bottom(self, year, indicator, n=10):
+        """Lowest values first (same ordering as nsmallest)."""
+        y, c = self._slot(year, indicator)
+        idx = self.ascending[:min(n, self.n_valid[y, c]), y, c]
+        return self._table(idx, y, c)
+
+    def rank_of(self, country, year, indicator):
+        y, c = self._slot(year, indicator)
+        return int(self.ranks[self.panel.country_index(country), y, c])
+
+    def rank_change(self, year_from, year_to, indicator):
+        """
+        Rank change for every country between two years (positive = moved up).
+        Countries without a value in either year are dropped.
+        """
+        y0, c = self._slot(year_from, indicator)
+        y1, _ = self._slot(year_to, indicator)
+        before = self.ranks[:, y0, c]
+        after = self.ranks[:, y1, c]
+        keep = (before > 0) & (after > 0)
+        table = pd.DataFrame({
+            'country': self.panel.countries[keep],
+            f'rank_{year_from}': before[keep],
+            f'rank_{year_to}': after[keep],
+            'change': before[keep] - after[keep],
+        })
+        return table.sort_values('change', ascending=False, kind='stable').reset_index(drop=True)
+
+    def leaderboard_data(self, indicators, n=10, decimals=1):
+        """
+        Compact JSON-ready payload for the dashboard leaderboard: country names
+        are stored once and every entry is a [country_index, value] pair.
+        """
+        panel = self.panel
+        boards = {}
+        for indicator in indicators:
+            c = panel.column_index(indicator)
+            per_year = {}
+            for y, year in enumerate(panel.years):
+                valid = self.n_valid[y, c]
+                top_idx = self.order[:min(n, valid), y, c]
+                bottom_idx = self.ascending[:min(n, valid), y, c]
+                per_year[str(int(year))] = {
+                    'top': [[int(i), round(float(panel.values[i, y, c]), decimals)] for i in top_idx],
+                    'bottom': [[int(i), round(float(panel.values[i, y, c]), decimals)] for i in bottom_idx],
+                }
+            boards[indicator] = per_year
+        return {
+            'countries': panel.countries.tolist(),
+            'years': [int(year) for year in panel.years],
+            'boards': boards,
+        }
@@ -0,0 +1,100 @@
+"""
+SVG vs WebGL rendering for dense Plotly charts.
+
+Plotly draws `scatter` traces as SVG elements, one per marker or line
+segment, which gets slow to draw and interact with once a chart holds
+thousands of points. `scattergl` draws the same traces with WebGL instead.
+
+WEBGL_POINT_THRESHOLD is the number of points drawn at once (for animated
+charts: the largest frame) above which mode='auto' switches to WebGL. It
+matches plotly express' own render_mode='auto' cut-off of 1,000 points;
+below it SVG is as fast and keeps crisper text and exact SVG exports.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from .panel import DensePanel
+
+WEBGL_POINT_THRESHOLD = 1000
+RENDER_MODES = ('auto', 'svg', 'webgl')
+
+
+def _trace_points(traces):
+    return sum(len(trace.x) for trace in traces if trace.type in ('scatter', 'scattergl') and trace.x is not None)
+
+
+def point_count(fig):
+    """Points drawn at once: the base traces or the largest animation frame."""
+    return max([_trace_points(fig.data)] + [_trace_points(frame.data) for frame in fig.frames])
+
+
+def _to_gl(traces):
+    # Scattergl has no SVG-only attributes (e.g. cliponaxis); those are dropped
+    return [go.Scattergl(trace.to_plotly_json(), skip_invalid=True) if trace.type == 'scatter' else trace
+            for trace in traces]
+
+
+def to_webgl(fig):
+    """Copy of `fig` with every scatter trace (including frames) as scattergl."""
+    frames = [go.Frame(data=_to_gl(frame.data), name=frame.name, layout=frame.layout, traces=frame.traces)
+              for frame in fig.frames]
+    return go.Figure(data=_to_gl(fig.data), layout=fig.layout, frames=frames)
+
+
+def apply_render_mode(fig, mode='auto', threshold=WEBGL_POINT_THRESHOLD):
+    """Return `fig` rendered as SVG or WebGL; 'auto' picks WebGL above `threshold` points."""
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode!r}; choose from {RENDER_MODES}")
+    if mode == 'webgl' or (mode == 'auto' and point_count(fig) > threshold):
+        return to_webgl(fig)
+    return fig
+
+
+def hollow_markers(fig, names):
+    """Draw the markers whose hover name is in `names` as open circles (e.g. imputed points)."""
+    names = list(names)
+    for trace in fig.data:
+        if trace.type in ('scatter', 'scattergl') and trace.hovertext is not None:
+            hollow = np.isin(np.asarray(trace.hovertext, dtype=object), names)
+            trace.marker.symbol = np.where(hollow, 'circle-open', 'circle')
+            trace.marker.line.width = np.where(hollow, 2, trace.marker.line.width or 1)
+    return fig
+
+
+def country_trend_explorer(df, column, label, mode='auto', colors=None):
+    """
+    Every country's trajectory for one indicator, one trace per region.
+
+    The countries of a region share a single trace, separated by NaN gaps,
+    so ~200 countries x 45 years stay at 7 traces instead of ~200. Countries
+    are in sorted order so the dashboard's data cube can rebuild the y
+    arrays for another indicator in the browser.
+    """
+    panel = DensePanel.from_frame(df, [column])
+    # Compact dtypes keep the embedded (base64) arrays small; the gap after
+    # each country comes from the NaN in y, so x can stay integer
+    years = panel.years.astype(np.int16)
+    colors = colors or {}
+
+    fig = go.Figure()
+    for region in sorted({r for r in panel.regions if r is not None}):
+        members = np.flatnonzero(panel.regions == region)
+        series = panel.values[members, :, 0]
+        # One NaN column after each country breaks the line between countries
+        y = np.hstack([series, np.full((len(members), 1), np.nan)]).ravel().astype(np.float32)
+        x = np.tile(np.append(years, years[-1]), len(members))
+        text = np.repeat(panel.countries[members], len(years) + 1)
+        fig.add_trace(go.Scatter(
+            x=x, y=y, mode='lines', name=region, text=text,
+            line=dict(width=1, color=colors.get(region)), opacity=0.6,
+            hovertemplate='%{text} (%{x}): %{y:.1f}<extra></extra>'
+        ))
+
+    fig.update_layout(
+        title=f'{label}: Every Country ({int(panel.years.min())}-{int(panel.years.max())})',
+        title_font_size=18, title_x=0.5, template='plotly_white', height=650,
+        xaxis_title='Year', yaxis_title=label, hovermode='closest',
+        legend=dict(orientation='v', yanchor='top', y=1, xanchor='left', x=1.02)
+    )
+    return apply_render_mode(fig, mode)
@@ -0,0 +1,149 @@
+"""
+Min-Max scaling of the indicator columns against a persisted reference.
+
+Notebook 2 used to refit a MinMaxScaler per column on every run, so any data
+refresh silently rescaled every historical `<col>_Scaled` value. Here the
+min/max bounds live in a small JSON reference (scaling_reference.json) that is
+fitted once and then frozen: later runs transform with the stored bounds, and
+new years are appended without touching history.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .config import INDICATOR_COLS, SCALING_REFERENCE
+
+SCALING_MODES = ('frozen', 'refit')
+
+
+class ScalingReference:
+    """Per-column min/max bounds used to map indicators onto a 0-1 scale."""
+
+    def __init__(self, columns, data_min, data_max, n_samples_seen=None):
+        self.columns = list(columns)
+        self.data_min = np.asarray(data_min, dtype=float)
+        self.data_max = np.asarray(data_max, dtype=float)
+        if n_samples_seen is None:
+            n_samples_seen = np.zeros(len(self.columns), dtype=np.int64)
+        self.n_samples_seen = np.asarray(n_samples_seen, dtype=np.int64)
+
+    @classmethod
+    def fit(cls, df, columns=INDICATOR_COLS):
+        values = df[list(columns)].to_numpy(dtype=float)
+        return cls(
+            columns,
+            np.nanmin(values, axis=0),
+            np.nanmax(values, axis=0),
+            np.sum(~np.isnan(values), axis=0),
+        )
+
+    def partial_fit(self, df):
+        # Widen the bounds with a new batch of rows (same semantics as
+        # MinMaxScaler.partial_fit). Rows already transformed keep their values.
+        values = df[self.columns].to_numpy(dtype=float)
+        observed = ~np.isnan(values)
+        has_data = observed.any(axis=0)
+        batch_min = np.where(has_data, np.nanmin(np.where(observed, values, np.inf), axis=0), np.nan)
+        batch_max = np.where(has_data, np.nanmax(np.where(observed, values, -np.inf), axis=0), np.nan)
+        self.data_min = np.fmin(self.data_min, batch_min)
+        self.data_max = np.fmax(self.data_max, batch_max)
+        self.n_samples_seen = self.n_samples_seen + observed.sum(axis=0)
+        return self
+
+    def transform(self, df):
+        """Return the `<col>_Scaled` columns for all indicators in one step."""
+        values = df[self.columns].to_numpy(dtype=float)
+        data_range = self.data_max - self.data_min
+        # Constant columns map to 0, as MinMaxScaler does
+        data_range = np.where(data_range == 0, 1.0, data_range)
+        scaled = (values - self.data_min) / data_range
+        return pd.DataFrame(
+            scaled,
+            index=df.index,
+            columns=[f'{col}_Scaled' for col in self.columns],
+        )
+
+    def out_of_range(self, df):
+        """Count values per column that fall outside the frozen bounds."""
+        values = df[self.columns].to_numpy(dtype=float)
+        outside = (values < self.data_min) | (values > self.data_max)
+        return pd.Series(outside.sum(axis=0), index=self.columns)
+
+    def to_dict(self):
+        return {
+            col: {
+                'min': float(lo),
+                'max': float(hi),
+                'n_samples_seen': int(n),
+            }
+            for col, lo, hi, n in zip(self.columns, self.data_min, self.data_max, self.n_samples_seen)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        columns = list(data)
+        return cls(
+            columns,
+            [data[col]['min'] for col in columns],
+            [data[col]['max'] for col in columns],
+            [data[col].get('n_samples_seen', 0) for col in columns],
+        )
+
+    def save(self, path=SCALING_REFERENCE):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+
+    @classmethod
+    def load(cls, path=SCALING_REFERENCE):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def scale_indicators(df, columns=INDICATOR_COLS, mode='frozen', reference_path=SCALING_REFERENCE):
+    """
+    Add `<col>_Scaled` columns to `df` (in place) and return the reference used.
+
+    mode='frozen' loads the persisted reference (fitting and saving it on the
+    first run), so historical scaled values never move. mode='refit' fits on
+    the current data every time, which was the old notebook behaviour.
+    """
+    if mode not in SCALING_MODES:
+        raise ValueError(f"mode must be one of {SCALING_MODES}, got {mode!r}")
+
+    if mode == 'frozen' and reference_path and os.path.exists(reference_path):
+        reference = ScalingReference.load(reference_path)
+        missing = [col for col in columns if col not in reference.columns]
+        if missing:
+            raise ValueError(f"Scaling reference {reference_path} has no bounds for: {missing}")
+    else:
+        reference = ScalingReference.fit(df, columns)
+        if mode == 'frozen' and reference_path:
+            reference.save(reference_path)
+
+    scaled = reference.transform(df)
+    df[scaled.columns] = scaled
+    return reference
+
+
+def append_years(panel, new_rows, reference, update_reference=False, reference_path=None):
+    """
+    Append newly fetched rows to an already-scaled panel.
+
+    Only `new_rows` are transformed; the `_Scaled` values already in `panel`
+    are kept as they are. With update_reference=True the reference is widened
+    via partial_fit first (and saved to `reference_path` if given), so the new
+    rows stay in range while history is still not recomputed.
+    """
+    new_rows = new_rows.copy()
+    if update_reference:
+        reference.partial_fit(new_rows)
+        if reference_path:
+            reference.save(reference_path)
+
+    scaled = reference.transform(new_rows)
+    new_rows[scaled.columns] = scaled
+    return pd.concat([panel, new_rows], ignore_index=True)
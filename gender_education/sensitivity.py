@@ -0,0 +1,234 @@
+"""
+Imputation sensitivity sweep: how much do the findings depend on the
+imputation settings?
+
+Runs the cleaning pipeline's imputation (cleaning.impute_missing) for every
+configuration of a parameter grid (interpolation limit; second step
+regional mean or KNN with its neighbors and weighting) and compares key
+downstream statistics with the published configuration (limit=10, regional
+means):
+
+- regional means of the key indicators in the latest year
+- correlations between the indicators
+- latest-year Gender Equality Index ranks (Spearman rho, rank shifts, top-10 overlap)
+
+The selected raw panel is prepared once and shared with the worker
+processes through a SharedPanel (no per-task pickling), and every
+configuration is compared with the baseline computed in the same run. Results are written to a compact JSON report
+(imputation_sensitivity.json) keyed by the raw data's digest; configurations
+already in the report for the same data are reused unless --force. The
+dashboard's Imputation Sensitivity section is rendered from the report.
+
+Usage:
+    python -m gender_education sensitivity [--jobs 4] [--force]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .cache import file_digest
+from .cleaning import INTERPOLATION_LIMIT, add_derived_features, impute_missing, select_countries
+from .config import INDICATOR_COLS, RAW_CSV, SENSITIVITY_REPORT
+from .panel import DensePanel
+from .rankings import RankingIndex
+from .shared import SharedPanel, attach_worker, worker_panel
+
+# Bump when the statistics or the imputation change: older reports are recomputed
+SWEEP_VERSION = 2
+
+BASELINE = {'limit': INTERPOLATION_LIMIT, 'fill': 'regional_mean'}
+
+DEFAULT_GRID = {
+    'limit': [3, 5, 10, 20, None],
+    'fill': ['regional_mean', 'knn'],
+    # KNN settings (fill='knn' only)
+    'n_neighbors': [5, 10],
+    'weights': ['distance', 'uniform'],
+}
+
+SUMMARY_COLS = ['Literacy_Rate_Female', 'Adolescent_Fertility_Rate', 'Female_Labor_Force_Participation',
+                'Literacy_Gap']
+TOP_N = 10
+
+
+def sweep_configs(grid=DEFAULT_GRID):
+    """Configurations of the grid, the baseline first."""
+    configs = [dict(BASELINE)]
+    for limit, fill in itertools.product(grid['limit'], grid['fill']):
+        if fill == 'knn':
+            options = [{'n_neighbors': k, 'weights': w} for k, w in itertools.product(grid['n_neighbors'],
+                                                                                        grid['weights'])]
+        else:
+            options = [{}]
+        for option in options:
+            config = {'limit': limit, 'fill': fill, **option}
+            if config not in configs:
+                configs.append(config)
+    return configs
+
+
+def config_label(config):
+    limit = 'no limit' if config['limit'] is None else f"limit {config['limit']}"
+    if config['fill'] == 'knn':
+        return f"{limit}, KNN k={config['n_neighbors']} ({config['weights']})"
+    return f"{limit}, regional mean"
+
+
+def downstream_statistics(df):
+    """Statistics the sweep compares: regional means, correlations, GEI ranks."""
+    latest_year = df['year'].max()
+    latest = df[df['year'] == latest_year]
+    regional = latest.groupby('region')[SUMMARY_COLS].mean()
+    ranks = RankingIndex.from_frame(df, ['Gender_Equality_Index'])
+    gei_ranks = ranks.ranks[:, ranks.panel.year_index(latest_year), 0]
+    return {
+        'regional_means': regional,
+        'correlations': df[INDICATOR_COLS].corr(),
+        'gei_ranks': pd.Series(gei_ranks, index=ranks.panel.countries),
+    }
+
+
+def compare_statistics(stats, baseline):
+    """Deltas of `stats` against the baseline's, as a JSON-ready dict."""
+    regional_delta = (stats['regional_means'] - baseline['regional_means']).abs()
+    corr_delta = (stats['correlations'] - baseline['correlations']).abs()
+    upper = np.triu(np.ones(corr_delta.shape, dtype=bool), k=1)
+    pairs = corr_delta.where(upper).stack()
+    worst_pair = pairs.idxmax() if len(pairs) and pairs.notna().any() else None
+
+    # Ranks of the countries ranked (rank > 0) in both
+    ranks = stats['gei_ranks']
+    base_ranks = baseline['gei_ranks'].reindex(ranks.index)
+    both = (ranks > 0) & (base_ranks > 0)
+    shift = (ranks[both] - base_ranks[both]).abs()
+    top = set(ranks[(ranks > 0) & (ranks <= TOP_N)].index)
+    base_top = set(base_ranks[(base_ranks > 0) & (base_ranks <= TOP_N)].index)
+
+    def number(value, decimals=4):
+        return None if pd.isna(value) else round(float(value), decimals)
+
+    return {
+        'regional_mean_delta': {col: number(regional_delta[col].max()) for col in SUMMARY_COLS},
+        'correlation_delta_max': number(pairs.max()),
+        'correlation_delta_pair': list(worst_pair) if worst_pair is not None else None,
+        'gei_ranked': int(both.sum()),
+        'gei_rank_spearman': number(ranks[both].corr(base_ranks[both], method='spearman')),
+        'gei_rank_mean_shift': number(shift.mean(), 2),
+        'gei_rank_max_shift': int(shift.max()) if len(shift) else 0,
+        'gei_top_overlap': len(top & base_top),
+    }
+
+
+def panel_frame(panel):
+    """The long frame of a shared DensePanel, writable, with its region column."""
+    df = panel.to_frame().copy()
+    df['region'] = np.repeat(panel.regions, len(panel.years)) if panel.regions is not None else None
+    return df
+
+
+def run_config(config, panel=None):
+    """Impute the (shared) raw panel with `config` -> (counts, statistics, seconds)."""
+    start = time.perf_counter()
+    df = panel_frame(worker_panel() if panel is None else panel)
+    params = {key: value for key, value in config.items() if key != 'fill'}
+    counts = impute_missing(df, INDICATOR_COLS, fill=config['fill'], **params)
+    # Refit on the sweep's own data: the shared scaling_reference.json is never read or written
+    add_derived_features(df, scaling_mode='refit', reference_path=None)
+    return counts, downstream_statistics(df), time.perf_counter() - start
+
+
+def _load_report(path, digest):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    if report.get('version') != SWEEP_VERSION or report.get('raw_digest') != digest:
+        return {}
+    return {json.dumps(entry['config'], sort_keys=True): entry for entry in report['configs']}
+
+
+def run_sweep(raw_path=RAW_CSV, configs=None, jobs=None, report_path=SENSITIVITY_REPORT, force=False):
+    """Run the sweep and write the report -> report dict."""
+    configs = sweep_configs() if configs is None else configs
+    digest = file_digest(raw_path)
+    cached = {} if force else _load_report(report_path, digest)
+    raw = select_countries(pd.read_csv(raw_path))
+    jobs = jobs or os.cpu_count() or 1
+
+    # The baseline's statistics are needed for every comparison, so it always runs
+    todo = [config for config in configs if config == BASELINE or json.dumps(config, sort_keys=True) not in cached]
+    panel = DensePanel.from_frame(raw, INDICATOR_COLS)
+    if jobs == 1 or len(todo) <= 1:
+        results = [run_config(config, panel) for config in todo]
+    else:
+        with SharedPanel(panel) as shared, ProcessPoolExecutor(max_workers=min(jobs, len(todo)),
+                                                               initializer=attach_worker,
+                                                               initargs=(shared.handle,)) as pool:
+            results = list(pool.map(run_config, todo))
+    by_config = {json.dumps(config, sort_keys=True): result for config, result in zip(todo, results)}
+    baseline = by_config[json.dumps(BASELINE, sort_keys=True)][1]
+
+    entries = []
+    for config in configs:
+        key = json.dumps(config, sort_keys=True)
+        if key not in by_config:
+            entries.append(cached[key])
+            continue
+        counts, stats, seconds = by_config[key]
+        entries.append({
+            'config': config,
+            'label': config_label(config),
+            'baseline': config == BASELINE,
+            'imputed': counts['original'] - counts[f"after_{config['fill']}"],
+            'missing': counts[f"after_{config['fill']}"],
+            'seconds': round(seconds, 3),
+            **compare_statistics(stats, baseline),
+        })
+
+    report = {'version': SWEEP_VERSION, 'raw_digest': digest, 'baseline': BASELINE,
+              'latest_year': int(raw['year'].max()), 'configs': entries}
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+            f.write('\n')
+    return report
+
+
+def print_report(report):
+    print(f"{'configuration':<36}{'imputed':>9}{'missing':>9}{'max Δ mean':>12}{'max Δ r':>9}"
+          f"{'GEI ρ':>8}{'mean Δ rank':>13}{'top-10':>8}")
+    print("-" * 104)
+    for entry in report['configs']:
+        worst_mean = max((delta for delta in entry['regional_mean_delta'].values() if delta is not None), default=0)
+        print(f"{entry['label'] + (' *' if entry['baseline'] else ''):<36}{entry['imputed']:>9,}"
+              f"{entry['missing']:>9,}{worst_mean:>12.2f}{entry['correlation_delta_max'] or 0:>9.3f}"
+              f"{entry['gei_rank_spearman'] or 0:>8.3f}{entry['gei_rank_mean_shift'] or 0:>13.2f}"
+              f"{entry['gei_top_overlap']:>5}/{TOP_N}")
+    print("* published configuration (the baseline of every Δ)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gender_education sensitivity',
+                                     description='Re-run the imputation over a parameter grid and compare results.')
+    parser.add_argument('--raw', default=RAW_CSV, help='raw World Bank CSV')
+    parser.add_argument('--output', default=SENSITIVITY_REPORT, help='JSON report')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='recompute configurations already in the report')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    report = run_sweep(args.raw, jobs=args.jobs, report_path=args.output, force=args.force)
+    print_report(report)
+    print(f"\n✓ {len(report['configs'])} configurations in {time.perf_counter() - start:.1f}s: "
+          f"{os.path.relpath(args.output)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+Local query server for on-demand dashboard data.
+
+The static dashboard bakes every chart in at build time. This optional
+asyncio HTTP server answers filtered queries from the cleaned panel instead:
+
+    GET /api/health
+    GET /api/aggregate?indicator=...&by=region&start=1990&end=2020&region=...&stat=mean
+    GET /api/timeseries?indicator=...&by=region|country&start=...&end=...&region=...&country=...
+    GET /api/figure/regional_trends?indicator=...&start=...&end=...&region=...
+    GET /api/figure/scatter?year=...&region=...
+
+Responses are JSON, memoized in an LRU cache keyed by the normalized query,
+and carry an ETag (dataset digest + body hash) so clients can revalidate
+with If-None-Match and get a 304.
+
+Run with:
+    python -m gender_education.server --port 8050
+and open the dashboard with ?api=http://localhost:8050 to fetch from it.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache, file_digest
+from .config import CLEANED_CSV, INDICATOR_LABELS
+
+AGGREGATE_STATS = ('mean', 'median', 'min', 'max', 'std', 'count')
+
+
+class QueryError(Exception):
+    """Bad request parameters (reported to the client as HTTP 400)."""
+
+
+class QueryEngine:
+    """Answers aggregate / time-series / figure queries on the cleaned panel."""
+
+    def __init__(self, df):
+        self.df = df
+        self.indicators = [col for col in INDICATOR_LABELS if col in df.columns]
+        self.regions = sorted(df['region'].dropna().unique())
+
+    # ------------------------------------------------------------------
+    # Parameter handling
+    # ------------------------------------------------------------------
+    def _indicator(self, params):
+        indicator = params.get('indicator', ['Literacy_Rate_Female'])[0]
+        if indicator not in self.indicators:
+            raise QueryError(f"Unknown indicator {indicator!r}; choose from {self.indicators}")
+        return indicator
+
+    def _filtered(self, params):
+        df = self.df
+        mask = np.ones(len(df), dtype=bool)
+        try:
+            if 'start' in params:
+                mask &= df['year'].to_numpy() >= int(params['start'][0])
+            if 'end' in params:
+                mask &= df['year'].to_numpy() <= int(params['end'][0])
+        except ValueError:
+            raise QueryError("start/end must be integers") from None
+        if 'region' in params:
+            mask &= df['region'].isin(params['region']).to_numpy()
+        if 'country' in params:
+            mask &= df['country'].isin(params['country']).to_numpy()
+        return df[mask]
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    def aggregate(self, params):
+        indicator = self._indicator(params)
+        by = params.get('by', ['region'])[0]
+        stat = params.get('stat', ['mean'])[0]
+        if by not in ('region', 'year', 'country'):
+            raise QueryError("by must be one of region, year, country")
+        if stat not in AGGREGATE_STATS:
+            raise QueryError(f"stat must be one of {AGGREGATE_STATS}")
+        result = self._filtered(params).groupby(by)[indicator].agg(stat)
+        return {
+            'indicator': indicator, 'by': by, 'stat': stat,
+            'keys': [k.item() if hasattr(k, 'item') else k for k in result.index],
+            'values': _clean(result.to_numpy()),
+        }
+
+    def timeseries(self, params):
+        indicator = self._indicator(params)
+        by = params.get('by', ['region'])[0]
+        if by not in ('region', 'country'):
+            raise QueryError("by must be region or country")
+        data = self._filtered(params)
+        table = data.groupby(['year', by])[indicator].mean().unstack(by)
+        return {
+            'indicator': indicator, 'by': by,
+            'years': [int(y) for y in table.index],
+            'series': {str(name): _clean(table[name].to_numpy()) for name in table.columns},
+        }
+
+    def figure(self, name, params):
+        import plotly.express as px
+
+        if name == 'regional_trends':
+            indicator = self._indicator(params)
+            data = self._filtered(params).groupby(['year', 'region'])[indicator].mean().reset_index()
+            label = INDICATOR_LABELS[indicator]
+            fig = px.line(
+                data, x='year', y=indicator, color='region', markers=True,
+                title=f'{label} by Region ({int(data["year"].min())}-{int(data["year"].max())})' if len(data) else label,
+                labels={'year': 'Year', indicator: label, 'region': 'World Region'},
+                template='plotly_white', height=600
+            )
+            fig.update_traces(line=dict(width=3), marker=dict(size=6))
+            fig.update_layout(title_font_size=18, title_x=0.5, hovermode='x unified')
+        elif name == 'scatter':
+            try:
+                year = int(params.get('year', [self.df['year'].max()])[0])
+            except ValueError:
+                raise QueryError("year must be an integer") from None
+            data = self._filtered(params)
+            data = data[data['year'] == year].dropna(
+                subset=['Literacy_Rate_Female', 'Female_Labor_Force_Participation', 'Adolescent_Fertility_Rate']
+            )
+            fig = px.scatter(
+                data, x='Literacy_Rate_Female', y='Female_Labor_Force_Participation',
+                color='region', size='Adolescent_Fertility_Rate', hover_name='country',
+                title=f'Female Literacy vs. Labor Force Participation ({year})',
+                labels={'Literacy_Rate_Female': 'Female Literacy Rate (%)',
+                        'Female_Labor_Force_Participation': 'Female Labor Force Participation (%)',
+                        'region': 'World Region'},
+                template='plotly_white', height=700
+            )
+            fig.update_layout(title_font_size=18, title_x=0.5)
+        else:
+            raise QueryError(f"Unknown figure {name!r}; choose regional_trends or scatter")
+        return json.loads(fig.to_json())
+
+    def handle(self, path, params):
+        if path == '/api/health':
+            return {'status': 'ok', 'indicators': self.indicators, 'regions': self.regions}
+        if path == '/api/aggregate':
+            return self.aggregate(params)
+        if path == '/api/timeseries':
+            return self.timeseries(params)
+        if path.startswith('/api/figure/'):
+            return self.figure(path[len('/api/figure/'):], params)
+        return None
+
+
+def _clean(values):
+    """Float array -> JSON list with None for NaN."""
+    values = np.asarray(values, dtype=float)
+    return [None if np.isnan(v) else round(float(v), 4) for v in values]
+
+
+# ============================================================================
+# HTTP layer
+# ============================================================================
+
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class QueryServer:
+    """Minimal HTTP/1.1 server (keep-alive, GET/HEAD) in front of QueryEngine."""
+
+    def __init__(self, engine, data_digest, cache_size=512):
+        self.engine = engine
+        self.data_digest = data_digest
+        self.cache = LRUCache(cache_size)
+
+    async def respond(self, method, target, headers):
+        """
+        Return (status, extra_headers, body) for one request.
+
+        Uncached queries run in a worker thread: a cold figure build must not
+        hold up the other connections.
+        """
+        if method not in ('GET', 'HEAD'):
+            return 405, {}, b''
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        # Normalized key: parameter order and repeated keys do not matter
+        key = (url.path, tuple(sorted((k, tuple(sorted(v))) for k, v in params.items())))
+
+        cached = self.cache.get(key)
+        if cached is None:
+            try:
+                payload = await asyncio.to_thread(self.engine.handle, url.path, params)
+            except QueryError as e:
+                return 400, {}, json.dumps({'error': str(e)}).encode()
+            if payload is None:
+                return 404, {}, json.dumps({'error': f'No endpoint {url.path}'}).encode()
+            body = json.dumps(payload, separators=(',', ':')).encode()
+            etag = '"%s-%s"' % (self.data_digest[:12], hashlib.sha1(body).hexdigest()[:16])
+            cached = (etag, body)
+            self.cache.put(key, cached)
+
+        etag, body = cached
+        if etag in headers.get('if-none-match', ''):
+            return 304, {'ETag': etag}, b''
+        return 200, {'ETag': etag, 'Content-Type': 'application/json',
+                     'Cache-Control': 'no-cache'}, body
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    status, extra, body = await self.respond(method, target, headers)
+                except Exception as e:  # a failing query still gets a reply, the server keeps running
+                    status, extra, body = 500, {}, json.dumps({'error': f'{type(e).__name__}: {e}'}).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                head = [f'HTTP/1.1 {status} {STATUS_TEXT[status]}',
+                        f'Content-Length: {len(body)}',
+                        'Access-Control-Allow-Origin: *',
+                        'Access-Control-Expose-Headers: ETag',
+                        f'Connection: {"keep-alive" if keep_alive else "close"}']
+                head += [f'{k}: {v}' for k, v in extra.items()]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8050, data_path=CLEANED_CSV, cache_size=512):
+    df = pd.read_csv(data_path)
+    server = QueryServer(QueryEngine(df), file_digest(data_path), cache_size)
+    srv = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"✓ Query server listening on http://{host}:{port} ({len(df):,} rows)")
+    async with srv:
+        await srv.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve dashboard queries from the cleaned panel.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--data', default=CLEANED_CSV, help='cleaned panel CSV')
+    parser.add_argument('--cache-size', type=int, default=512, help='LRU cache entries')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.data, args.cache_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
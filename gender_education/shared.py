@@ -0,0 +1,119 @@
+"""
+Zero-copy DensePanel for process-pool workers.
+
+Passing the cleaned DataFrame to a pool pickles it into every worker (and
+every task, if it is a task argument). Here the (countries, years,
+indicators) float array of a DensePanel is written once to a shared memory
+block, or to an .npy file that workers map with np.memmap, and workers get a
+small PanelHandle: the block name, shape and the code tables (countries,
+years, columns, regions). Attaching maps the same physical pages, so each
+worker's panel costs no copy and no extra memory.
+
+    with SharedPanel.from_frame(df, INDICATOR_COLS) as shared:
+        with ProcessPoolExecutor(initializer=attach_worker, initargs=(shared.handle,)) as pool:
+            pool.map(task, ...)          # tasks call worker_panel()
+
+The attached arrays are read-only.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .panel import DensePanel
+
+
+class PanelHandle:
+    """Everything a worker needs to attach: picklable and small (no values)."""
+
+    def __init__(self, shape, dtype, countries, years, columns, regions, shm_name=None, path=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype).str
+        self.countries = countries
+        self.years = years
+        self.columns = list(columns)
+        self.regions = regions
+        self.shm_name = shm_name
+        self.path = path
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+
+    def attach(self):
+        """-> (DensePanel over the shared values, object keeping the mapping alive)."""
+        if self.path is not None:
+            values = np.load(self.path, mmap_mode='r')
+            keepalive = values
+        else:
+            keepalive = shared_memory.SharedMemory(name=self.shm_name)
+            values = np.ndarray(self.shape, dtype=self.dtype, buffer=keepalive.buf)
+            values.flags.writeable = False
+        panel = DensePanel(self.countries, self.years, self.columns, values, self.regions)
+        return panel, keepalive
+
+
+class SharedPanel:
+    """
+    Owner of a shared DensePanel array; use as a context manager.
+
+    backend='shm' uses multiprocessing.shared_memory (lives in RAM until
+    closed); backend='memmap' writes `path` (an .npy file, kept afterwards)
+    so unrelated processes can map it too.
+    """
+
+    def __init__(self, panel, backend='shm', path=None):
+        if backend not in ('shm', 'memmap'):
+            raise ValueError(f"Unknown backend {backend!r}: use 'shm' or 'memmap'")
+        values = np.ascontiguousarray(panel.values, dtype=float)
+        self._shm = None
+        if backend == 'memmap':
+            if path is None:
+                raise ValueError("backend='memmap' needs a path")
+            mapped = np.lib.format.open_memmap(path, mode='w+', dtype=values.dtype, shape=values.shape)
+            mapped[...] = values
+            mapped.flush()
+            del mapped
+        else:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, dtype=values.dtype, buffer=self._shm.buf)[...] = values
+        self.handle = PanelHandle(
+            values.shape, values.dtype, panel.countries, panel.years, panel.columns, panel.regions,
+            shm_name=self._shm.name if self._shm is not None else None,
+            path=path if backend == 'memmap' else None,
+        )
+
+    @classmethod
+    def from_frame(cls, df, columns, backend='shm', path=None):
+        return cls(DensePanel.from_frame(df, columns), backend=backend, path=path)
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ============================================================================
+# Pool worker side
+# ============================================================================
+
+_worker = {}
+
+
+def attach_worker(handle):
+    """Pool initializer: attach once per worker process."""
+    _worker['panel'], _worker['keepalive'] = handle.attach()
+
+
+def worker_panel():
+    """The DensePanel attached by attach_worker in this process."""
+    if 'panel' not in _worker:
+        raise RuntimeError("No shared panel in this process: pass initializer=attach_worker to the pool")
+    return _worker['panel']
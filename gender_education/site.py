@@ -0,0 +1,659 @@
+"""
+Drill-down site: one page per region and per country, rendered in parallel.
+
+Looping generate_dashboard.py over ~230 entities would rebuild every figure
+with plotly.express and inline Plotly.js and the styles into each file. Here
+the cleaned panel is aggregated once (regional and world means per year,
+global ranks, box plot statistics of the parity index, bootstrap CIs of the
+latest regional means), shared with a process pool (the panel through
+SharedPanel, the small aggregates as initializer arguments), and every worker
+renders pages as a JSON payload plus a few lines of HTML. The yearly series
+of the map and bubble charts go to one data file per region, and one shared
+asset set draws the charts in the browser:
+
+    site/
+        assets/plotly.min.js   the plotly.js bundled with the plotly package
+        assets/site.css, assets/site.js
+        index.html             every region and country
+        region/<name>.js       the region's countries per year (map, bubbles), shared by its pages
+        region/<name>.html     region mean vs world, its countries (map, bubbles, scatter, GEI bars,
+                               parity boxes, table), regional means with CIs
+        country/<name>.html    country vs its region and the world (map, bubbles, parity boxes),
+                               ranks, regional means with CIs
+
+Pages link to each other from their sidebar, and the dashboard's sidebar
+links to index.html once the site exists. The run reports the build time and
+the size of the site.
+
+Usage:
+    python -m gender_education site [--jobs 4] [--output site]
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+import numpy as np
+import pandas as pd
+
+from .bootstrap import bootstrap_means, ci_errors
+from .config import CLEANED_CSV, INDICATOR_LABELS, ISO_CODES, PROJECT_DIR, SITE_DIR
+from .panel import DensePanel
+from .rankings import RankingIndex
+from .shared import SharedPanel, attach_worker, worker_panel
+
+# Line charts of every page, and the columns of the tables
+TREND_COLS = ['Literacy_Rate_Female', 'Literacy_Gender_Parity_Index', 'Adolescent_Fertility_Rate',
+              'Female_Labor_Force_Participation']
+TABLE_COLS = TREND_COLS + ['Gender_Equality_Index']
+# Map and bubble chart series of the region data files
+MEMBER_COLS = ['Literacy_Rate_Female', 'Female_Labor_Force_Participation', 'Adolescent_Fertility_Rate']
+# Regional bar charts with bootstrap CIs, as in the dashboard
+REGIONAL_COLS = ['Literacy_Rate_Female', 'Adolescent_Fertility_Rate', 'Female_Labor_Force_Participation',
+                 'Literacy_Gap']
+PARITY_COL, PARITY_SINCE = 'Literacy_Gender_Parity_Index', 2010
+DECIMALS = {'Literacy_Gender_Parity_Index': 3}
+DASHBOARD_FILE = os.path.join(PROJECT_DIR, 'gender_education_dashboard.html')
+
+SITE_CSS = """
+* { margin: 0; padding: 0; box-sizing: border-box; }
+:root {
+    --primary-color: #1a365d; --secondary-color: #2c5282; --accent-color: #3182ce;
+    --text-dark: #1a202c; --text-light: #718096; --bg-light: #f7fafc; --border-color: #e2e8f0;
+}
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Helvetica', 'Arial', sans-serif;
+    color: var(--text-dark); line-height: 1.6; display: flex; min-height: 100vh;
+}
+nav.sidebar {
+    width: 260px; flex-shrink: 0; background: var(--primary-color); padding: 20px 0;
+    position: sticky; top: 0; height: 100vh; overflow-y: auto;
+}
+nav.sidebar .section-label {
+    color: rgba(255,255,255,0.6); font-size: 0.75em; text-transform: uppercase;
+    letter-spacing: 1px; padding: 12px 20px 4px;
+}
+nav.sidebar a { display: block; color: white; text-decoration: none; padding: 6px 20px; font-size: 0.92em; }
+nav.sidebar a:hover, nav.sidebar a.current { background: var(--secondary-color); }
+main { flex: 1; padding: 40px; background: var(--bg-light); min-width: 0; }
+h1 { color: var(--primary-color); margin-bottom: 6px; }
+.subtitle { color: var(--text-light); margin-bottom: 30px; }
+.section {
+    background: white; border-radius: 12px; padding: 30px; margin-bottom: 30px;
+    box-shadow: 0 2px 15px rgba(0,0,0,0.08);
+}
+.section h2 { color: var(--secondary-color); margin-bottom: 15px; font-size: 1.3em; }
+.chart-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(420px, 1fr)); gap: 20px; }
+.table-scroll { overflow-x: auto; }
+table { width: 100%; border-collapse: collapse; }
+th, td { padding: 8px 10px; border-bottom: 1px solid var(--border-color); text-align: right; white-space: nowrap; }
+th:first-child, td:first-child { text-align: left; }
+a { color: var(--accent-color); }
+.entity-list { columns: 3 220px; }
+.entity-list a { display: block; padding: 2px 0; }
+"""
+
+SITE_JS = """
+(function () {
+    var page = JSON.parse(document.getElementById('page-data').textContent);
+    var config = {responsive: true, displaylogo: false};
+    var colors = ['#3182ce', '#dd6b20', '#718096'];
+    var font = {family: "-apple-system, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif"};
+    // The region's countries: region/<name>.js, or the page itself for a country without a region
+    var members = window.regionData || page.members || [];
+    // plotly's RdYlGn, as the dashboard's map (plotly.js has no such named scale)
+    var rdylgn = ['rgb(165,0,38)', 'rgb(215,48,39)', 'rgb(244,109,67)', 'rgb(253,174,97)', 'rgb(254,224,139)',
+                  'rgb(255,255,191)', 'rgb(217,239,139)', 'rgb(166,217,106)', 'rgb(102,189,99)', 'rgb(26,152,80)',
+                  'rgb(0,104,55)'].map(function (color, i) { return [i / 10, color]; });
+
+    function format(col, value) {
+        return value === null ? 'n/a' : value.toFixed(page.decimals[col] === undefined ? 1 : page.decimals[col]);
+    }
+
+    function trendCharts() {
+        var grid = document.getElementById('trends');
+        page.trend_cols.forEach(function (col) {
+            var div = document.createElement('div');
+            grid.appendChild(div);
+            var traces = page.series[col].map(function (series, i) {
+                return {x: page.years, y: series.values, name: series.name, type: 'scatter', mode: 'lines',
+                        line: {color: colors[i], width: i === 0 ? 3 : 2, dash: i === 2 ? 'dot' : 'solid'}};
+            });
+            Plotly.newPlot(div, traces, {
+                title: {text: page.labels[col]}, font: font, height: 320, hovermode: 'x unified',
+                margin: {l: 50, r: 20, t: 50, b: 40}, legend: {orientation: 'h', y: -0.15}
+            }, config);
+        });
+    }
+
+    function hide(id) {
+        document.getElementById(id).parentNode.style.display = 'none';
+    }
+
+    function animation(names, redraw) {
+        // Play/pause buttons and the year slider of the dashboard's animated charts
+        function animate(duration) {
+            return {frame: {duration: duration, redraw: redraw}, mode: 'immediate', fromcurrent: true,
+                    transition: {duration: duration, easing: 'linear'}};
+        }
+        return {
+            updatemenus: [{type: 'buttons', direction: 'left', showactive: false, pad: {r: 10, t: 70},
+                           x: 0.1, xanchor: 'right', y: 0, yanchor: 'top', buttons: [
+                               {label: '&#9654;', method: 'animate', args: [null, animate(500)]},
+                               {label: '&#9724;', method: 'animate', args: [[null], animate(0)]}]}],
+            sliders: [{active: 0, currentvalue: {prefix: 'year='}, len: 0.9, pad: {b: 10, t: 60},
+                       x: 0.1, xanchor: 'left', y: 0, yanchor: 'top', steps: names.map(function (name) {
+                           return {label: name, method: 'animate', args: [[name], animate(0)]};
+                       })}]
+        };
+    }
+
+    function mapChart() {
+        var col = 'Literacy_Rate_Female';
+        var mapped = members.filter(function (m) { return m.iso; });
+        if (!mapped.length) { hide('map'); return; }
+        var frames = [];
+        page.years.forEach(function (year, t) {
+            if (year % 2 === 0) {
+                frames.push({name: String(year), data: [{z: mapped.map(function (m) { return m.series[col][t]; })}]});
+            }
+        });
+        var current = function (m) { return m.name === page.name; };
+        var trace = {
+            type: 'choropleth', locations: mapped.map(function (m) { return m.iso; }), z: frames[0].data[0].z,
+            text: mapped.map(function (m) { return m.name; }), zmin: 0, zmax: 100, colorscale: rdylgn,
+            colorbar: {title: {text: 'Female Literacy (%)'}},
+            marker: {line: {color: mapped.map(function (m) { return current(m) ? '#1a202c' : 'white'; }),
+                            width: mapped.map(function (m) { return current(m) ? 3 : 0.5; })}},
+            hovertemplate: '%{text}<br>' + page.labels[col] + ': %{z:.1f}<extra></extra>'
+        };
+        Plotly.newPlot('map', {data: [trace], frames: frames, config: config, layout: Object.assign({
+            font: font, height: 520, margin: {l: 10, r: 10, t: 10, b: 90},
+            geo: {fitbounds: 'locations', projection: {type: 'natural earth'}, showframe: false, showcoastlines: true}
+        }, animation(frames.map(function (frame) { return frame.name; }), true))});
+    }
+
+    function bubbleChart() {
+        var x = 'Literacy_Rate_Female', y = 'Female_Labor_Force_Participation', size = 'Adolescent_Fertility_Rate';
+        var largest = 0;
+        members.forEach(function (m) {
+            m.series[size].forEach(function (value) { largest = Math.max(largest, value || 0); });
+        });
+        if (!largest) { hide('bubbles'); return; }
+        // Others, then the page's country on top
+        var groups = [members.filter(function (m) { return m.name !== page.name; }),
+                      members.filter(function (m) { return m.name === page.name; })];
+        function traces(t) {
+            return groups.map(function (group, g) {
+                return {
+                    type: 'scatter', mode: 'markers', name: g ? page.name : 'Countries',
+                    showlegend: g === 1 && group.length > 0,
+                    ids: group.map(function (m) { return m.name; }), text: group.map(function (m) { return m.name; }),
+                    x: group.map(function (m) { return m.series[x][t]; }),
+                    y: group.map(function (m) { return m.series[y][t]; }),
+                    marker: {size: group.map(function (m) { return m.series[size][t]; }), sizemode: 'area',
+                             sizeref: largest / (40 * 40), color: colors[g], opacity: 0.8,
+                             line: {color: 'DarkSlateGrey', width: 1}},
+                    hovertemplate: '%{text}<br>' + page.labels[x] + ': %{x:.1f}<br>' + page.labels[y] +
+                                   ': %{y:.1f}<br>' + page.labels[size] + ': %{marker.size:.1f}<extra></extra>'
+                };
+            });
+        }
+        var frames = [];
+        page.years.forEach(function (year, t) {
+            if (year % 3 === 0) { frames.push({name: String(year), data: traces(t)}); }
+        });
+        Plotly.newPlot('bubbles', {data: frames[0].data, frames: frames, config: config, layout: Object.assign({
+            font: font, height: 560, margin: {l: 60, r: 20, t: 20, b: 90}, legend: {orientation: 'h', y: 1.08},
+            xaxis: {title: {text: page.labels[x]}, range: [0, 105]},
+            yaxis: {title: {text: page.labels[y]}, range: [0, 100]}
+        }, animation(frames.map(function (frame) { return frame.name; }), false))});
+    }
+
+    function parityChart() {
+        // Box statistics come precomputed: no values are shipped, so no outlier points
+        var col = 'Literacy_Gender_Parity_Index';
+        var boxes = page.parity_boxes;
+        if (!boxes.length) { hide('parity'); return; }
+        var traces = boxes.map(function (box, i) {
+            return {type: 'box', name: box.name, x: [box.name], q1: [box.q1], median: [box.median], q3: [box.q3],
+                    lowerfence: [box.lowerfence], upperfence: [box.upperfence],
+                    marker: {color: page.kind === 'country' ? colors[i] : colors[0]}};
+        });
+        Plotly.newPlot('parity', traces, {
+            font: font, height: 440, showlegend: false, margin: {l: 60, r: 20, t: 20, b: 120},
+            xaxis: {tickangle: -45}, yaxis: {title: {text: page.labels[col]}},
+            shapes: [{type: 'line', xref: 'x domain', x0: 0, x1: 1, yref: 'y', y0: 1, y1: 1,
+                      line: {color: 'red', dash: 'dash'}}]
+        }, config);
+    }
+
+    function regionalCharts() {
+        // Latest regional means with bootstrap CIs; the page's region stands out
+        var grid = document.getElementById('regional');
+        Object.keys(page.regional).forEach(function (col) {
+            var bars = page.regional[col];
+            var div = document.createElement('div');
+            grid.appendChild(div);
+            Plotly.newPlot(div, [{
+                type: 'bar', orientation: 'h', x: bars.mean, y: bars.regions,
+                marker: {color: bars.regions.map(function (r) { return r === page.region ? colors[1] : colors[0]; })},
+                error_x: {type: 'data', symmetric: false, array: bars.plus, arrayminus: bars.minus,
+                          color: 'DarkSlateGrey', thickness: 1.5, width: 4},
+                hovertemplate: '%{y}: %{x:.1f}<extra></extra>'
+            }], {
+                title: {text: page.labels[col]}, font: font, height: 360, margin: {l: 190, r: 20, t: 50, b: 40},
+                yaxis: {autorange: 'reversed'}
+            }, config);
+        });
+    }
+
+    function regionCharts() {
+        var countries = page.countries;
+        var x = 'Literacy_Rate_Female', y = 'Female_Labor_Force_Participation';
+        Plotly.newPlot('scatter', [{
+            x: countries.map(function (c) { return c.latest[x]; }),
+            y: countries.map(function (c) { return c.latest[y]; }),
+            text: countries.map(function (c) { return c.name; }),
+            type: 'scatter', mode: 'markers', marker: {size: 11, color: colors[0], opacity: 0.8},
+            hovertemplate: '%{text}<br>' + page.labels[x] + ': %{x:.1f}<br>' + page.labels[y] + ': %{y:.1f}<extra></extra>'
+        }], {
+            font: font, height: 420, margin: {l: 60, r: 20, t: 20, b: 50},
+            xaxis: {title: {text: page.labels[x]}}, yaxis: {title: {text: page.labels[y]}}
+        }, config);
+
+        var gei = 'Gender_Equality_Index';
+        var ranked = countries.filter(function (c) { return c.latest[gei] !== null; })
+            .sort(function (a, b) { return a.latest[gei] - b.latest[gei]; });
+        Plotly.newPlot('gei', [{
+            x: ranked.map(function (c) { return c.latest[gei]; }), y: ranked.map(function (c) { return c.name; }),
+            type: 'bar', orientation: 'h', marker: {color: colors[0]},
+            hovertemplate: '%{y}: %{x:.1f}<extra></extra>'
+        }], {
+            font: font, height: Math.max(300, 22 * ranked.length + 80), margin: {l: 180, r: 20, t: 20, b: 40},
+            xaxis: {title: {text: page.labels[gei]}}
+        }, config);
+
+        var rows = countries.map(function (c) {
+            return '<tr><td><a href="' + c.href + '">' + c.label + '</a></td>' + page.table_cols.map(function (col) {
+                return '<td>' + format(col, c.latest[col]) + '</td>';
+            }).join('') + '</tr>';
+        });
+        document.getElementById('countries').innerHTML = '<tr><th>Country</th>' + page.table_cols.map(function (col) {
+            return '<th>' + page.labels[col] + '</th>';
+        }).join('') + '</tr>' + rows.join('');
+    }
+
+    function countryTable() {
+        var rows = page.table_cols.map(function (col) {
+            var rank = page.ranks[col];
+            return '<tr><td>' + page.labels[col] + '</td><td>' + format(col, rank.value) + '</td><td>' +
+                (rank.world ? rank.world + ' / ' + rank.world_of : 'n/a') + '</td><td>' +
+                (rank.region ? rank.region + ' / ' + rank.region_of : 'n/a') + '</td></tr>';
+        });
+        document.getElementById('ranks').innerHTML =
+            '<tr><th>Indicator</th><th>' + page.latest_year + '</th><th>World rank</th><th>Region rank</th></tr>' +
+            rows.join('');
+    }
+
+    trendCharts();
+    mapChart();
+    bubbleChart();
+    parityChart();
+    regionalCharts();
+    if (page.kind === 'region') { regionCharts(); } else { countryTable(); }
+})();
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title} | SDG 5: Gender Equality</title>
+    <link rel="stylesheet" href="{root}assets/site.css">
+    <script src="{root}assets/plotly.min.js"></script>
+{scripts}</head>
+<body>
+    <nav class="sidebar">
+{nav}
+    </nav>
+    <main>
+        <h1>{title}</h1>
+        <p class="subtitle">{subtitle}</p>
+{body}
+    </main>
+    <script type="application/json" id="page-data">{data}</script>
+    <script src="{root}assets/site.js"></script>
+</body>
+</html>
+"""
+
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def _values(array, decimals=3):
+    """JSON list with None for NaN."""
+    return [None if np.isnan(value) else round(float(value), decimals) for value in array]
+
+
+def _box_stats(values):
+    """Quartiles and Tukey fences of the non-NaN values (plotly's default box), or None if there are none."""
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    return {'q1': round(float(q1), 4), 'median': round(float(median), 4), 'q3': round(float(q3), 4),
+            'lowerfence': round(float(values[values >= q1 - 1.5 * iqr].min()), 4),
+            'upperfence': round(float(values[values <= q3 + 1.5 * iqr].max()), 4)}
+
+
+def _json(data):
+    # Page data sits in a <script> element: keep "</" out of it
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).replace('</', '<\\/')
+
+
+# ============================================================================
+# Shared pre-aggregated data
+# ============================================================================
+
+def regional_ci(df):
+    """Latest-year regional means with 95% bootstrap CIs -> {indicator: {'regions', 'mean', 'minus', 'plus'}}."""
+    latest = df[df['year'] == df['year'].max()]
+    boot = bootstrap_means(latest, REGIONAL_COLS, by=['region'])
+    # Regions in the dashboard's order: highest female literacy first
+    order = boot[boot['indicator'] == REGIONAL_COLS[0]].sort_values('mean', ascending=False)['region'].tolist()
+    bars = {}
+    for col in REGIONAL_COLS:
+        means = boot[boot['indicator'] == col].set_index('region')['mean'].reindex(order)
+        minus, plus = ci_errors(boot, col, order)
+        bars[col] = {'regions': order, 'mean': _values(means.to_numpy(), 2), 'minus': _values(minus, 2),
+                     'plus': _values(plus, 2)}
+    return bars
+
+
+def site_context(panel, dashboard_file=DASHBOARD_FILE, output_dir=SITE_DIR, regional=None):
+    """Everything the pages need besides the panel: small, pickled once per worker."""
+    regions = panel.regions if panel.regions is not None else np.full(len(panel.countries), None, dtype=object)
+    region_names = sorted({region for region in regions if region is not None})
+    with warnings.catch_warnings():
+        # All-NaN (region, year, indicator) cells stay NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        region_means = np.stack([np.nanmean(panel.values[regions == region], axis=0) for region in region_names])
+        world_means = np.nanmean(panel.values, axis=0)
+    recent = panel.values[:, panel.years >= PARITY_SINCE, panel.column_index(PARITY_COL)]
+    parity_boxes = {region: _box_stats(recent[regions == region].ravel()) for region in region_names}
+    slugs = {}
+    for country in panel.countries:
+        slug = slugify(country)
+        while slug in slugs.values():
+            slug += '-'
+        slugs[country] = slug
+    return {
+        'output_dir': output_dir,
+        'countries': list(panel.countries),
+        'regions': regions,
+        'region_names': region_names,
+        'region_slugs': {region: slugify(region) for region in region_names},
+        'country_slugs': slugs,
+        'region_means': region_means,
+        'world_means': world_means,
+        'ranks': RankingIndex(panel).ranks,
+        'parity_boxes': parity_boxes,
+        'world_parity_box': _box_stats(recent.ravel()),
+        'regional': regional or {},
+        'dashboard': os.path.relpath(dashboard_file, output_dir).replace(os.sep, '/'),
+    }
+
+
+# ============================================================================
+# Pages
+# ============================================================================
+
+def _nav(context, root, current_region=None, current=None):
+    lines = ['        <div class="section-label">Overview</div>',
+             f'        <a href="{root}index.html">All regions & countries</a>',
+             f'        <a href="{root}{context["dashboard"]}">Main dashboard</a>',
+             '        <div class="section-label">Regions</div>']
+    for region in context['region_names']:
+        css = ' class="current"' if region == current else ''
+        lines.append(f'        <a href="{root}region/{context["region_slugs"][region]}.html"{css}>{escape(region)}</a>')
+    if current_region is not None:
+        lines.append(f'        <div class="section-label">{escape(current_region)}</div>')
+        for country, region in zip(context['countries'], context['regions']):
+            if region == current_region:
+                css = ' class="current"' if country == current else ''
+                lines.append(f'        <a href="{root}country/{context["country_slugs"][country]}.html"{css}>'
+                             f'{escape(country)}</a>')
+    return '\n'.join(lines)
+
+
+def _page(context, panel, title, subtitle, body, data, root='../', current_region=None, current=None):
+    data = {'years': [int(year) for year in panel.years], 'latest_year': int(panel.years[-1]),
+            'labels': {col: INDICATOR_LABELS.get(col, col) for col in TABLE_COLS + REGIONAL_COLS},
+            'decimals': DECIMALS, 'trend_cols': TREND_COLS, 'table_cols': TABLE_COLS,
+            'member_cols': MEMBER_COLS, 'regional': context['regional'], 'parity_since': PARITY_SINCE,
+            'region': current_region, **data}
+    # The region's data file (region/<name>.js) for the map and bubble charts
+    scripts = (f'    <script src="{root}region/{context["region_slugs"][current_region]}.js"></script>\n'
+               if current_region is not None else '')
+    return PAGE_TEMPLATE.format(title=escape(title), subtitle=subtitle, root=root, body=body, data=_json(data),
+                                scripts=scripts, nav=_nav(context, root, current_region, current))
+
+
+def _members(panel, rows):
+    """Name, ISO code and yearly MEMBER_COLS series of the countries in `rows`."""
+    columns = [panel.column_index(col) for col in MEMBER_COLS]
+    return [{'name': panel.countries[i], 'iso': ISO_CODES.get(panel.countries[i]),
+             'series': {col: _values(panel.values[i, :, c], 2) for col, c in zip(MEMBER_COLS, columns)}}
+            for i in rows]
+
+
+def region_data(context, panel, region):
+    """region/<name>.js: the region's countries for the map and bubble charts of its region and country pages."""
+    members = [i for i, member in enumerate(context['regions']) if member == region]
+    return f"var regionData = {_json(_members(panel, members))};\n"
+
+
+def _charts_html(panel):
+    """Map, bubble, parity box and regional bar sections shared by region and country pages."""
+    latest = panel.years[-1]
+    return f"""        <section class="section"><h2>Female Literacy Rate Map</h2><div id="map"></div></section>
+        <section class="section"><h2>Female Education & Employment</h2><div id="bubbles"></div></section>
+        <section class="section"><h2>Gender Parity Index ({PARITY_SINCE}-{latest})</h2><div id="parity"></div></section>
+        <section class="section"><h2>Regional Means ({latest}, 95% bootstrap CIs)</h2>
+            <div class="chart-grid" id="regional"></div></section>"""
+
+
+def region_page(context, panel, region):
+    columns = [panel.column_index(col) for col in TABLE_COLS]
+    r = context['region_names'].index(region)
+    members = [i for i, member in enumerate(context['regions']) if member == region]
+    latest = panel.values[members, -1][:, columns]
+    countries = [{'name': panel.countries[i], 'label': escape(panel.countries[i]),
+                  'href': f"../country/{context['country_slugs'][panel.countries[i]]}.html",
+                  'latest': dict(zip(TABLE_COLS, _values(row)))} for i, row in zip(members, latest)]
+    series = {col: [{'name': f'{region} (mean)', 'values': _values(context['region_means'][r, :, c])},
+                    {'name': 'All countries (mean)', 'values': _values(context['world_means'][:, c])}]
+              for col, c in zip(TABLE_COLS, columns) if col in TREND_COLS}
+    recent = panel.values[members][:, panel.years >= PARITY_SINCE, panel.column_index(PARITY_COL)]
+    boxes = [{'name': panel.countries[i], **stats} for i, stats in zip(members, map(_box_stats, recent))
+             if stats is not None]
+    body = f"""        <section class="section"><h2>Trends</h2><div class="chart-grid" id="trends"></div></section>
+{_charts_html(panel)}
+        <section class="section"><h2>Literacy vs. Labor Force ({panel.years[-1]})</h2><div id="scatter"></div></section>
+        <section class="section"><h2>Gender Equality Index ({panel.years[-1]})</h2><div id="gei"></div></section>
+        <section class="section"><h2>Countries</h2>
+            <div class="table-scroll"><table id="countries"></table></div></section>"""
+    subtitle = f"{len(members)} countries, {panel.years[0]}-{panel.years[-1]}"
+    return _page(context, panel, region, subtitle, body, {'kind': 'region', 'name': region, 'series': series,
+                                                          'countries': countries, 'parity_boxes': boxes},
+                 current_region=region, current=region)
+
+
+def country_page(context, panel, i):
+    country, region = panel.countries[i], context['regions'][i]
+    columns = [panel.column_index(col) for col in TABLE_COLS]
+    ranks = context['ranks'][:, -1]
+    members = [j for j, member in enumerate(context['regions']) if member == region and region is not None]
+
+    rank_rows = {}
+    for col, c in zip(TABLE_COLS, columns):
+        value = panel.values[i, -1, c]
+        row = {'value': _values([value])[0], 'world': int(ranks[i, c]) or None,
+               'world_of': int((~np.isnan(panel.values[:, -1, c])).sum()), 'region': None, 'region_of': 0}
+        if members and not np.isnan(value):
+            regional = panel.values[members, -1, c]
+            row['region'] = int((regional > value).sum()) + 1
+            row['region_of'] = int((~np.isnan(regional)).sum())
+        rank_rows[col] = row
+
+    series = {}
+    for col, c in zip(TABLE_COLS, columns):
+        if col not in TREND_COLS:
+            continue
+        series[col] = [{'name': country, 'values': _values(panel.values[i, :, c])}]
+        if region is not None:
+            r = context['region_names'].index(region)
+            series[col].append({'name': f'{region} (mean)', 'values': _values(context['region_means'][r, :, c])})
+        series[col].append({'name': 'All countries (mean)', 'values': _values(context['world_means'][:, c])})
+
+    # Parity index distribution: the country against its region and all countries
+    boxes = [{'name': country, **(_box_stats(panel.values[i, panel.years >= PARITY_SINCE,
+                                                          panel.column_index(PARITY_COL)]) or {})}]
+    if region is not None:
+        boxes.append({'name': region, **(context['parity_boxes'][region] or {})})
+    boxes.append({'name': 'All countries', **(context['world_parity_box'] or {})})
+    boxes = [box for box in boxes if 'median' in box]
+
+    body = f"""        <section class="section"><h2>Trends</h2><div class="chart-grid" id="trends"></div></section>
+        <section class="section"><h2>Rankings</h2>
+            <div class="table-scroll"><table id="ranks"></table></div></section>
+{_charts_html(panel)}"""
+    subtitle = f"{escape(region)}" if region is not None else "No World Bank region assigned"
+    if region is not None:
+        subtitle = f'<a href="../region/{context["region_slugs"][region]}.html">{subtitle}</a>'
+    data = {'kind': 'country', 'name': country, 'series': series, 'ranks': rank_rows, 'parity_boxes': boxes}
+    if region is None:
+        # No region data file: the map and bubble charts show the country alone
+        data['members'] = _members(panel, [i])
+    return _page(context, panel, country, subtitle, body, data, current_region=region, current=country)
+
+
+def index_page(context, panel):
+    sections = []
+    for region in context['region_names'] + [None]:
+        members = [country for country, member in zip(panel.countries, context['regions']) if member == region]
+        if not members:
+            continue
+        links = ''.join(f'<a href="country/{context["country_slugs"][country]}.html">{escape(country)}</a>'
+                        for country in members)
+        heading = (f'<a href="region/{context["region_slugs"][region]}.html">{escape(region)}</a>'
+                   if region is not None else 'No region assigned')
+        sections.append(f'        <section class="section"><h2>{heading}</h2>'
+                        f'<div class="entity-list">{links}</div></section>')
+    page = PAGE_TEMPLATE.format(
+        title='Regions & Countries', subtitle=f"{len(context['region_names'])} regions, {len(panel.countries)} "
+                                              f"countries, {panel.years[0]}-{panel.years[-1]}",
+        root='', body='\n'.join(sections), data='{}', scripts='', nav=_nav(context, ''))
+    # The index has no charts
+    return page.replace('    <script src="assets/site.js"></script>\n', '')
+
+
+# ============================================================================
+# Pool workers
+# ============================================================================
+
+_context = {}
+
+
+def _attach(handle, context):
+    attach_worker(handle)
+    _context.update(context)
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return len(text.encode('utf-8'))
+
+
+def render_page(job, panel=None, context=None):
+    """(kind, key) -> (relative path, bytes written); in a pool worker the panel and context come from _attach."""
+    kind, key = job
+    panel = worker_panel() if panel is None else panel
+    context = _context if context is None else context
+    if kind == 'region':
+        path, html = f"region/{context['region_slugs'][key]}.html", region_page(context, panel, key)
+    else:
+        path = f"country/{context['country_slugs'][panel.countries[key]]}.html"
+        html = country_page(context, panel, key)
+    return path, _write(os.path.join(context['output_dir'], path), html)
+
+
+def write_assets(output_dir):
+    """Shared assets -> {relative path: bytes}."""
+    from plotly.offline import get_plotlyjs
+
+    os.makedirs(os.path.join(output_dir, 'assets'), exist_ok=True)
+    assets = {'assets/plotly.min.js': get_plotlyjs(), 'assets/site.css': SITE_CSS.lstrip(),
+              'assets/site.js': SITE_JS.lstrip()}
+    return {path: _write(os.path.join(output_dir, path), text) for path, text in assets.items()}
+
+
+def build_site(data_path=CLEANED_CSV, output_dir=SITE_DIR, jobs=None, dashboard_file=DASHBOARD_FILE):
+    """Write the site -> {'pages', 'assets', 'data': {path: bytes}, 'seconds': wall time}."""
+    start = time.perf_counter()
+    df = pd.read_csv(data_path)
+    panel = DensePanel.from_frame(df, TABLE_COLS)
+    context = site_context(panel, dashboard_file, output_dir, regional_ci(df))
+    for folder in ('region', 'country'):
+        os.makedirs(os.path.join(output_dir, folder), exist_ok=True)
+    assets = write_assets(output_dir)
+    data = {f"region/{context['region_slugs'][region]}.js": region_data(context, panel, region)
+            for region in context['region_names']}
+    data = {path: _write(os.path.join(output_dir, path), text) for path, text in data.items()}
+
+    jobs_list = [('region', region) for region in context['region_names']]
+    jobs_list += [('country', i) for i in range(len(panel.countries))]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        pages = dict(render_page(job, panel, context) for job in jobs_list)
+    else:
+        with SharedPanel(panel) as shared, ProcessPoolExecutor(max_workers=jobs, initializer=_attach,
+                                                               initargs=(shared.handle, context)) as pool:
+            pages = dict(pool.map(render_page, jobs_list, chunksize=16))
+    pages['index.html'] = _write(os.path.join(output_dir, 'index.html'), index_page(context, panel))
+    return {'pages': pages, 'assets': assets, 'data': data, 'seconds': time.perf_counter() - start}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gender_education site',
+                                     description='Write a drill-down page per region and country.')
+    parser.add_argument('--data', default=CLEANED_CSV, help='cleaned panel CSV')
+    parser.add_argument('--output', default=SITE_DIR, help='site directory')
+    parser.add_argument('--dashboard', default=DASHBOARD_FILE, help='dashboard the pages link back to')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    result = build_site(args.data, args.output, args.jobs, args.dashboard)
+    pages, assets = result['pages'], result['assets']
+    page_bytes, asset_bytes, data_bytes = sum(pages.values()), sum(assets.values()), sum(result['data'].values())
+    print(f"✓ {len(pages)} pages in {result['seconds']:.1f}s: {os.path.relpath(args.output)}/")
+    print(f"  pages:  {page_bytes / 1024:,.0f} KB ({page_bytes / len(pages) / 1024:.1f} KB per page)")
+    print(f"  data:   {data_bytes / 1024:,.0f} KB in {len(result['data'])} region files, shared by their pages")
+    print(f"  assets: {asset_bytes / 1024:,.0f} KB, shared by every page")
+    print(f"  total:  {(page_bytes + data_bytes + asset_bytes) / 1024 ** 2:.1f} MB "
+          f"(vs ~{(page_bytes + asset_bytes * len(pages)) / 1024 ** 2:,.0f} MB with the assets inlined per page)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Small-multiples renderer: one sparkline per country on a single sprite sheet.
+
+Drawing ~200 per-country charts with one matplotlib figure each is slow, so
+all sparklines for an indicator are drawn into one figure: the panel is
+pivoted to a (countries, years) array, turned into line segments laid out on
+a grid of fixed-size cells (pixel coordinates), and added as a single
+LineCollection. The PNG is a sprite sheet; the index maps each country to its
+cell so pages can show one sparkline with a CSS background offset.
+
+Usage:
+    python -m gender_education.sparklines --output-dir sparklines
+"""
+
+import argparse
+import json
+import os
+from io import BytesIO
+
+import numpy as np
+
+from .config import CLEANED_CSV
+from .panel import DensePanel
+
+SPARKLINE_COLS = [
+    'Literacy_Rate_Female',
+    'Adolescent_Fertility_Rate',
+    'Female_Labor_Force_Participation',
+    'Literacy_Gap',
+    'Gender_Equality_Index'
+]
+
+CELL_SIZE = (80, 24)   # pixels per sparkline (width, height)
+SHEET_COLUMNS = 16
+PADDING = 3
+
+
+def sparkline_segments(values, cell_size=CELL_SIZE, columns=SHEET_COLUMNS, padding=PADDING, scale='shared'):
+    """
+    Pixel coordinates (countries, years, 2) of every sparkline on the grid.
+
+    scale='shared' uses one y range for all countries so levels are
+    comparable; 'country' stretches each series to its own cell.
+    """
+    n, n_years = values.shape
+    width, height = cell_size
+    rows, cols = np.divmod(np.arange(n), columns)
+
+    if scale == 'shared':
+        low, high = np.nanmin(values), np.nanmax(values)
+    elif scale == 'country':
+        with np.errstate(all='ignore'):
+            low = np.nanmin(values, axis=1, keepdims=True)
+            high = np.nanmax(values, axis=1, keepdims=True)
+    else:
+        raise ValueError(f"Unknown scale: {scale!r}")
+    span = np.where(high > low, high - low, 1.0)
+    level = (values - low) / span
+
+    x = cols[:, None] * width + padding + np.linspace(0, width - 2 * padding, n_years)[None, :]
+    # Image coordinates: y grows downwards, so high values sit near the cell top
+    y = rows[:, None] * height + (height - padding) - level * (height - 2 * padding)
+    return np.stack([np.broadcast_to(x, y.shape), y], axis=-1)
+
+
+def render_sprite_sheet(df, column, cell_size=CELL_SIZE, columns=SHEET_COLUMNS, scale='shared',
+                        color='#2c3e50', dpi=100):
+    """
+    Render every country's sparkline for `column` into one PNG.
+
+    Returns (png_bytes, index) where index has the sheet 'size', 'cell'
+    size, grid 'columns' and the 'countries' in cell order (row-major).
+    """
+    # A bare Figure (no pyplot) so notebooks do not display or keep the sheet
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+
+    panel = DensePanel.from_frame(df, [column])
+    values = panel.values[:, :, 0]
+    # NaN years break the line; countries without any observation get an empty cell
+    segments = sparkline_segments(values, cell_size, columns, scale=scale)
+
+    width, height = cell_size
+    n_rows = -(-len(values) // columns)
+    sheet_w, sheet_h = columns * width, n_rows * height
+
+    fig = Figure(figsize=(sheet_w / dpi, sheet_h / dpi), dpi=dpi)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, sheet_w)
+    ax.set_ylim(sheet_h, 0)
+    ax.axis('off')
+    ax.add_collection(LineCollection(segments, colors=color, linewidths=1.2, antialiased=True))
+
+    # Latest observed value of each series as a dot (one scatter call)
+    observed = ~np.isnan(segments[:, :, 1])
+    has_data = observed.any(axis=1)
+    last = observed.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    rows = np.flatnonzero(has_data)
+    ends = segments[rows, last[rows]]
+    ax.scatter(ends[:, 0], ends[:, 1], s=6, color='#e74c3c', zorder=3, linewidths=0)
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, transparent=True)
+
+    index = {
+        'column': column,
+        'size': [sheet_w, sheet_h],
+        'cell': [width, height],
+        'columns': columns,
+        'years': [int(panel.years[0]), int(panel.years[-1])],
+        'countries': [str(c) for c in panel.countries],
+    }
+    return buf.getvalue(), index
+
+
+def sprite_offset(index, country):
+    """Top-left pixel (x, y) of a country's cell on the sheet."""
+    row, col = divmod(index['countries'].index(country), index['columns'])
+    return col * index['cell'][0], row * index['cell'][1]
+
+
+def write_sprite_sheets(df, columns=SPARKLINE_COLS, output_dir='sparklines', **kwargs):
+    """Write <column>.png and <column>.json for every column present in df."""
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for column in columns:
+        if column not in df.columns:
+            continue
+        png, index = render_sprite_sheet(df, column, **kwargs)
+        with open(os.path.join(output_dir, f'{column}.png'), 'wb') as f:
+            f.write(png)
+        with open(os.path.join(output_dir, f'{column}.json'), 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+        written.append(column)
+    return written
+
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Render per-country sparkline sprite sheets.')
+    parser.add_argument('--data', default=CLEANED_CSV, help='cleaned panel CSV')
+    parser.add_argument('--output-dir', default='sparklines')
+    parser.add_argument('--scale', choices=['shared', 'country'], default='shared')
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.data)
+    written = write_sprite_sheets(df, output_dir=args.output_dir, scale=args.scale)
+    print(f"✓ Wrote {len(written)} sprite sheets to {args.output_dir}/")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Synthetic panels with the schema of gender_education_dataset.csv.
+
+Used to benchmark the pipeline at sizes beyond the ~200 World Bank countries
+(e.g. sub-national units). Each unit gets a level, a linear trend and
+autocorrelated noise per indicator, clipped to the indicator's range, and
+values are then removed following a missingness pattern. The default
+MISSINGNESS is calibrated on the real dataset: literacy and out-of-school
+counts come from sporadic surveys that start late, fertility is nearly
+complete, and labour force participation starts around 1990.
+
+Units are named 'Unit 000001', ...; the returned region mapping plays the
+role of cleaning.REGION_MAPPING, and the aggregate rows of the real file
+(World, income groups, ...) are added so the cleaning filter has work to do.
+
+Usage:
+    python -m gender_education.synthetic --countries 2210 --output synthetic_dataset.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from .cleaning import AGGREGATE_REGIONS, REGION_MAPPING
+from .config import INDICATOR_COLS
+
+REGIONS = sorted(set(REGION_MAPPING.values()))
+
+# Share of real countries with no region in REGION_MAPPING (34 of 221)
+UNMAPPED_SHARE = 0.15
+
+# Per indicator: (low, high, level mean, level sd, trend sd per year, noise sd)
+INDICATOR_PROFILES = {
+    'Girls_Out_Of_School_Primary': (10, 4.1e7, 10.0, 2.5, 0.02, 0.08),   # log counts
+    'Literacy_Rate_Female': (4.5, 100, 70, 22, 0.6, 1.0),
+    'Literacy_Rate_Male': (18, 100, 80, 15, 0.4, 0.8),
+    'Adolescent_Fertility_Rate': (0.4, 215, 60, 40, 0.8, 1.5),
+    'Female_Labor_Force_Participation': (6.8, 55, 40, 10, 0.15, 0.6),
+}
+
+# Per indicator: share of units with no data at all, mean number of leading
+# years without data, and the chance that a year after that is still missing.
+# 'like' reuses another indicator's mask (both literacy rates come from the
+# same surveys).
+MISSINGNESS = {
+    'Girls_Out_Of_School_Primary': {'units': 0.23, 'start': 19, 'cells': 0.38},
+    'Literacy_Rate_Female': {'units': 0.22, 'start': 9, 'cells': 0.64},
+    'Literacy_Rate_Male': {'like': 'Literacy_Rate_Female'},
+    'Adolescent_Fertility_Rate': {'units': 0.004, 'start': 0, 'cells': 0.02},
+    'Female_Labor_Force_Participation': {'units': 0.12, 'start': 10, 'cells': 0.0},
+}
+
+
+def mcar(rate, columns=INDICATOR_COLS):
+    """Missingness pattern with every cell missing independently with `rate`."""
+    return {col: {'units': 0.0, 'start': 0, 'cells': rate} for col in columns}
+
+
+def _simulate(rng, n_units, n_years, profile):
+    low, high, level_mean, level_sd, trend_sd, noise_sd = profile
+    level = rng.normal(level_mean, level_sd, size=(n_units, 1))
+    trend = rng.normal(0, trend_sd, size=(n_units, 1)) * np.arange(n_years)
+    # AR(1)-like noise so series wander instead of jittering around the trend
+    noise = rng.normal(0, noise_sd, size=(n_units, n_years)).cumsum(axis=1) * 0.5
+    return level + trend + noise
+
+
+def _missing_mask(rng, n_units, n_years, pattern):
+    empty_units = rng.random(n_units) < pattern.get('units', 0.0)
+    mean_start = pattern.get('start', 0)
+    start = rng.integers(0, 2 * mean_start + 1, size=n_units) if mean_start else np.zeros(n_units, dtype=int)
+    missing = np.arange(n_years)[None, :] < start[:, None]
+    missing |= rng.random((n_units, n_years)) < pattern.get('cells', 0.0)
+    missing[empty_units] = True
+    return missing
+
+
+def synthetic_panel(n_countries=221, years=range(1980, 2025), indicators=INDICATOR_COLS,
+                    missingness=MISSINGNESS, unmapped_share=UNMAPPED_SHARE, aggregates=True, seed=0):
+    """
+    Raw-schema panel (country, year, indicators...) and its region mapping.
+
+    Returns (df, region_mapping). `missingness` maps indicators to patterns
+    as in MISSINGNESS (or use mcar(rate)); indicators without an entry are
+    complete. With aggregates=True the rows of AGGREGATE_REGIONS are added.
+    """
+    rng = np.random.default_rng(seed)
+    years = np.asarray(list(years))
+    indicators = list(indicators)
+    units = [f'Unit {i:06d}' for i in range(1, n_countries + 1)]
+    names = units + (list(AGGREGATE_REGIONS) if aggregates else [])
+    n_units, n_years = len(names), len(years)
+
+    columns = {}
+    masks = {}
+    for col in indicators:
+        profile = INDICATOR_PROFILES.get(col, (0, 100, 50, 15, 0.3, 1.0))
+        values = _simulate(rng, n_units, n_years, profile)
+        if col == 'Girls_Out_Of_School_Primary':
+            values = np.round(np.exp(values))
+        values = np.clip(values, profile[0], profile[1])
+
+        pattern = missingness.get(col, {})
+        if 'like' in pattern and pattern['like'] in masks:
+            mask = masks[pattern['like']]
+        else:
+            mask = _missing_mask(rng, n_units, n_years, pattern)
+        masks[col] = mask
+        values[mask] = np.nan
+        columns[col] = values.ravel()
+
+    if 'Literacy_Rate_Male' in columns and 'Literacy_Rate_Female' in columns:
+        # Male literacy is rarely below female literacy in the real data
+        columns['Literacy_Rate_Male'] = np.fmax(columns['Literacy_Rate_Male'], columns['Literacy_Rate_Female'])
+
+    df = pd.DataFrame({'country': np.repeat(names, n_years), 'year': np.tile(years, n_units), **columns})
+
+    assigned = rng.choice(REGIONS, size=n_countries)
+    mapped = rng.random(n_countries) >= unmapped_share
+    region_mapping = {unit: region for unit, region, keep in zip(units, assigned, mapped) if keep}
+    return df, region_mapping
+
+
+def scaled_panel(scale, seed=0, **kwargs):
+    """synthetic_panel with `scale` times the 221 countries of the real panel."""
+    return synthetic_panel(n_countries=int(round(221 * scale)), seed=seed, **kwargs)
+
+
+def main(argv=None):
+    import json
+
+    parser = argparse.ArgumentParser(description='Write a synthetic raw panel CSV.')
+    parser.add_argument('--countries', type=int, default=221)
+    parser.add_argument('--start-year', type=int, default=1980)
+    parser.add_argument('--end-year', type=int, default=2024)
+    parser.add_argument('--mcar', type=float, default=None,
+                        help='missing-completely-at-random rate instead of the calibrated pattern')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='synthetic_dataset.csv')
+    args = parser.parse_args(argv)
+
+    missingness = mcar(args.mcar) if args.mcar is not None else MISSINGNESS
+    df, region_mapping = synthetic_panel(args.countries, range(args.start_year, args.end_year + 1),
+                                         missingness=missingness, seed=args.seed)
+    df.to_csv(args.output, index=False)
+    mapping_path = args.output.rsplit('.', 1)[0] + '_regions.json'
+    with open(mapping_path, 'w', encoding='utf-8') as f:
+        json.dump(region_mapping, f)
+    print(f"✓ Wrote {len(df):,} rows ({args.countries:,} countries) to {args.output} and {mapping_path}")
+
+
+if __name__ == '__main__':
+    main()
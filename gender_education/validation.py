@@ -0,0 +1,247 @@
+"""
+Data-quality validation of the raw and cleaned panels, and the coverage index.
+
+validate_panel() runs Notebook 1's checks (duplicate (country, year) rows,
+missing-value shares, records per year, keyword-based aggregate detection)
+plus range rules in one vectorized pass over the factorized country/year
+codes and the indicator array, and returns a ValidationReport:
+
+    report = validate_panel(pd.read_csv(RAW_CSV))
+    report.print_summary()
+    report.raise_for_errors()      # ValidationError on range violations or duplicates
+
+The report's CoverageIndex holds the observed flag of every (country x year x
+indicator) value as a packed bitmap (gender_education_coverage.npz, a few
+KB). The build writes it next to the cleaned CSV, and impute_missing()
+reuses it to skip the series that are fully observed.
+
+Usage:
+    python -m gender_education validate [--raw gender_education_dataset.csv]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from .cleaning import AGGREGATE_REGIONS, REGION_MAPPING
+from .config import COVERAGE_FILE, INDICATOR_COLS, RAW_CSV
+
+# Inclusive (low, high) bounds; None leaves that side open
+RANGE_RULES = {
+    'Literacy_Rate_Female': (0, 100),
+    'Literacy_Rate_Male': (0, 100),
+    'Female_Labor_Force_Participation': (0, 100),
+    'Adolescent_Fertility_Rate': (0, 1000),  # births per 1,000 women aged 15-19
+    'Girls_Out_Of_School_Primary': (0, None),
+    'Literacy_Gap': (-100, 100),
+}
+# Columns that must be strictly positive
+POSITIVE_COLS = ['Literacy_Gender_Parity_Index']
+
+# Notebook 1's name patterns of World Bank aggregates
+AGGREGATE_KEYWORDS = ['World', 'income', 'OECD', 'Arab', 'Asia', 'Africa', 'America',
+                      'Europe', 'Pacific', 'IDA', 'IBRD', 'HIPC', 'dividend', 'small states']
+
+
+class ValidationError(ValueError):
+    """The panel breaks a range rule or has duplicate (country, year) rows."""
+
+
+class CoverageIndex:
+    """Observed flags of a (country x year x indicator) panel, saved as a bitmap."""
+
+    def __init__(self, countries, years, columns, observed):
+        self.countries = np.asarray(countries, dtype=object)
+        self.years = np.asarray(years)
+        self.columns = list(columns)
+        self.observed = np.asarray(observed, dtype=bool)
+
+    @classmethod
+    def from_codes(cls, countries, years, columns, country_codes, year_codes, observed_rows):
+        """From factorized country/year codes and the (rows, columns) observed flags."""
+        observed = np.zeros((len(countries), len(years), len(columns)), dtype=bool)
+        valid = (country_codes >= 0) & (year_codes >= 0)
+        observed[country_codes[valid], year_codes[valid], :] = observed_rows[valid]
+        return cls(countries, years, columns, observed)
+
+    @classmethod
+    def from_frame(cls, df, columns=INDICATOR_COLS):
+        columns = [col for col in columns if col in df.columns]
+        country_codes, countries = pd.factorize(df['country'], sort=True)
+        year_codes, years = pd.factorize(df['year'], sort=True)
+        return cls.from_codes(countries, years, columns, country_codes, year_codes, df[columns].notna().to_numpy())
+
+    def save(self, path):
+        np.savez_compressed(
+            path, countries=self.countries.astype(str), years=self.years, columns=np.asarray(self.columns),
+            shape=np.asarray(self.observed.shape), bits=np.packbits(self.observed, axis=None),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            shape = tuple(data['shape'])
+            observed = np.unpackbits(data['bits'], count=int(np.prod(shape))).reshape(shape).astype(bool)
+            return cls(data['countries'].astype(object), data['years'], data['columns'].tolist(), observed)
+
+    def complete(self, countries=None, years=None, columns=None):
+        """
+        (countries, columns) mask of the series observed in every one of
+        `years` (default: the index's own labels). Labels the index does not
+        hold count as incomplete.
+        """
+        countries = self.countries if countries is None else countries
+        years = self.years if years is None else years
+        columns = self.columns if columns is None else list(columns)
+        country_pos = pd.Index(self.countries).get_indexer(countries)
+        year_pos = pd.Index(self.years).get_indexer(years)
+        column_pos = pd.Index(self.columns).get_indexer(columns)
+        if (year_pos < 0).any():
+            return np.zeros((len(countries), len(columns)), dtype=bool)
+        complete = self.observed[:, year_pos, :].all(axis=1)[np.ix_(np.maximum(country_pos, 0),
+                                                                     np.maximum(column_pos, 0))]
+        complete[country_pos < 0, :] = False
+        complete[:, column_pos < 0] = False
+        return complete
+
+    def summary(self):
+        """Share of observed values and of fully observed series per indicator."""
+        return pd.DataFrame({
+            'observed': self.observed.mean(axis=(0, 1)),
+            'complete_series': self.observed.all(axis=1).mean(axis=0),
+        }, index=self.columns)
+
+
+class ValidationReport:
+    """Results of validate_panel(); errors are the checks that fail the pipeline."""
+
+    def __init__(self, rows, duplicates, missing, records_per_year, aggregates, unlisted_aggregates,
+                 violations, coverage):
+        self.rows = rows
+        self.duplicates = duplicates
+        self.missing = missing
+        self.records_per_year = records_per_year
+        self.aggregates = aggregates
+        self.unlisted_aggregates = unlisted_aggregates
+        self.violations = violations
+        self.coverage = coverage
+
+    @property
+    def errors(self):
+        errors = []
+        if len(self.duplicates):
+            errors.append(f"{len(self.duplicates)} rows share a (country, year) with another row")
+        for (column, rule), group in self.violations.groupby(['column', 'rule'], sort=False):
+            examples = ', '.join(f"{country} {year}: {value:g}" for country, year, value
+                                 in group[['country', 'year', 'value']].head(3).itertuples(index=False))
+            errors.append(f"{len(group)} values of {column} not {rule} ({examples})")
+        return errors
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def raise_for_errors(self):
+        if self.errors:
+            raise ValidationError("Data validation failed:\n  " + "\n  ".join(self.errors))
+
+    def print_summary(self):
+        years = self.records_per_year
+        print(f"Rows: {self.rows:,}  |  Years: {years.index.min()}-{years.index.max()} "
+              f"({years.min()}-{years.max()} records per year)")
+        print(f"Countries: {len(self.coverage.countries) - len(self.aggregates)} "
+              f"(+ {len(self.aggregates)} aggregates)")
+        if len(self.unlisted_aggregates):
+            print(f"! Aggregate-like names without a region, not in cleaning.AGGREGATE_REGIONS: "
+                  f"{'; '.join(self.unlisted_aggregates)}")
+        print("\nMissing values (%):")
+        print(self.missing.round(2).to_string())
+        print("\nCoverage:")
+        print(self.coverage.summary().round(3).to_string())
+        print()
+        for error in self.errors:
+            print(f"✗ {error}")
+        if self.ok:
+            print("✓ No duplicates, all values within range")
+
+
+def _rule_text(low, high, strict):
+    if strict:
+        return f'> {low:g}'
+    if np.isinf(high):
+        return f'>= {low:g}'
+    if np.isinf(low):
+        return f'<= {high:g}'
+    return f'in [{low:g}, {high:g}]'
+
+
+def validate_panel(df, columns=INDICATOR_COLS, rules=RANGE_RULES, positive=POSITIVE_COLS):
+    """All checks in one pass over `df` (a raw or cleaned panel) -> ValidationReport."""
+    country_codes, countries = pd.factorize(df['country'], sort=True)
+    year_codes, years = pd.factorize(df['year'], sort=True)
+
+    # Duplicates and records per year from one bincount of the (country, year) cell ids
+    cells = country_codes * len(years) + year_codes
+    per_cell = np.bincount(cells[cells >= 0], minlength=len(countries) * len(years))
+    duplicated = (cells >= 0) & (per_cell[np.maximum(cells, 0)] > 1)
+    records_per_year = pd.Series(np.bincount(year_codes[year_codes >= 0], minlength=len(years)), index=years)
+
+    # Missing shares of every column (country/year included)
+    missing = pd.Series(df.isna().to_numpy().mean(axis=0) * 100, index=df.columns).sort_values(ascending=False)
+
+    # Aggregates: matched once per distinct name rather than per row. Keyword
+    # matches that are neither listed aggregates nor mapped countries (e.g.
+    # "American Samoa", or aggregates missing from AGGREGATE_REGIONS) are reported
+    names = pd.Series(countries)
+    keyword_match = names.str.contains('|'.join(AGGREGATE_KEYWORDS), case=False).to_numpy()
+    listed = names.isin(AGGREGATE_REGIONS).to_numpy()
+    unlisted = countries[keyword_match & ~listed & ~names.isin(REGION_MAPPING).to_numpy()]
+
+    # Range rules as one comparison of the rule columns against broadcast bounds
+    checked = [col for col in list(rules) + list(positive) if col in df.columns]
+    values = df[checked].to_numpy(dtype=float)
+    limits = [rules.get(col, (0, None)) for col in checked]
+    low = np.array([-np.inf if lo is None else lo for lo, _ in limits], dtype=float)
+    high = np.array([np.inf if hi is None else hi for _, hi in limits], dtype=float)
+    strict = np.array([col in positive for col in checked])
+    with np.errstate(invalid='ignore'):
+        bad = np.where(strict, values <= low, values < low) | (values > high)
+    row_pos, col_pos = np.nonzero(bad)
+    violations = pd.DataFrame({
+        'column': np.asarray(checked, dtype=object)[col_pos],
+        'rule': [_rule_text(low[j], high[j], strict[j]) for j in col_pos],
+        'country': df['country'].to_numpy()[row_pos],
+        'year': df['year'].to_numpy()[row_pos],
+        'value': values[row_pos, col_pos],
+    })
+
+    coverage_columns = [col for col in columns if col in df.columns]
+    coverage = CoverageIndex.from_codes(countries, years, coverage_columns, country_codes, year_codes,
+                                        df[coverage_columns].notna().to_numpy())
+
+    return ValidationReport(
+        rows=len(df), duplicates=df[duplicated], missing=missing, records_per_year=records_per_year,
+        aggregates=list(countries[listed]), unlisted_aggregates=list(unlisted), violations=violations,
+        coverage=coverage,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gender_education validate',
+                                     description='Check a raw or cleaned panel and write its coverage index.')
+    parser.add_argument('--raw', default=RAW_CSV, help='panel CSV to check')
+    parser.add_argument('--coverage', default=COVERAGE_FILE, help='coverage bitmap to write ("" to skip)')
+    args = parser.parse_args(argv)
+
+    report = validate_panel(pd.read_csv(args.raw))
+    report.print_summary()
+    if args.coverage:
+        report.coverage.save(args.coverage)
+        print(f"✓ Coverage index: {os.path.relpath(args.coverage)}")
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""
+Watch mode: rebuild the dashboard on every change and reload the open page.
+
+Polls the cleaned CSV, its provenance file, generate_dashboard.py and the
+gender_education package. On a change it re-runs the dashboard build graph
+(generate_dashboard.dashboard_graph) with the task cache of build.py, so
+only the tasks whose code or inputs changed run again: editing one chart
+function re-runs that chart and the page, not the EDA PNGs. A new CSV
+re-runs everything that reads it.
+
+The pages are served by a small asyncio HTTP server that injects a script
+into every HTML page. The script listens on /__reload (Server-Sent Events)
+and reloads the page after each successful rebuild.
+
+Edits to generate_dashboard.py are picked up by reloading the module in
+place; edits to the package restart the watcher (cached tasks are still
+reused).
+
+Usage:
+    python -m gender_education watch [--port 8000] [--jobs 2]
+"""
+
+import argparse
+import asyncio
+import importlib
+import mimetypes
+import os
+import sys
+import time
+import traceback
+from urllib.parse import unquote, urlsplit
+
+from .build import BUILD_CACHE_DIR, PACKAGE_DIR, run_tasks
+from .config import CLEANED_CSV, PROJECT_DIR, PROVENANCE_FILE
+
+RELOAD_PATH = '/__reload'
+RELOAD_SCRIPT = (
+    "<script>(() => { let build = null; const events = new EventSource('" + RELOAD_PATH + "');"
+    " events.onmessage = e => { if (build !== null && e.data !== build) location.reload(); build = e.data; };"
+    " })();</script>"
+)
+DASHBOARD_SCRIPT = os.path.join(PROJECT_DIR, 'generate_dashboard.py')
+
+
+def _mtimes(paths):
+    return {path: os.stat(path).st_mtime_ns if os.path.exists(path) else None for path in paths}
+
+
+def _package_files():
+    return [os.path.join(PACKAGE_DIR, name) for name in sorted(os.listdir(PACKAGE_DIR)) if name.endswith('.py')]
+
+
+class Watcher:
+    """Rebuilds the dashboard graph and tells connected pages when it is done."""
+
+    def __init__(self, output_dir, data_path=CLEANED_CSV, provenance_path=PROVENANCE_FILE,
+                 jobs=1, cache_dir=BUILD_CACHE_DIR, argv=()):
+        self.output_dir = output_dir
+        self.data_path = data_path
+        self.provenance_path = provenance_path
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.argv = list(argv)
+        # Pages compare build ids; a restarted watcher starts with a new one
+        self.build_id = str(time.time_ns())
+        self.changed = asyncio.Condition()
+        if PROJECT_DIR not in sys.path:
+            sys.path.insert(0, PROJECT_DIR)
+        self.dashboard = importlib.import_module('generate_dashboard')
+
+    def rebuild(self, reload_module=False):
+        """Run the graph -> report (None when the build failed)."""
+        start = time.perf_counter()
+        try:
+            if reload_module:
+                self.dashboard = importlib.reload(self.dashboard)
+            tasks = self.dashboard.dashboard_graph(self.data_path, self.output_dir, self.provenance_path)
+            report = run_tasks(tasks, jobs=self.jobs, cache_dir=self.cache_dir)
+        except Exception:
+            traceback.print_exc()
+            print("✗ Build failed; fix the error and save again")
+            return None
+        ran = [name for name in report if not name.startswith('_') and report[name]['status'] == 'ran']
+        print(f"✓ Rebuilt in {time.perf_counter() - start:.2f}s: {', '.join(ran) or 'nothing changed'} "
+              f"({len(report) - 1 - len(ran)} cached)")
+        return report
+
+    async def notify(self):
+        async with self.changed:
+            self.build_id = str(time.time_ns())
+            self.changed.notify_all()
+
+    async def watch(self, interval=0.2):
+        script_files = [self.data_path, self.provenance_path, DASHBOARD_SCRIPT]
+        package_files = _package_files()
+        seen = _mtimes(script_files + package_files)
+        while True:
+            await asyncio.sleep(interval)
+            current = _mtimes(script_files + package_files)
+            changed = [path for path in current if current[path] != seen[path]]
+            if not changed:
+                continue
+            seen = current
+            print(f"\nChanged: {', '.join(os.path.relpath(path) for path in changed)}")
+            if any(path in package_files for path in changed):
+                # Modules importing from the package hold stale references: restart
+                print("Package changed, restarting the watcher...")
+                os.execv(sys.executable, [sys.executable, '-m', 'gender_education', 'watch'] + self.argv)
+            report = await asyncio.to_thread(self.rebuild, DASHBOARD_SCRIPT in changed)
+            if report is not None:
+                await self.notify()
+
+
+class DevServer:
+    """Static files from `root`, with the reload script injected into HTML pages."""
+
+    def __init__(self, root, watcher):
+        self.root = os.path.abspath(root)
+        self.watcher = watcher
+
+    def read_file(self, target):
+        path = unquote(urlsplit(target).path)
+        if path.endswith('/'):
+            path += 'gender_education_dashboard.html'
+        full = os.path.normpath(os.path.join(self.root, path.lstrip('/')))
+        if not full.startswith(self.root + os.sep) or not os.path.isfile(full):
+            return 404, 'text/plain', b'Not found'
+        with open(full, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(full)[0] or 'application/octet-stream'
+        if content_type == 'text/html':
+            body = body.replace(b'</body>', RELOAD_SCRIPT.encode() + b'</body>', 1)
+        return 200, content_type, body
+
+    async def send_events(self, writer):
+        head = 'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n\r\n'
+        writer.write(head.encode('latin-1'))
+        build_id = None
+        while True:
+            async with self.watcher.changed:
+                await self.watcher.changed.wait_for(lambda: self.watcher.build_id != build_id)
+                build_id = self.watcher.build_id
+            writer.write(f'data: {build_id}\n\n'.encode())
+            await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            try:
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            except ValueError:
+                return
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            if target.startswith(RELOAD_PATH):
+                await self.send_events(writer)
+                return
+            status, content_type, body = self.read_file(target)
+            head = [f'HTTP/1.1 {status} {"OK" if status == 200 else "Not Found"}',
+                    f'Content-Type: {content_type}', f'Content-Length: {len(body)}',
+                    'Cache-Control: no-store', 'Connection: close']
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+            if method != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+        except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(output_dir, host='127.0.0.1', port=8000, jobs=1, interval=0.2, argv=()):
+    watcher = Watcher(output_dir, jobs=jobs, argv=argv)
+    print("Building the dashboard...")
+    await asyncio.to_thread(watcher.rebuild)
+    server = DevServer(output_dir, watcher)
+    srv = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"✓ Serving http://{host}:{port}/ - watching the cleaned CSV, generate_dashboard.py and the package")
+    async with srv:
+        await asyncio.gather(srv.serve_forever(), watcher.watch(interval))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m gender_education watch',
+                                     description='Rebuild the dashboard on changes and live-reload it.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--output-dir', default=PROJECT_DIR, help='where the HTML pages are written and served from')
+    parser.add_argument('--jobs', type=int, default=1, help='worker processes for full rebuilds')
+    parser.add_argument('--interval', type=float, default=0.2, help='seconds between file checks')
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.output_dir, args.host, args.port, args.jobs, args.interval, argv))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
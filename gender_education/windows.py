@@ -0,0 +1,250 @@
+"""
+Windowed statistics of every (country, indicator) series: rolling means,
+year-over-year changes and compound annual growth rates (CAGR).
+
+The panel is sorted by (country, year) once, and every row gets a sortable
+key `country_code * span + year offset`. One searchsorted on the keys finds
+the first row of each row's window and its previous year, both within the
+same country, so all countries and indicators are computed with a few
+whole-array shifts and lookups instead of a groupby loop per country:
+
+- rolling:  mean of the observed values in the `window` years up to each year
+            (NaN with fewer than `min_periods` observations)
+- yoy:      value - value of the previous year (NaN if that year is missing)
+- yoy_pct:  yoy as a percentage of the previous year's value
+- cagr:     (last / first) ** (1 / years) - 1 between each series' first and
+            last observed values (positive values only)
+
+load_window_stats() keeps the result under .stats_cache/, keyed by a hash of
+the frame's contents, like analysis.load_statistics():
+
+    stats = load_window_stats(df)
+    risers, fallers = stats.movers('Girls_Out_Of_School_Primary', period=10)
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .analysis import STATS_STORE_DIR, dataset_digest
+from .trends import LOWER_IS_BETTER, TREND_COLS
+
+WINDOW_COLS = TREND_COLS
+ROLLING_WINDOW = 5
+
+# Bump when compute_window_stats changes what it stores: old entries are ignored
+WINDOWS_VERSION = 1
+
+ARRAYS = ['country_codes', 'years', 'rolling', 'yoy', 'yoy_pct', 'cagr', 'cagr_years']
+
+
+class WindowStats:
+    """
+    Row arrays (rolling, yoy, yoy_pct) follow the panel sorted by (country,
+    year); cagr and cagr_years have one row per country.
+    """
+
+    def __init__(self, countries, columns, window, country_codes, years, rolling, yoy, yoy_pct, cagr, cagr_years):
+        self.countries = np.asarray(countries, dtype=object)
+        self.columns = list(columns)
+        self.window = int(window)
+        self.country_codes = country_codes
+        self.years = years
+        self.rolling = rolling
+        self.yoy = yoy
+        self.yoy_pct = yoy_pct
+        self.cagr = cagr
+        self.cagr_years = cagr_years
+
+        self._first_year = int(years.min()) if len(years) else 0
+        self._span = (int(years.max()) - self._first_year if len(years) else 0) + self.window + 1
+        self._keys = _row_keys(country_codes, years, self._first_year, self._span)
+
+    def save(self, path):
+        # Uncompressed: the store is a local cache, and loading it must beat recomputing
+        np.savez(path, countries=self.countries.astype(str), columns=np.asarray(self.columns),
+                 window=self.window, **{name: getattr(self, name) for name in ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['countries'].astype(object), data['columns'].tolist(), int(data['window']),
+                       **{name: data[name] for name in ARRAYS})
+
+    def _rows(self, year):
+        """Row of every country in `year` (-1 where it has none)."""
+        targets = _row_keys(np.arange(len(self.countries)), np.full(len(self.countries), year), self._first_year,
+                            self._span)
+        rows = np.searchsorted(self._keys, targets)
+        found = rows < len(self._keys)
+        found[found] = self._keys[rows[found]] == targets[found]
+        return np.where(found, rows, -1)
+
+    def frame(self):
+        """Long (country, year, <col>_rolling, <col>_yoy, <col>_yoy_pct ...) frame."""
+        df = pd.DataFrame({'country': self.countries[self.country_codes], 'year': self.years})
+        for name in ('rolling', 'yoy', 'yoy_pct'):
+            values = getattr(self, name)
+            for j, col in enumerate(self.columns):
+                df[f'{col}_{name}'] = values[:, j]
+        return df
+
+    def cagr_frame(self):
+        """One row per (country, indicator): CAGR (%) and the years it spans."""
+        n_cols = len(self.columns)
+        return pd.DataFrame({
+            'country': np.repeat(self.countries, n_cols),
+            'indicator': np.tile(self.columns, len(self.countries)),
+            'cagr_pct': self.cagr.ravel() * 100,
+            'years': self.cagr_years.ravel(),
+        })
+
+    def change(self, indicator, start_year, end_year):
+        """
+        Change of every country's rolling mean from `start_year` to
+        `end_year`, with the CAGR (%) between the two and the latest YoY change.
+        """
+        c = self.columns.index(indicator)
+        before_rows, after_rows = self._rows(start_year), self._rows(end_year)
+        before = np.where(before_rows >= 0, self.rolling[before_rows, c], np.nan)
+        after = np.where(after_rows >= 0, self.rolling[after_rows, c], np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cagr = np.where((before > 0) & (after > 0),
+                            (after / before) ** (1.0 / max(end_year - start_year, 1)) - 1, np.nan)
+        latest_yoy = np.where(after_rows >= 0, self.yoy[after_rows, c], np.nan)
+        table = pd.DataFrame({'country': self.countries, f'value_{start_year}': before, f'value_{end_year}': after,
+                              'change': after - before, 'cagr_pct': cagr * 100, 'yoy': latest_yoy})
+        # Positive improvement = moving in the desirable direction
+        table['improvement'] = table['change'] * (-1.0 if indicator in LOWER_IS_BETTER else 1.0)
+        return table.dropna(subset=['change']).reset_index(drop=True)
+
+    def movers(self, indicator, n=10, period=10, end_year=None):
+        """
+        Biggest improvers and decliners of the smoothed value over the last
+        `period` years. With fewer than 2n countries the table is split in
+        two (the extra one goes to the improvers), so no country is in both.
+        """
+        end_year = int(self.years.max()) if end_year is None else int(end_year)
+        table = self.change(indicator, end_year - period, end_year)
+        table = table.sort_values('improvement', ascending=False, kind='stable')
+        n_improvers = min(n, (len(table) + 1) // 2)
+        n_decliners = min(n, len(table) - n_improvers)
+        return table.head(n_improvers), table.iloc[len(table) - n_decliners:].iloc[::-1]
+
+
+def _row_keys(country_codes, years, first_year, span):
+    return country_codes.astype(np.int64) * span + (years.astype(np.int64) - first_year)
+
+
+def compute_window_stats(df, columns=None, window=ROLLING_WINDOW, min_periods=None):
+    """Rolling means, YoY changes and CAGR of every series of `df` in one pass -> WindowStats."""
+    columns = [col for col in (WINDOW_COLS if columns is None else columns) if col in df.columns]
+    min_periods = window // 2 + 1 if min_periods is None else min_periods
+
+    country_codes, countries = pd.factorize(df['country'], sort=True)
+    years = df['year'].to_numpy(dtype=np.int64)
+    keep = country_codes >= 0
+    order = np.lexsort((years[keep], country_codes[keep]))
+    codes = country_codes[keep][order]
+    years = years[keep][order]
+    values = df[columns].to_numpy(dtype=float)[keep][order]
+    n = len(codes)
+
+    # Window starts and previous years never reach into the previous country:
+    # the span leaves a gap of `window` keys between countries
+    first_year = int(years.min()) if n else 0
+    span = (int(years.max()) - first_year if n else 0) + window + 1
+    keys = _row_keys(codes, years, first_year, span)
+
+    # Rolling means: a row's window holds the rows start..row of its country, at
+    # most `window` of them, so summing `window` lagged copies covers every row.
+    # (Differences of one long cumulative sum would lose digits on the large
+    # out-of-school counts.)
+    observed = ~np.isnan(values)
+    filled = np.where(observed, values, 0.0)
+    in_window = np.arange(n) - np.searchsorted(keys, keys - window + 1)
+    sums = filled.copy()
+    window_counts = observed.astype(np.int64)
+    for lag in range(1, window):
+        take = (in_window[lag:] >= lag)[:, None]
+        sums[lag:] += np.where(take, filled[:-lag], 0.0)
+        window_counts[lag:] += take & observed[:-lag]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rolling = np.where(window_counts >= min_periods, sums / window_counts, np.nan)
+
+    # Year-over-year: the row one key below, if it exists
+    previous = np.searchsorted(keys, keys - 1)
+    has_previous = np.zeros(n, dtype=bool)
+    has_previous[1:] = keys[np.maximum(previous[1:], 0)] == keys[1:] - 1
+    previous_values = np.where(has_previous[:, None], values[np.minimum(previous, n - 1)], np.nan)
+    yoy = values - previous_values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        yoy_pct = np.where(previous_values != 0, yoy / np.abs(previous_values) * 100, np.nan)
+
+    # CAGR between the first and last observed value of each country's series
+    cagr = np.full((len(countries), len(columns)), np.nan)
+    cagr_years = np.zeros((len(countries), len(columns)), dtype=np.int64)
+    if n:
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        rows = np.arange(n)[:, None]
+        first = np.minimum.reduceat(np.where(observed, rows, n), starts, axis=0)
+        last = np.maximum.reduceat(np.where(observed, rows, -1), starts, axis=0)
+        has = first < n
+        first, last = np.where(has, first, 0), np.where(has, last, 0)
+        cols = np.arange(len(columns))
+        first_values, last_values = values[first, cols], values[last, cols]
+        elapsed = np.where(has, years[last] - years[first], 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = np.where(has & (elapsed > 0) & (first_values > 0) & (last_values > 0),
+                              (last_values / first_values) ** (1.0 / np.maximum(elapsed, 1)) - 1, np.nan)
+        cagr[codes[starts]] = growth
+        cagr_years[codes[starts]] = elapsed
+
+    return WindowStats(countries, columns, window, codes, years, rolling, yoy, yoy_pct, cagr, cagr_years)
+
+
+def load_window_stats(df, window=ROLLING_WINDOW, store_dir=STATS_STORE_DIR, force=False):
+    """compute_window_stats(df, window=window), read from the store when this dataset was seen before."""
+    digest = dataset_digest(df)
+    path = os.path.join(store_dir, f'windows-{digest[:32]}-{WINDOWS_VERSION}-{window}.npz')
+    if not force and os.path.exists(path):
+        return WindowStats.load(path)
+
+    stats = compute_window_stats(df, window=window)
+    os.makedirs(store_dir, exist_ok=True)
+    # Write then rename: a notebook and a build may fill the store at once
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    stats.save(tmp_path)
+    os.replace(tmp_path, path)
+    return stats
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from .config import CLEANED_CSV
+
+    parser = argparse.ArgumentParser(description='Rolling means, YoY changes and CAGR for every series.')
+    parser.add_argument('--window', type=int, default=ROLLING_WINDOW, help='rolling window in years')
+    parser.add_argument('--indicator', default='Girls_Out_Of_School_Primary', help='indicator of the movers list')
+    parser.add_argument('--period', type=int, default=10, help='years of the movers comparison')
+    parser.add_argument('--output', default=None, help='CSV file for the long rolling/YoY table')
+    args = parser.parse_args()
+
+    df = pd.read_csv(CLEANED_CSV)
+    start = time.perf_counter()
+    stats = compute_window_stats(df, window=args.window)
+    elapsed = time.perf_counter() - start
+    print(f"✓ {len(stats.years):,} rows x {len(stats.columns)} indicators in {elapsed * 1000:.1f} ms")
+    if args.output:
+        stats.frame().to_csv(args.output, index=False)
+        print(f"✓ Window table saved: {args.output}")
+
+    improvers, decliners = stats.movers(args.indicator, period=args.period)
+    shown = ['country', 'change', 'cagr_pct', 'yoy']
+    print(f"\nBiggest improvers, {args.indicator} ({args.window}-year mean, last {args.period} years):")
+    print(improvers[shown].to_string(index=False))
+    print("\nBiggest decliners:")
+    print(decliners[shown].to_string(index=False))